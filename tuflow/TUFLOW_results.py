@@ -3,7 +3,11 @@ import numpy
 import csv
 import ctypes
 import re
+import threading
+from collections import OrderedDict, deque
 from tuflow.tuflowqgis_library import getOSIndependentFilePath
+from tuflow.TUFLOW_results_cache import TimeseriesCache
+from tuflow import TUFLOW_results_csv
 version = '2018-03-AA' #added reporting location regions
 
 
@@ -59,6 +63,67 @@ class NcVar():
 		self.dimLens = ()
 
 
+class NcColumnReader():
+	"""
+	Reads location columns of a netcdf time series variable using hyperslab reads (only the requested
+	location and time range) rather than reading the full variable. Recently read columns are kept in a
+	small LRU cache. The netcdf file must stay open while the reader is in use.
+
+	Variables are expected to have dimensions (location, time).
+	"""
+
+	def __init__(self, nclib, ncopen, ncid, ncdll, var, null_data, maxColumns=32):
+		self.nclib = nclib
+		self.ncopen = ncopen
+		self.ncid = ncid
+		self.ncdll = ncdll
+		self.var = var
+		self.null_data = null_data
+		self.maxColumns = maxColumns
+		self.columns = OrderedDict()  # LRU -> (location, t0, t1): numpy.ndarray
+
+	def read(self, loc, t0=0, t1=None):
+		"""
+		Read the values for a location between two time indexes.
+
+		:param loc: int -> location index (0 based, excludes Timestep and Time columns)
+		:param t0: int -> start time index
+		:param t1: int -> end time index (exclusive), None for last
+		:return: numpy.ndarray
+		"""
+
+		nTime = self.var.dimLens[1]
+		t1 = nTime if t1 is None else min(t1, nTime)
+		key = (loc, t0, t1)
+		if key in self.columns:
+			self.columns.move_to_end(key)
+			return self.columns[key]
+
+		if self.nclib == "python":
+			column = numpy.array(numpy.ma.getdata(self.ncopen[self.var.name][loc,t0:t1]), dtype=float)
+		elif self.nclib == "c_netcdf.dll":
+			count = t1 - t0
+			start = (ctypes.c_size_t * 2)(loc, t0)
+			counts = (ctypes.c_size_t * 2)(1, count)
+			cfloat_array = (ctypes.c_float * count)()
+			err = self.ncdll.nc_get_vara_float(self.ncid, ctypes.c_int(self.var.id), start, counts,
+			                                   ctypes.byref(cfloat_array))
+			if err:
+				raise IOError("ERROR: error reading data from netcdf. Error: {0}".format(NC_Error.message(err)))
+			column = numpy.array(cfloat_array[:], dtype=float)
+		else:
+			raise IOError("ERROR: unrecognised netcdf library: {0}".format(self.nclib))
+
+		self.columns[key] = column
+		if len(self.columns) > self.maxColumns:
+			self.columns.popitem(last=False)
+
+		return column
+
+	def clear(self):
+		self.columns.clear()
+
+
 class LP():
 	def __init__(self): #initialise the LP data
 		self.chan_list = [] #list of channel IDs
@@ -87,6 +152,8 @@ class LP():
 		self.culv_verts = []
 		self.adverseH = LP_Adverse()
 		self.adverseE = LP_Adverse()
+		self.matrices = {}  # result type: numpy array (timestep x chainage) for the whole run
+		self.matrixNodes = None  # H_nd_index the matrices were calculated for
 
 class LP_Adverse():
 	"""
@@ -230,8 +297,18 @@ class PlotObjects():
 class Timeseries():
 	"""
 	Timeseries - used for both 1D and 2D data
+
+	Only the header is read when loaded, values are read from file on first access of Values
+	unless lazy is set to False.
+
+	In compact mode values are stored without the Timestep and Time columns as compactDtype (float32 by
+	default) with NaN for null values. The time vector can be shared with other result types through
+	timesPool. Values is still available in compact mode - the full array is built on first access and kept
+	until the values change. getColumns reads the compact values directly.
 	"""
 	def __init__(self):
+		self._compactData = None
+		self._expanded = None  # full Values array built from compact storage
 		self.loaded = False
 		self.ID = []
 		self.Header = None
@@ -242,14 +319,459 @@ class Timeseries():
 		self.nCols = []  # number of columns - added for losses incase more than one column associated with any channel
 		self.uID = []  # unique ids - added for losses
 		self.lossNames = []  # record loss names because this will be useful later
+		self.useCache = True  # read / write binary sidecar cache next to source file
+		self.lazy = True  # defer reading values until first accessed
+		self.source = None
+		self.deferred = None  # callable returning (error, message) that reads values into self.Values
+		self.times = None  # time values read without reading the full result
+		self.header2index = {}  # dict -> ID: column index in Header
+		self.indexedHeader = None  # Header the index was built from
+		self.ncReader = None  # NcColumnReader - reads individual columns from netcdf before values are loaded
+		self.prefix = None
+		self.byteOffset = None  # position in source csv after the last row read - used to follow running simulations
+		self.compact = False
+		self.compactDtype = numpy.float32
+		self.timesPool = None  # list -> numpy.ndarray time vectors shared between result types in compact mode
+		self.lock = threading.RLock()  # values can be read in a worker thread (ResData.preload)
+		self.loading = False
+
+	@property
+	def Values(self):
+		if not self.isValuesLoaded() and (self.deferred is not None or self.loading):
+			self.loadValues()
+		if self._compactData is not None:
+			if self._expanded is None:
+				self._expanded = self.expandCompact()
+			return self._expanded
+		return self._values
+
+	@Values.setter
+	def Values(self, values):
+		self._expanded = None
+		if values is not None and self.compact and values.ndim == 2 and values.dtype.kind in 'fiu':
+			# converted before the full values are released so values are never missing while being read
+			# in another thread (see loadValues)
+			data = self.toCompact(values[:,2:])
+			times = self.shareTimes(numpy.array(values[:,1], dtype=float))
+			self._compactData = data
+			self.times = times
+			self._values = None
+		else:
+			self._compactData = None
+			self._values = values
+
+	def toCompact(self, values):
+		"""
+		Converts values to compact storage - compactDtype with NaN for masked and null values.
+
+		:param values: numpy.ndarray or numpy.ma.MaskedArray
+		:return: numpy.ndarray
+		"""
+
+		data = numpy.array(numpy.ma.getdata(values), dtype=self.compactDtype)
+		null_array = numpy.ma.getmaskarray(values) | (data == self.null_data)
+		if null_array.any():
+			data[null_array] = numpy.nan
+
+		return data
+
+	def shareTimes(self, times):
+		"""
+		Returns an identical time vector from timesPool if one exists, otherwise adds times to the pool.
+
+		:param times: numpy.ndarray
+		:return: numpy.ndarray
+		"""
+
+		if self.timesPool is None:
+			return times
+		for x in self.timesPool:
+			if x.shape == times.shape and numpy.array_equal(x, times):
+				return x
+		self.timesPool.append(times)
+
+		return times
+
+	def expandCompact(self):
+		"""
+		Builds the full masked array (including Timestep and Time columns) from compact storage. The array is
+		float64 so the Time column keeps full precision - only the result values are reduced to compactDtype.
+
+		:return: numpy.ma.MaskedArray
+		"""
+
+		data = self._compactData
+		values = numpy.zeros((data.shape[0], data.shape[1] + 2), dtype=float)
+		values[:,0] = numpy.arange(1, data.shape[0] + 1)
+		values[:,1] = self.times
+		values[:,2:] = data
+		null_array = numpy.isnan(values)
+		if null_array.any():
+			return numpy.ma.masked_array(values, null_array)
+
+		return numpy.ma.masked_array(values, numpy.ma.nomask)
+
+	def maskNull(self, values):
+		"""
+		Returns values as a masked array with null values masked. The mask is only allocated if there
+		are null values.
+
+		:param values: numpy.ndarray
+		:return: numpy.ma.MaskedArray
+		"""
+
+		if values.dtype.kind in 'fiu':
+			null_array = values == self.null_data
+			if null_array.any():
+				return numpy.ma.masked_array(values, null_array)
+
+		return numpy.ma.masked_array(values, numpy.ma.nomask)
+
+	def memoryFootprint(self):
+		"""
+		Returns the number of bytes held in memory by the values (including the mask and the full array built
+		from compact storage if Values has been accessed). Memory mapped values (binary cache) and compact time
+		vectors (can be shared) are not counted.
+
+		:return: int
+		"""
+
+		if self._compactData is not None:
+			nbytes = self._compactData.nbytes
+			if self._expanded is not None:
+				nbytes += numpy.ma.getdata(self._expanded).nbytes
+				if numpy.ma.getmask(self._expanded) is not numpy.ma.nomask:
+					nbytes += numpy.ma.getmask(self._expanded).nbytes
+			return nbytes
+		if self._values is None:
+			return 0
+
+		nbytes = 0
+		data = numpy.ma.getdata(self._values)
+		base = data
+		while base is not None and not isinstance(base, numpy.memmap):
+			base = base.base if isinstance(base, numpy.ndarray) else None
+		if base is None:
+			nbytes += data.nbytes
+		mask = numpy.ma.getmask(self._values)
+		if mask is not numpy.ma.nomask:
+			nbytes += mask.nbytes
+
+		return nbytes
+
+	def isValuesLoaded(self):
+		"""
+		Returns whether the values have been read from file.
+
+		:return: bool
+		"""
+
+		return self._values is not None or self._compactData is not None
+
+	def loadValues(self):
+		"""
+		Reads deferred values from file.
+
+		:return: bool error, str message
+		"""
+
+		with self.lock:  # waits if values are being read in another thread
+			if self.deferred is None:
+				return False, ''
+
+			deferred = self.deferred
+			self.deferred = None
+			self.loading = True
+			compact = self.compact
+			self.compact = False  # full values are needed to write the cache - converted below
+			try:
+				error, message = deferred()
+				self.compact = compact
+				if error:
+					self.loaded = False
+					self.Values = None
+					print(message)
+				elif self.compact and self._values is not None:
+					self.Values = self._values
+			finally:
+				self.compact = compact
+				self.loading = False  # only once values are in their final form
+
+		return error, message
+
+	def headerIndex(self, id):
+		"""
+		Returns the column index of the ID in Header (first occurrence). Uses a dictionary built
+		once per Header rather than a linear search.
+
+		:param id: str
+		:return: int
+		"""
+
+		if self.indexedHeader is not self.Header:
+			self.header2index = {}
+			if self.Header is not None:
+				for i, x in enumerate(self.Header):
+					if x not in self.header2index:
+						self.header2index[x] = i
+			self.indexedHeader = self.Header
+
+		if id not in self.header2index:
+			raise ValueError('{0} is not in Header'.format(id))
+
+		return self.header2index[id]
+
+	def hasID(self, id):
+		"""
+		Returns whether the ID exists in the Header.
+
+		:param id: str
+		:return: bool
+		"""
+
+		try:
+			self.headerIndex(id)
+		except ValueError:
+			return False
+
+		return True
+
+	def getColumns(self, cols, t0=0, t1=None):
+		"""
+		Returns the values for the given Header column indexes. If the values are backed by netcdf and have not
+		been loaded, only the required columns and time range are read.
+
+		:param cols: list -> int column index in Header
+		:param t0: int -> start time index
+		:param t1: int -> end time index (exclusive), None for last
+		:return: numpy.ma.MaskedArray (time x cols)
+		"""
+
+		cols = list(cols)
+		if self.ncReader is None and not self.isValuesLoaded():
+			self.loadValues()
+		if self._compactData is None and (self.ncReader is None or self.isValuesLoaded()):
+			return self.Values[t0:t1,cols]
+
+		t1 = self.nVals if t1 is None else min(t1, self.nVals)
+		data = numpy.zeros((t1 - t0, len(cols)))
+		for j, col in enumerate(cols):
+			if col == 0:
+				data[:,j] = numpy.arange(t0 + 1, t1 + 1)
+			elif col == 1:
+				data[:,j] = self.times[t0:t1]
+			elif self._compactData is not None:
+				data[:,j] = self._compactData[t0:t1,col - 2]
+			else:
+				data[:,j] = self.ncReader.read(col - 2, t0, t1)
+
+		if self._compactData is not None:
+			null_array = numpy.isnan(data)
+			if null_array.any():
+				return numpy.ma.masked_array(data, null_array)
+			return numpy.ma.masked_array(data, numpy.ma.nomask)
+
+		return self.maskNull(data)
+
+	def getColumn(self, col, t0=0, t1=None):
+		"""
+		Returns the values for a single Header column index. See getColumns.
+
+		:param col: int -> column index in Header
+		:param t0: int -> start time index
+		:param t1: int -> end time index (exclusive), None for last
+		:return: numpy.ma.MaskedArray
+		"""
+
+		return self.getColumns([col], t0, t1)[:,0]
+
+	def getTimes(self):
+		"""
+		Returns the time values (hr). Will avoid reading the full result if values have not been loaded yet.
+
+		:return: numpy.ndarray
+		"""
+
+		if self._compactData is not None:
+			return self.times
+		if self.isValuesLoaded() or self.deferred is None:
+			if self.Values is None:
+				return numpy.array([])
+			return self.Values[:,1].astype(float)
+
+		if self.times is None:
+			self.times = self.readTimes()
+		if self.times is None:
+			return self.Values[:,1].astype(float)
+
+		return self.times
+
+	def readTimes(self):
+		"""
+		Reads only the time column from the source csv (or cache).
+
+		:return: numpy.ndarray or None if unable to read
+		"""
+
+		if self.source is None:
+			return None
+
+		if self.useCache:
+			meta, values = TimeseriesCache(self.source).read()
+			if meta is not None:
+				return numpy.array(values[:,1])
+
+		times = []
+		try:
+			with open(self.source, 'r') as fo:
+				next(fo)
+				for line in fo:
+					if line.strip():
+						times.append(float(line.split(',', 2)[1]))
+		except (IOError, StopIteration, IndexError, ValueError):
+			return None
+
+		return numpy.array(times)
+
+	def rowOffset(self, nRows):
+		"""
+		Returns the byte position in the source csv after the header and a number of rows.
+
+		:param nRows: int
+		:return: int
+		"""
+
+		with open(self.source, 'rb') as fo:
+			fo.readline()
+			for i in range(nRows):
+				fo.readline()
+			return fo.tell()
+
+	def appendNewRows(self):
+		"""
+		Reads rows written to the source csv since the values were read (i.e. simulation is still running) and
+		appends them to Values. Only complete lines are read, the rest is picked up on the next call.
+
+		:return: int -> number of rows appended
+		"""
+
+		if self.source is None or not self.isValuesLoaded():
+			return 0
+
+		dtype = str if self.prefix == "F" else float
+		try:
+			if self.byteOffset is None:  # values read from cache
+				self.byteOffset = self.rowOffset(self.nVals)
+			values, end = TUFLOW_results_csv.readValues(self.source, len(self.Header), dtype, offset=self.byteOffset,
+			                                            partial=False)
+		except (IOError, ValueError):
+			return 0
+		if not values.shape[0] or values.shape[1] != len(self.Header):
+			return 0
+
+		if self._compactData is not None:
+			self._compactData = numpy.concatenate([self._compactData, self.toCompact(values[:,2:])])
+			self.times = numpy.concatenate([self.times, values[:,1]])
+			self._expanded = None
+		else:
+			self.Values = numpy.ma.concatenate([self._values, self.maskNull(values)])
+		self.nVals += values.shape[0]
+		self.byteOffset = end
+
+		return values.shape[0]
+
+	def cacheMeta(self):
+		"""
+		Metadata written to the binary sidecar cache alongside the values.
+
+		:return: dict
+		"""
+
+		return {
+			'header': self.Header,
+			'id': self.ID,
+			'ncols': self.nCols,
+			'uid': self.uID,
+			'loss_names': self.lossNames,
+			'has_null': bool((numpy.ma.getdata(self._values) == self.null_data).any()),
+		}
+
+	def setCacheMeta(self, meta):
+		"""
+		Set header information from binary sidecar cache metadata.
+
+		:param meta: dict
+		:return: void
+		"""
+
+		self.Header = meta['header']
+		self.ID = meta['id']
+		self.nCols = meta['ncols']
+		self.uID = meta['uid']
+		self.lossNames = meta['loss_names']
+		self.nLocs = len(self.Header) - 2
+
+	def loadFromCache(self, cache):
+		"""
+		Load header and values from a binary sidecar cache. Values are memory mapped.
+
+		:param cache: TimeseriesCache
+		:return: bool -> True if loaded from cache
+		"""
+
+		meta, values = cache.read()
+		if meta is None:
+			return False
+
+		self.setCacheMeta(meta)
+		if meta['has_null']:
+			self.Values = numpy.ma.masked_array(values, values == self.null_data)
+		else:
+			self.Values = numpy.ma.masked_array(values, numpy.ma.nomask)
+		self.nVals = values.shape[0]
+		self.loaded = True
+
+		return True
+
+	def writeCache(self, cache):
+		"""
+		Write loaded values to the binary sidecar cache. Non-numeric results (e.g. flow regime) are not cached.
+
+		:param cache: TimeseriesCache
+		:return: bool -> True if cache written
+		"""
+
+		if not self.loaded or self._values is None or self._values.dtype.kind not in 'fiu':
+			return False
+
+		return cache.write(self._values, self.cacheMeta())
 
 	def Load(self,fullpath,prefix, simID):
+		error = False
+		message = ''
+		self.source = fullpath
+		self.prefix = prefix
+		cache = TimeseriesCache(fullpath) if self.useCache else None
+		if cache is not None and cache.isValid():
+			meta, offset = cache.readHeader()
+			self.setCacheMeta(meta)
+		else:
+			error, message = self.loadHeader(fullpath, prefix, simID)
+			if error:
+				return error, message
+
+		self.loaded = True
+		self.deferred = lambda: self.loadCsvValues(fullpath, prefix, cache)
+		if not self.lazy:
+			return self.loadValues()
+
+		return error, message
+
+	def loadHeader(self, fullpath, prefix, simID):
 		error = False
 		message = ''
 		try:
-			with open(fullpath, 'r') as csvfile:
-				reader = csv.reader(csvfile, delimiter=',', quotechar='"')
-				header = next(reader)
+			header = TUFLOW_results_csv.readHeader(fullpath)
 		except:
 			message = '"ERROR - Error reading header from: '+fullpath
 			error = True
@@ -257,22 +779,18 @@ class Timeseries():
 		header[0] = 'Timestep'
 		header[1] = 'Time'
 		self.ID.clear()
+		patterns = TUFLOW_results_csv.HeaderPatterns(prefix, simID)
 		i = 1
 		nCol = 1
 		for col in header[2:]:
 			i += 1
-			a = col[len(prefix)+1:]
-			# strip simulation name - highly unlikely more than one match
-			a = "".join(re.split(r"\[?{0}]?".format(simID), col, re.IGNORECASE)).strip()
-			# strip prefix - only take the first occurrence just in case there's more than one match
-			rx = re.search(r"{0}\s".format(prefix), a, re.IGNORECASE)
-			if rx is None:
+			lossName, a = patterns.split(col)
+			if a is None:
 				message = "ERROR - Error reading header data in: {0}".format(fullpath)
 				error = True
 				return error, message
-			if rx.span()[0]:
-				self.lossNames.append(a[:rx.span()[0]])
-			a = a[rx.span()[1]:]
+			if lossName:
+				self.lossNames.append(lossName)
 			self.ID.append(a)
 			header[i] = a
 			if a == header[i - 1]:
@@ -285,19 +803,28 @@ class Timeseries():
 				self.nCols.append(nCol)
 				self.uID.append(header[i - 1])
 		self.Header = header
+		self.nLocs = len(self.Header)-2
+
+		return error, message
+
+	def loadCsvValues(self, fullpath, prefix, cache):
+		error = False
+		message = ''
+		self.byteOffset = None
+		if cache is not None and self.loadFromCache(cache):
+			return error, message
 		try:
-			if prefix == "F":
-				values = numpy.genfromtxt(fullpath, delimiter=",", skip_header=1, dtype=str)
-			else:
-				values = numpy.genfromtxt(fullpath, delimiter=",", skip_header=1)
-			null_array = values == self.null_data
-			self.Values = numpy.ma.masked_array(values,null_array)
+			dtype = str if prefix == "F" else float
+			values, self.byteOffset = TUFLOW_results_csv.readValues(fullpath, len(self.Header), dtype)
+			self.Values = self.maskNull(values)
 		except:
 			message = 'ERROR - Error reading data from: '+fullpath
 			error = True
 			return error, message
 		try:
-			self.nVals = len(self.Values[:,2])
+			self.nVals = len(values[:,2])
+			if not self.nVals:
+				raise ValueError
 			self.nLocs = len(self.Header)-2
 			self.loaded = True
 		except IOError:
@@ -309,19 +836,62 @@ class Timeseries():
 			error = True
 			return error, message
 
+		if cache is not None:
+			self.writeCache(cache)
+
 		return error, message
 
 	def loadFromNetCDF(self, fullpath, resName, resType, nclib, ncopen, ncid, ncdll, ncDims, ncVars):
 		error = False
 		message = ""
+		self.source = None
+		cache = TimeseriesCache(fullpath, resName) if self.useCache else None
+		if cache is not None and cache.isValid():
+			meta, offset = cache.readHeader()
+			self.setCacheMeta(meta)
+		else:
+			if nclib == "python":
+				error, message = self.loadFromNetCDFPython(fullpath, resName, resType, ncopen, ncDims, ncVars)
+			elif nclib == "c_netcdf.dll":
+				error, message = self.loadFromNetCDFCDLL(fullpath, resName, resType, ncid, ncdll, ncDims, ncVars)
+			if error or self.Header is None:
+				return error, message
+
+		self.loaded = True
+		self.deferred = lambda: self.loadNetCDFValues(fullpath, resName, nclib, ncopen, ncid, ncdll, ncVars, cache)
+		var = ncVars[[x.name for x in ncVars].index(resName)]
+		if self.times is not None and var.nDims == 2 and "flow_regime_1d" not in resName:
+			# not cached - read individual columns from netcdf until the full values are needed
+			self.ncReader = NcColumnReader(nclib, ncopen, ncid, ncdll, var, self.null_data)
+		if not self.lazy:
+			return self.loadValues()
+
+		return error, message
+
+	def loadNetCDFValues(self, fullpath, resName, nclib, ncopen, ncid, ncdll, ncVars, cache):
+		error = False
+		message = ""
+		if cache is not None and self.loadFromCache(cache):
+			return error, message
+		if self.times is None:
+			# header came from cache but cache is no longer valid - read times from netcdf
+			if nclib == "python":
+				error, message = self.loadFromNetCDFPython(fullpath, resName, resName, ncopen, [], ncVars, header=False)
+			elif nclib == "c_netcdf.dll":
+				error, message = self.loadFromNetCDFCDLL(fullpath, resName, resName, ncid, ncdll, [], ncVars, header=False)
+			if error:
+				return error, message
 		if nclib == "python":
-			error, message = self.loadFromNetCDFPython(fullpath, resName, resType, ncopen, ncDims, ncVars)
+			error, message = self.loadValuesFromNetCDFPython(resName, ncopen, ncVars)
 		elif nclib == "c_netcdf.dll":
-			error, message = self.loadFromNetCDFCDLL(fullpath, resName, resType, ncid, ncdll, ncDims, ncVars)
+			error, message = self.loadValuesFromNetCDFCDLL(resName, ncid, ncdll, ncVars)
+
+		if not error and cache is not None:
+			self.writeCache(cache)
 
 		return error, message
 
-	def loadFromNetCDFPython(self, fullpath, resName, resType, ncopen, ncDims, ncVars):
+	def loadFromNetCDFPython(self, fullpath, resName, resType, ncopen, ncDims, ncVars, header=True):
 		error = False
 		message = ""
 		var = None
@@ -332,44 +902,48 @@ class Timeseries():
 		if var is None:
 			return False, ""
 
-		values = []
 		# ids
-		if resType in [x.name for x in ncVars]:
-			dims = ncVars[[x.name for x in ncVars].index(resType)].dimLens
-			self.nLocs = dims[0]
-			self.ID.clear()
-			for i in range(self.nLocs):
-				self.ID.append("".join([x.decode("utf-8") for x in ncopen[resType][i,:].tolist()]).strip())
-		else:
-			return False, ""
-		self.Header = ['Timestep', 'Time'] + self.ID[:]
+		if header:
+			if resType in [x.name for x in ncVars]:
+				dims = ncVars[[x.name for x in ncVars].index(resType)].dimLens
+				self.nLocs = dims[0]
+				self.ID.clear()
+				for i in range(self.nLocs):
+					self.ID.append("".join([x.decode("utf-8") for x in ncopen[resType][i,:].tolist()]).strip())
+			else:
+				return False, ""
+			self.Header = ['Timestep', 'Time'] + self.ID[:]
 
 		# times
 		if "time" in [x.name for x in ncVars]:
 			dims = ncVars[[x.name for x in ncVars].index("time")].dimLens
 			self.nVals = dims[0]
-			v = [x + 1 for x in range(self.nVals)]
-			values.append(v)
-			v = ncopen["time"][:].tolist()
-			values.append(v)
-			values = numpy.array(values)
-			values = numpy.ma.masked_array(values, False)
+			self.times = numpy.array(ncopen["time"][:].tolist())
 		else:
+			self.Header = None
 			return False, ""
 
+		return error, message
+
+	def loadValuesFromNetCDFPython(self, resName, ncopen, ncVars):
+		error = False
+		message = ""
+		values = numpy.array([[x + 1 for x in range(self.nVals)], self.times.tolist()])
+		values = numpy.ma.masked_array(values, False)
+
 		# values
 		if resName in [x.name for x in ncVars]:
 			a = ncopen[resName][:,:]
 			self.Values = numpy.insert(a, 0, values, axis=0)
 			self.Values = numpy.transpose(self.Values)
 		else:
-			return False, ""
+			return True, "ERROR: could not find {0} in netcdf".format(resName)
 
 		self.loaded = True
 
 		return error, message
 
-	def loadFromNetCDFCDLL(self, fullpath, resName, resType, ncid, ncdll, ncDims, ncVars):
+	def loadFromNetCDFCDLL(self, fullpath, resName, resType, ncid, ncdll, ncDims, ncVars, header=True):
 		error = False
 		message = ""
 		var = None
@@ -380,9 +954,10 @@ class Timeseries():
 		if var is None:
 			return False, ""
 
-		values = []
 		# ids
-		if resType in [x.name for x in ncVars]:
+		if not header:
+			pass
+		elif resType in [x.name for x in ncVars]:
 			id = ncVars[[x.name for x in ncVars].index(resType)].id
 			dims = ncVars[[x.name for x in ncVars].index(resType)].dimLens
 			cstr_array = ((ctypes.c_char * dims[1]) * dims[0])()
@@ -397,9 +972,10 @@ class Timeseries():
 				return False, ""
 		else:
 			return False, ""
-		self.Header = ['Timestep', 'Time'] + self.ID[:]
-		self.nLocs = dims[0]
-		if resName == 'losses_1d':
+		if header:
+			self.Header = ['Timestep', 'Time'] + self.ID[:]
+			self.nLocs = dims[0]
+		if header and resName == 'losses_1d':
 			self.lossNames = self.ID[:]
 			self.ID.clear()
 			self.Header = self.Header[:2]
@@ -433,13 +1009,20 @@ class Timeseries():
 					ncdll.nc_close(ncid)
 				return True, "ERROR: error data from netcdf. Error: {0}".format(NC_Error.message(err))
 			self.nVals = dims[0]
-			v = [x + 1 for x in range(self.nVals)]
-			values.append(v)
-			v = [x for x in cdouble_array]
-			values.append(v)
+			self.times = numpy.array([x for x in cdouble_array])
 		else:
+			self.Header = None
 			return False, ""
 
+		return error, message
+
+	def loadValuesFromNetCDFCDLL(self, resName, ncid, ncdll, ncVars):
+		error = False
+		message = ""
+		values = []
+		values.append([x + 1 for x in range(self.nVals)])
+		values.append(self.times.tolist())
+
 		# values
 		if resName in [x.name for x in ncVars]:
 			id = ncVars[[x.name for x in ncVars].index(resName)].id
@@ -451,8 +1034,6 @@ class Timeseries():
 				cfloat_array = ( ( ctypes.c_float * dims[1] ) * dims[0] )()
 				err = ncdll.nc_get_var(ncid, id, ctypes.byref(cfloat_array))
 			if err:
-				if ncid.value > 0:
-					ncdll.nc_close(ncid)
 				return True, "ERROR: error data from netcdf. Error: {0}".format(NC_Error.message(err))
 			if "flow_regime_1d" in resName:
 				for ch in cstr_array:
@@ -469,10 +1050,9 @@ class Timeseries():
 				v = [x[:] for x in cfloat_array]
 				values += v
 			values = numpy.transpose(numpy.array(values))
-			null_array = values == self.null_data
-			self.Values = numpy.ma.masked_array(values, null_array)
+			self.Values = self.maskNull(values)
 		else:
-			return False, ""
+			return True, "ERROR: could not find {0} in netcdf".format(resName)
 
 		self.loaded = True
 
@@ -887,6 +1467,7 @@ class NodeInfo():
 		self.node_top = []
 		self.node_nChan = []
 		self.node_channels = []
+		self.node_name2index = {}  # dict -> node name: index
 		self.message = ''
 		self.error = False
 		try:
@@ -920,6 +1501,8 @@ class NodeInfo():
 							print('ERROR - Number of channels connected to ID doesnt match. ID: ' + str(row[1]))
 					else:
 						self.node_channels.append(chan_list)
+					if row[1] not in self.node_name2index:
+						self.node_name2index[row[1]] = counter
 			csvfile.close()
 		except IOError:
 			self.message = 'Cannot find the following file: \n{0}'.format(fullpath)
@@ -951,6 +1534,9 @@ class ChanInfo():
 		self.chan_LBDS_Obv = []
 		self.chan_RBDS_Obv = []
 		self.chan_Blockage = []
+		self.chan_name2index = {}  # dict -> channel name: index
+		self.chan_DS_index = []  # index of the downstream channel (chan_DS_Chan), -1 if none, -2 if not found
+		self.downstream = []  # list of channel indexes connected to the downstream node of each channel
 
 		self.message = ''
 		self.error = False
@@ -1025,8 +1611,11 @@ class ChanInfo():
 					except ValueError:
 						# caused when tuflow outputs ****** for steep slopes
 						self.chan_Blockage.append(0)
+					if row[1] not in self.chan_name2index:
+						self.chan_name2index[row[1]] = counter
 			self.nChan = counter+1
 			csvfile.close()
+			self.buildNetwork()
 		except IOError:
 			self.message = 'Cannot find the following file: \n{0}'.format(fullpath)
 			self.error = True
@@ -1034,6 +1623,97 @@ class ChanInfo():
 			self.message = 'ERROR reading file: \n{0}'.format(fullpath)
 			self.error = True
 
+	def buildNetwork(self):
+		"""
+		Builds the channel connectivity index. chan_DS_index is the downstream channel recorded in the results
+		(chan_DS_Chan) which long profiles follow. downstream connects each channel to every channel starting at
+		its downstream node (used by shortestPath) with the downstream channel always first.
+
+		:return: void
+		"""
+
+		usNode2chans = {}
+		for i, node in enumerate(self.chan_US_Node):
+			usNode2chans.setdefault(node, []).append(i)
+
+		self.chan_DS_index = []
+		self.downstream = []
+		for i, chan in enumerate(self.chan_DS_Chan):
+			if chan == '------':
+				ind = -1
+			else:
+				ind = self.chan_name2index.get(chan, -2)
+			self.chan_DS_index.append(ind)
+			connected = [ind] if ind >= 0 else []
+			connected.extend(x for x in usNode2chans.get(self.chan_DS_Node[i], []) if x != ind and x != i)
+			self.downstream.append(connected)
+
+	def downstreamPath(self, ind):
+		"""
+		Returns the channels downstream of a channel following the downstream channel of each channel.
+
+		:param ind: int -> channel index
+		:return: list -> int channel indexes starting with ind, int -> index of channel if the path stops at
+		                 a downstream channel that can't be found, otherwise -1
+		"""
+
+		path = [ind]
+		visited = {ind}
+		while True:
+			ds = self.chan_DS_index[path[-1]]
+			if ds == -2:
+				return path, path[-1]
+			if ds == -1 or ds in visited:  # end of network or loop
+				return path, -1
+			path.append(ds)
+			visited.add(ds)
+
+	def pathBetween(self, ind1, ind2):
+		"""
+		Returns the path between two channels following the downstream channel of each channel (chan_DS_Chan)
+		i.e. the same path as the long profile for ind1 stopped at ind2.
+
+		:param ind1: int -> upstream channel index
+		:param ind2: int -> downstream channel index
+		:return: list -> int channel indexes from ind1 to ind2 or None if ind2 is not downstream of ind1,
+		         int -> index of channel if the path stops at a downstream channel that can't be found, otherwise -1
+		"""
+
+		path, notFound = self.downstreamPath(ind1)
+		if ind2 in path:
+			return path[:path.index(ind2) + 1], -1
+
+		return None, notFound
+
+	def shortestPath(self, ind1, ind2):
+		"""
+		Returns the shortest downstream path between two channels (breadth first search) following every channel
+		that starts at the downstream node of each channel rather than only the downstream channel (chan_DS_Chan).
+		Finds a path through branches that pathBetween doesn't follow. Not used for long profiles (see
+		LP_getConnectivity) which follow the downstream channel.
+
+		:param ind1: int -> upstream channel index
+		:param ind2: int -> downstream channel index
+		:return: list -> int channel indexes from ind1 to ind2, None if ind2 is not downstream of ind1
+		"""
+
+		previous = {ind1: None}
+		queue = deque([ind1])
+		while queue:
+			ind = queue.popleft()
+			if ind == ind2:
+				path = []
+				while ind is not None:
+					path.append(ind)
+					ind = previous[ind]
+				return path[::-1]
+			for ds in self.downstream[ind]:
+				if ds not in previous:
+					previous[ds] = ind
+					queue.append(ds)
+
+		return None
+
 # results class
 class ResData():
 	"""
@@ -1046,9 +1726,9 @@ class ResData():
 			if(res.upper() in ("H", "H_", "LEVEL","LEVELS")):
 				if self.Data_1D.H.loaded:
 					try:
-						ind = self.Data_1D.H.Header.index(id)
-						data = self.Data_1D.H.Values[:,ind]
-						self.times = self.Data_1D.H.Values[:,1]
+						ind = self.Data_1D.H.headerIndex(id)
+						data = self.Data_1D.H.getColumn(ind)
+						self.times = self.Data_1D.H.getTimes()
 						return True, data, message
 					except:
 						message = 'Data not found for 1D H with ID: '+id
@@ -1059,9 +1739,9 @@ class ResData():
 			elif(res.upper() in ("E", "E_", "ENERGY LEVEL","ENERGY LEVELS")):
 				if self.Data_1D.E.loaded:
 					try:
-						ind = self.Data_1D.E.Header.index(id)
-						data = self.Data_1D.E.Values[:,ind]
-						self.times = self.Data_1D.E.Values[:,1]
+						ind = self.Data_1D.E.headerIndex(id)
+						data = self.Data_1D.E.getColumn(ind)
+						self.times = self.Data_1D.E.getTimes()
 						return True, data, message
 					except:
 						message = 'Data not found for 1D E with ID: '+id
@@ -1072,9 +1752,9 @@ class ResData():
 			elif(res.upper() in ("Q","Q_","FLOW","FLOWS")):
 				if self.Data_1D.Q.loaded:
 					try:
-						ind = self.Data_1D.Q.Header.index(id)
-						data = self.Data_1D.Q.Values[:,ind]
-						self.times = self.Data_1D.Q.Values[:,1]
+						ind = self.Data_1D.Q.headerIndex(id)
+						data = self.Data_1D.Q.getColumn(ind)
+						self.times = self.Data_1D.Q.getTimes()
 						return True, data, message
 					except:
 						message = 'Data not found for 1D Q with ID: '+id
@@ -1085,8 +1765,8 @@ class ResData():
 			elif(res.upper() in ("V","V_","VELOCITY","VELOCITIES")):
 				if self.Data_1D.V.loaded:
 					try:
-						ind = self.Data_1D.V.Header.index(id)
-						data = self.Data_1D.V.Values[:,ind]
+						ind = self.Data_1D.V.headerIndex(id)
+						data = self.Data_1D.V.getColumn(ind)
 						return True, data, message
 					except:
 						message = 'Data not found for 1D V with ID: '+id
@@ -1097,9 +1777,9 @@ class ResData():
 			elif(res.upper() in ("A","A_","FLOW AREA","FLOW AREAS")):
 				if self.Data_1D.A.loaded:
 					try:
-						ind = self.Data_1D.A.Header.index(id)
-						data = self.Data_1D.A.Values[:,ind]
-						self.times = self.Data_1D.A.Values[:,1]
+						ind = self.Data_1D.A.headerIndex(id)
+						data = self.Data_1D.A.getColumn(ind)
+						self.times = self.Data_1D.A.getTimes()
 						return True, data, message
 					except:
 						message = 'Data not found for 1D A with ID: '+id
@@ -1108,33 +1788,31 @@ class ResData():
 					message = 'No 1D Flow Area Data loaded for: '+self.displayname
 					return False, [0.0], message
 			elif(res.upper() in ("US_H", "US LEVELS")):
-				chan_list = tuple(self.Channels.chan_name)
-				ind = chan_list.index(str(id))
+				ind = self.Channels.chan_name2index[str(id)]
 				a = str(self.Channels.chan_US_Node[ind])
 				try:
-					ind = self.Data_1D.H.Header.index(a)
+					ind = self.Data_1D.H.headerIndex(a)
 				except:
 					message = 'Unable to find US node: ',+a+' for channel '+ id
 					return False, [0.0], message
 				try:
-					data = self.Data_1D.H.Values[:,ind]
-					self.times = self.Data_1D.H.Values[:,1]
+					data = self.Data_1D.H.getColumn(ind)
+					self.times = self.Data_1D.H.getTimes()
 					return True, data, message
 				except:
 					message = 'Data not found for 1D H with ID: '+a
 					return False, [0.0], message
 			elif(res.upper() in ("DS_H","DS LEVELS")):
-				chan_list = tuple(self.Channels.chan_name)
-				ind = chan_list.index(str(id))
+				ind = self.Channels.chan_name2index[str(id)]
 				a = str(self.Channels.chan_DS_Node[ind])
 				try:
-					ind = self.Data_1D.H.Header.index(a)
+					ind = self.Data_1D.H.headerIndex(a)
 				except:
 					message = 'Unable to find DS node: ',+a+' for channel '+ id
 					return False, [0.0], message
 				try:
-					data = self.Data_1D.H.Values[:,ind]
-					self.times = self.Data_1D.H.Values[:,1]
+					data = self.Data_1D.H.getColumn(ind)
+					self.times = self.Data_1D.H.getTimes()
 					return True, data, message
 				except:
 					message = 'Data not found for 1D H with ID: '+a
@@ -1142,8 +1820,8 @@ class ResData():
 			elif (res.upper() in ("MB")):
 				if self.Data_1D.MB.loaded:
 					try:
-						ind = self.Data_1D.MB.Header.index(id)
-						data = self.Data_1D.MB.Values[:, ind]
+						ind = self.Data_1D.MB.headerIndex(id)
+						data = self.Data_1D.MB.getColumn(ind)
 						return True, data, message
 					except:
 						message = 'Data not found for 1D MB with ID: ' + id
@@ -1154,13 +1832,13 @@ class ResData():
 			elif (res.upper() in ("FLOW REGIME", "NF", "CF")):
 				if self.Data_1D.NF.loaded or self.Data_1D.CF.loaded:
 					try:
-						if id in self.Data_1D.NF.Header:
-							ind = self.Data_1D.NF.Header.index(id)
-							data = self.Data_1D.NF.Values[:, ind]
+						if self.Data_1D.NF.hasID(id):
+							ind = self.Data_1D.NF.headerIndex(id)
+							data = self.Data_1D.NF.getColumn(ind)
 							return True, data, message
-						elif id in self.Data_1D.CF.Header:
-							ind = self.Data_1D.CF.Header.index(id)
-							data = self.Data_1D.CF.Values[:, ind]
+						elif self.Data_1D.CF.hasID(id):
+							ind = self.Data_1D.CF.headerIndex(id)
+							data = self.Data_1D.CF.getColumn(ind)
 							return True, data, message
 						else:
 							return True, [0.0], message
@@ -1173,10 +1851,10 @@ class ResData():
 			elif (res.upper() in ("LOSSES", "CL")):
 				if self.Data_1D.CL.loaded:
 					try:
-						ind = self.Data_1D.CL.Header.index(id)
+						ind = self.Data_1D.CL.headerIndex(id)
 						iun = self.Data_1D.CL.uID.index(id)  # index unique name
 						nCol = self.Data_1D.CL.nCols[iun]  # number of columns associated with element losses
-						data = self.Data_1D.CL.Values[:, ind:ind + nCol]
+						data = self.Data_1D.CL.getColumns(range(ind, ind + nCol))
 						return True, data, message
 					except:
 						message = 'Data not found for 1D Losses with ID: ' + id
@@ -1192,9 +1870,9 @@ class ResData():
 			if(res.upper() in  ("H", "H_", "LEVEL","LEVELS","POINT WATER LEVEL")):
 				if self.Data_2D.H.loaded:
 					try:
-						ind = self.Data_2D.H.Header.index(id)
-						data = self.Data_2D.H.Values[:,ind]
-						self.times = self.Data_2D.H.Values[:,1]
+						ind = self.Data_2D.H.headerIndex(id)
+						data = self.Data_2D.H.getColumn(ind)
+						self.times = self.Data_2D.H.getTimes()
 						return True, data, message
 					except:
 						message = 'Data not found for 2D H with ID: '+id
@@ -1205,9 +1883,9 @@ class ResData():
 			elif(res.upper() in ("Q","Q_","FLOW","FLOWS")):
 				if self.Data_2D.Q.loaded:
 					try:
-						ind = self.Data_2D.Q.Header.index(id)
-						data = self.Data_2D.Q.Values[:,ind]
-						self.times = self.Data_2D.Q.Values[:,1]
+						ind = self.Data_2D.Q.headerIndex(id)
+						data = self.Data_2D.Q.getColumn(ind)
+						self.times = self.Data_2D.Q.getTimes()
 						return True, data, message
 					except:
 						message = 'Data not found for 2D Q with ID: '+id
@@ -1218,9 +1896,9 @@ class ResData():
 			elif (res.upper() in ("X FLOW")):
 				if self.Data_2D.Qx.loaded:
 					try:
-						ind = self.Data_2D.Qx.Header.index(id)
-						data = self.Data_2D.Qx.Values[:, ind]
-						self.times = self.Data_2D.Qx.Values[:, 1]
+						ind = self.Data_2D.Qx.headerIndex(id)
+						data = self.Data_2D.Qx.getColumn(ind)
+						self.times = self.Data_2D.Qx.getTimes()
 						return True, data, message
 					except:
 						message = 'Data not found for 2D Qx with ID: ' + id
@@ -1231,9 +1909,9 @@ class ResData():
 			elif (res.upper() in ("Y FLOW")):
 				if self.Data_2D.Qy.loaded:
 					try:
-						ind = self.Data_2D.Qy.Header.index(id)
-						data = self.Data_2D.Qy.Values[:, ind]
-						self.times = self.Data_2D.Qy.Values[:, 1]
+						ind = self.Data_2D.Qy.headerIndex(id)
+						data = self.Data_2D.Qy.getColumn(ind)
+						self.times = self.Data_2D.Qy.getTimes()
 						return True, data, message
 					except:
 						message = 'Data not found for 2D Qy with ID: ' + id
@@ -1244,9 +1922,9 @@ class ResData():
 			elif(res.upper() in ("V","V_","VELOCITY","VELOCITIES")):
 				if self.Data_2D.V.loaded:
 					try:
-						ind = self.Data_2D.V.Header.index(id)
-						data = self.Data_2D.V.Values[:,ind]
-						self.times = self.Data_2D.V.Values[:,1]
+						ind = self.Data_2D.V.headerIndex(id)
+						data = self.Data_2D.V.getColumn(ind)
+						self.times = self.Data_2D.V.getTimes()
 						return True, data, message
 					except:
 						message = 'Data not found for 2D Q with ID: '+id
@@ -1257,9 +1935,9 @@ class ResData():
 			elif(res.upper() in ("GL", "GAUGE LEVEL")):
 				if self.Data_2D.GL.loaded:
 					try:
-						ind = self.Data_2D.GL.Header.index(id)
-						data = self.Data_2D.GL.Values[:,ind]
-						self.times = self.Data_2D.GL.Values[:,1]
+						ind = self.Data_2D.GL.headerIndex(id)
+						data = self.Data_2D.GL.getColumn(ind)
+						self.times = self.Data_2D.GL.getTimes()
 						return True, data, message
 					except:
 						message = 'Data not found for 2D GL with ID: '+id
@@ -1270,9 +1948,9 @@ class ResData():
 			elif(res.upper() in ("QA", "FLOW AREA")):
 				if self.Data_2D.QA.loaded:
 					try:
-						ind = self.Data_2D.QA.Header.index(id)
-						data = self.Data_2D.QA.Values[:,ind]
-						self.times = self.Data_2D.QA.Values[:,1]
+						ind = self.Data_2D.QA.headerIndex(id)
+						data = self.Data_2D.QA.getColumn(ind)
+						self.times = self.Data_2D.QA.getTimes()
 						return True, data, message
 					except:
 						message = 'Data not found for 2D QA with ID: '+id
@@ -1283,9 +1961,9 @@ class ResData():
 			elif(res.upper() in ("QS", "STRUCTURE FLOW")):
 				if self.Data_2D.QS.loaded:
 					try:
-						ind = self.Data_2D.QS.Header.index(id)
-						data = self.Data_2D.QS.Values[:,ind]
-						self.times = self.Data_2D.QS.Values[:,1]
+						ind = self.Data_2D.QS.headerIndex(id)
+						data = self.Data_2D.QS.getColumn(ind)
+						self.times = self.Data_2D.QS.getTimes()
 						return True, data, message
 					except:
 						message = 'Data not found for 2D QS with ID: '+id
@@ -1296,9 +1974,9 @@ class ResData():
 			elif(res.upper() in ("HU", "US LEVELS")):
 				if self.Data_2D.HUS.loaded:
 					try:
-						ind = self.Data_2D.HUS.Header.index(id)
-						data = self.Data_2D.HUS.Values[:,ind]
-						self.times = self.Data_2D.HUS.Values[:,1]
+						ind = self.Data_2D.HUS.headerIndex(id)
+						data = self.Data_2D.HUS.getColumn(ind)
+						self.times = self.Data_2D.HUS.getTimes()
 						return True, data, message
 					except:
 						message = 'Data not found for 2D HU with ID: '+id
@@ -1309,9 +1987,9 @@ class ResData():
 			elif(res.upper() in ("HD", "DS LEVELS")):
 				if self.Data_2D.HDS.loaded:
 					try:
-						ind = self.Data_2D.HDS.Header.index(id)
-						data = self.Data_2D.HDS.Values[:,ind]
-						self.times = self.Data_2D.HDS.Values[:,1]
+						ind = self.Data_2D.HDS.headerIndex(id)
+						data = self.Data_2D.HDS.getColumn(ind)
+						self.times = self.Data_2D.HDS.getTimes()
 						return True, data, message
 					except:
 						message = 'Data not found for 2D HD with ID: '+id
@@ -1322,9 +2000,9 @@ class ResData():
 			elif(res.upper() in ("VX")):
 				if self.Data_2D.Vx.loaded:
 					try:
-						ind = self.Data_2D.Vx.Header.index(id)
-						data = self.Data_2D.Vx.Values[:,ind]
-						self.times = self.Data_2D.Vx.Values[:,1]
+						ind = self.Data_2D.Vx.headerIndex(id)
+						data = self.Data_2D.Vx.getColumn(ind)
+						self.times = self.Data_2D.Vx.getTimes()
 						return True, data, message
 					except:
 						message = 'Data not found for 2D Vx with ID: '+id
@@ -1335,9 +2013,9 @@ class ResData():
 			elif(res.upper() in ("VY")):
 				if self.Data_2D.Vy.loaded:
 					try:
-						ind = self.Data_2D.Vy.Header.index(id)
-						data = self.Data_2D.Vy.Values[:,ind]
-						self.times = self.Data_2D.Vy.Values[:,1]
+						ind = self.Data_2D.Vy.headerIndex(id)
+						data = self.Data_2D.Vy.getColumn(ind)
+						self.times = self.Data_2D.Vy.getTimes()
 						return True, data, message
 					except:
 						message = 'Data not found for 2D Vy with ID: '+id
@@ -1348,9 +2026,9 @@ class ResData():
 			elif (res.upper() in ("VU")):
 				if self.Data_2D.Vu.loaded:
 					try:
-						ind = self.Data_2D.Vu.Header.index(id)
-						data = self.Data_2D.Vu.Values[:, ind]
-						self.times = self.Data_2D.Vu.Values[:, 1]
+						ind = self.Data_2D.Vu.headerIndex(id)
+						data = self.Data_2D.Vu.getColumn(ind)
+						self.times = self.Data_2D.Vu.getTimes()
 						return True, data, message
 					except:
 						message = 'Data not found for 2D Vu with ID: ' + id
@@ -1361,9 +2039,9 @@ class ResData():
 			elif (res.upper() in ("VV")):
 				if self.Data_2D.Vv.loaded:
 					try:
-						ind = self.Data_2D.Vv.Header.index(id)
-						data = self.Data_2D.Vv.Values[:, ind]
-						self.times = self.Data_2D.Vv.Values[:, 1]
+						ind = self.Data_2D.Vv.headerIndex(id)
+						data = self.Data_2D.Vv.getColumn(ind)
+						self.times = self.Data_2D.Vv.getTimes()
 						return True, data, message
 					except:
 						message = 'Data not found for 2D Vv with ID: ' + id
@@ -1374,9 +2052,9 @@ class ResData():
 			elif (res.upper() in ("VA")):
 				if self.Data_2D.VA.loaded:
 					try:
-						ind = self.Data_2D.VA.Header.index(id)
-						data = self.Data_2D.VA.Values[:, ind]
-						self.times = self.Data_2D.VA.Values[:, 1]
+						ind = self.Data_2D.VA.headerIndex(id)
+						data = self.Data_2D.VA.getColumn(ind)
+						self.times = self.Data_2D.VA.getTimes()
 						return True, data, message
 					except:
 						message = 'Data not found for 2D VA with ID: ' + id
@@ -1387,9 +2065,9 @@ class ResData():
 			elif(res.upper() in ("INTEGRAL FLOW","FLOW INTEGRAL")):
 				if self.Data_2D.QI.loaded:
 					try:
-						ind = self.Data_2D.QI.Header.index(id)
-						data = self.Data_2D.QI.Values[:,ind]
-						self.times = self.Data_2D.QI.Values[:,1]
+						ind = self.Data_2D.QI.headerIndex(id)
+						data = self.Data_2D.QI.getColumn(ind)
+						self.times = self.Data_2D.QI.getTimes()
 						return True, data, message
 					except:
 						message = 'Data not found for 2D QI with ID: '+id
@@ -1400,9 +2078,9 @@ class ResData():
 			elif(res.upper() in ("HAVG","AVERAGE LEVEL", "AVERAGE WATER LEVEL")):
 				if self.Data_2D.HAvg.loaded:
 					try:
-						ind = self.Data_2D.HAvg.Header.index(id)
-						data = self.Data_2D.HAvg.Values[:,ind]
-						self.times = self.Data_2D.HAvg.Values[:,1]
+						ind = self.Data_2D.HAvg.headerIndex(id)
+						data = self.Data_2D.HAvg.getColumn(ind)
+						self.times = self.Data_2D.HAvg.getTimes()
 						return True, data, message
 					except:
 						message = 'Data not found for 2D HAvg with ID: '+id
@@ -1413,9 +2091,9 @@ class ResData():
 			elif(res.upper() in ("HMAX","MAX LEVEL", "MAX WATER LEVEL")):
 				if self.Data_2D.HMax.loaded:
 					try:
-						ind = self.Data_2D.HMax.Header.index(id)
-						data = self.Data_2D.HMax.Values[:,ind]
-						self.times = self.Data_2D.HMax.Values[:,1]
+						ind = self.Data_2D.HMax.headerIndex(id)
+						data = self.Data_2D.HMax.getColumn(ind)
+						self.times = self.Data_2D.HMax.getTimes()
 						return True, data, message
 					except:
 						message = 'Data not found for 2D HMax with ID: '+id
@@ -1426,9 +2104,9 @@ class ResData():
 			elif(res.upper() in ("QIN","FLOW INTO REGION", "FLOW INTO")):
 				if self.Data_2D.QIn.loaded:
 					try:
-						ind = self.Data_2D.QIn.Header.index(id)
-						data = self.Data_2D.QIn.Values[:,ind]
-						self.times = self.Data_2D.QIn.Values[:,1]
+						ind = self.Data_2D.QIn.headerIndex(id)
+						data = self.Data_2D.QIn.getColumn(ind)
+						self.times = self.Data_2D.QIn.getTimes()
 						return True, data, message
 					except:
 						message = 'Data not found for 2D QIn with ID: '+id
@@ -1439,9 +2117,9 @@ class ResData():
 			elif(res.upper() in ("QOUT","FLOW OUT OF REGION", "FLOW OUT")):
 				if self.Data_2D.QOut.loaded:
 					try:
-						ind = self.Data_2D.QOut.Header.index(id)
-						data = self.Data_2D.QOut.Values[:,ind]
-						self.times = self.Data_2D.QOut.Values[:,1]
+						ind = self.Data_2D.QOut.headerIndex(id)
+						data = self.Data_2D.QOut.getColumn(ind)
+						self.times = self.Data_2D.QOut.getTimes()
 						return True, data, message
 					except:
 						message = 'Data not found for 2D QOut with ID: '+id
@@ -1453,9 +2131,9 @@ class ResData():
 			elif(res.upper() in ("VOL","VOLUME")):
 				if self.Data_2D.Vol.loaded:
 					try:
-						ind = self.Data_2D.Vol.Header.index(id)
-						data = self.Data_2D.Vol.Values[:,ind]
-						self.times = self.Data_2D.Vol.Values[:,1]
+						ind = self.Data_2D.Vol.headerIndex(id)
+						data = self.Data_2D.Vol.getColumn(ind)
+						self.times = self.Data_2D.Vol.getTimes()
 						return True, data, message
 					except:
 						message = 'Data not found for 2D Vol with ID: '+id
@@ -1466,9 +2144,9 @@ class ResData():
 			elif(res.upper() in ("SS","SINK/SOURCE")):
 				if self.Data_2D.SS.loaded:
 					try:
-						ind = self.Data_2D.SS.Header.index(id)
-						data = self.Data_2D.SS.Values[:,ind]
-						self.times = self.Data_2D.SS.Values[:,1]
+						ind = self.Data_2D.SS.headerIndex(id)
+						data = self.Data_2D.SS.getColumn(ind)
+						self.times = self.Data_2D.SS.getTimes()
 						return True, data, message
 					except:
 						message = 'Data not found for 2D SS with ID: '+id
@@ -1482,27 +2160,27 @@ class ResData():
 		if (dom.upper() == "RL"):
 			if(res.upper() in  ("H", "H_", "LEVEL","LEVELS","POINT WATER LEVEL","WATER LEVEL")):
 				try:
-					ind = self.Data_RL.H_P.Header.index(id)
-					data = self.Data_RL.H_P.Values[:,ind]
-					self.times = self.Data_RL.H_P.Values[:,1]
+					ind = self.Data_RL.H_P.headerIndex(id)
+					data = self.Data_RL.H_P.getColumn(ind)
+					self.times = self.Data_RL.H_P.getTimes()
 					return True, data, message
 				except:
 					message = 'Data not found for RL point with ID: '+id
 					return False, [0.0], message
 			elif(res.upper() in ("Q","Q_","FLOW","FLOWS")):
 				try:
-					ind = self.Data_RL.Q_L.Header.index(id)
-					data = self.Data_RL.Q_L.Values[:,ind]
-					self.times = self.Data_RL.Q_L.Values[:,1]
+					ind = self.Data_RL.Q_L.headerIndex(id)
+					data = self.Data_RL.Q_L.getColumn(ind)
+					self.times = self.Data_RL.Q_L.getTimes()
 					return True, data, message
 				except:
 					message = 'Data not found for RL line with ID: '+id
 					return False, [0.0], message
 			elif(res.upper() in ("VOL","VOLUME","VOLUMES")):
 				try:
-					ind = self.Data_RL.Vol_R.Header.index(id)
-					data = self.Data_RL.Vol_R.Values[:,ind]
-					self.times = self.Data_RL.Vol_R.Values[:,1]
+					ind = self.Data_RL.Vol_R.headerIndex(id)
+					data = self.Data_RL.Vol_R.getColumn(ind)
+					self.times = self.Data_RL.Vol_R.getTimes()
 					return True, data, message
 				except:
 					message = 'Data not found for RL Region with ID: '+id
@@ -1514,148 +2192,183 @@ class ResData():
 			message = 'ERROR - Expecting model domain to be 1D or 2D.'
 			return False, [0.0], message
 
+	def getTimeseries(self, dom, res):
+		"""
+		Returns the Timeseries object for a domain and result type. Result type names are the same as getTSData.
+		1D US / DS levels return the 1D water level Timeseries.
+
+		:param dom: str -> domain e.g. '1D', '2D', 'RL'
+		:param res: str -> result type e.g. 'H'
+		:return: Timeseries or None
+		"""
+
+		res = res.upper()
+		if dom.upper() == "1D":
+			types = [
+				(("H", "H_", "LEVEL", "LEVELS", "US_H", "US LEVELS", "DS_H", "DS LEVELS"), self.Data_1D.H),
+				(("E", "E_", "ENERGY LEVEL", "ENERGY LEVELS"), self.Data_1D.E),
+				(("Q", "Q_", "FLOW", "FLOWS"), self.Data_1D.Q),
+				(("V", "V_", "VELOCITY", "VELOCITIES"), self.Data_1D.V),
+				(("A", "A_", "FLOW AREA", "FLOW AREAS"), self.Data_1D.A),
+				(("MB",), self.Data_1D.MB),
+				(("LOSSES", "CL"), self.Data_1D.CL),
+			]
+		elif dom.upper() == "2D":
+			types = [
+				(("H", "H_", "LEVEL", "LEVELS", "POINT WATER LEVEL"), self.Data_2D.H),
+				(("Q", "Q_", "FLOW", "FLOWS"), self.Data_2D.Q),
+				(("X FLOW",), self.Data_2D.Qx),
+				(("Y FLOW",), self.Data_2D.Qy),
+				(("V", "V_", "VELOCITY", "VELOCITIES"), self.Data_2D.V),
+				(("GL", "GAUGE LEVEL"), self.Data_2D.GL),
+				(("QA", "FLOW AREA"), self.Data_2D.QA),
+				(("QS", "STRUCTURE FLOW"), self.Data_2D.QS),
+				(("HU", "US LEVELS"), self.Data_2D.HUS),
+				(("HD", "DS LEVELS"), self.Data_2D.HDS),
+				(("VX",), self.Data_2D.Vx),
+				(("VY",), self.Data_2D.Vy),
+				(("VU",), self.Data_2D.Vu),
+				(("VV",), self.Data_2D.Vv),
+				(("VA",), self.Data_2D.VA),
+				(("INTEGRAL FLOW", "FLOW INTEGRAL"), self.Data_2D.QI),
+				(("HAVG", "AVERAGE LEVEL", "AVERAGE WATER LEVEL"), self.Data_2D.HAvg),
+				(("HMAX", "MAX LEVEL", "MAX WATER LEVEL"), self.Data_2D.HMax),
+				(("QIN", "FLOW INTO REGION", "FLOW INTO"), self.Data_2D.QIn),
+				(("QOUT", "FLOW OUT OF REGION", "FLOW OUT"), self.Data_2D.QOut),
+				(("VOL", "VOLUME"), self.Data_2D.Vol),
+				(("SS", "SINK/SOURCE"), self.Data_2D.SS),
+			]
+		elif dom.upper() == "RL":
+			types = [
+				(("H", "H_", "LEVEL", "LEVELS", "POINT WATER LEVEL", "WATER LEVEL"), self.Data_RL.H_P),
+				(("Q", "Q_", "FLOW", "FLOWS"), self.Data_RL.Q_L),
+				(("VOL", "VOLUME", "VOLUMES"), self.Data_RL.Vol_R),
+			]
+		else:
+			return None
+
+		for names, ts in types:
+			if res in names:
+				return ts
+
+		return None
+
+	def followUpdate(self):
+		"""
+		Follow mode for simulations that are still running. Appends timesteps written to the time series csv
+		files since they were last read. Maximums and netcdf results are not updated.
+
+		:return: bool -> True if there are new timesteps
+		"""
+
+		if self.resFileFormat != "CSV":
+			return False
+
+		nTimes = len(self.times)
+		for ts in self.timeseries():
+			if ts.isValuesLoaded():
+				ts.appendNewRows()
+			else:
+				ts.times = None  # re-read when requested
+		self.times = None
+		self.LP.matrices = {}
+		self.LP.matrixNodes = None
+
+		return len(self.times) != nTimes
+
+	def getTSDataMany(self, ids, dom, res):
+		"""
+		Batched version of getTSData - extracts the time series for all IDs with a single array slice
+		rather than one lookup per ID. Flow regime and losses are not supported (use getTSData).
+
+		:param ids: list -> str element IDs
+		:param dom: str -> domain e.g. '1D', '2D', 'RL'
+		:param res: str -> result type e.g. 'H'
+		:return: list -> bool found for each ID, numpy.ma.MaskedArray (time x ID) or None, str message
+		"""
+
+		message = None
+		ts = self.getTimeseries(dom, res)
+		if ts is None or res.upper() in ("LOSSES", "CL"):
+			message = 'Warning - Unsupported data type for batch extraction: {0} {1}'.format(dom, res)
+			return [False] * len(ids), None, message
+		if not ts.loaded:
+			message = 'No {0} {1} Data loaded for: {2}'.format(dom, res, self.displayname)
+			return [False] * len(ids), None, message
+
+		# US / DS levels - convert channel IDs to node IDs
+		if dom.upper() == "1D" and res.upper() in ("US_H", "US LEVELS", "DS_H", "DS LEVELS"):
+			nodes = self.Channels.chan_US_Node if res.upper() in ("US_H", "US LEVELS") else self.Channels.chan_DS_Node
+			ids = [nodes[self.Channels.chan_name2index[str(x)]] if str(x) in self.Channels.chan_name2index else None
+			       for x in ids]
+
+		found = []
+		cols = []
+		for id in ids:
+			try:
+				cols.append(ts.headerIndex(id))
+				found.append(True)
+			except ValueError:
+				cols.append(0)
+				found.append(False)
+		if not [x for x in found if x]:
+			message = 'Data not found for {0} {1}'.format(dom, res)
+			return found, None, message
+
+		data = numpy.ma.masked_array(ts.getColumns(cols))
+		missing = [i for i, x in enumerate(found) if not x]
+		if missing:
+			data[:,missing] = numpy.ma.masked
+		self.times = ts.getTimes()
+
+		return found, data, message
+
 	def LP_getConnectivity(self,id1,id2):
 		#print('determining LP connectivity')
 		message = None
 		error = False
 		self.LP.chan_list = []
+		# check 1st ID exists
+		ind1 = self.Channels.chan_name2index.get(str(id1))
+		if ind1 is None:
+			error = True
+			message = 'ERROR - ID not found: ' + str(id1)
+			return error, message
 		if (id2 == None): # only one channel selected
-			finished = False
-			i = 0
-			chan_list = tuple(self.Channels.chan_name)
-			try:
-				ind1 = chan_list.index(str(id1))
-			except:
-				#QMessageBox.information(iface.mainWindow(),"ERROR", ("ID not found: " + str(id1)))
-				#print('ERROR - ID not found: ' + str(id1))
-				message = 'ERROR - ID not found: ' + str(id1)
+			path, notFound = self.Channels.downstreamPath(ind1)
+			if notFound > -1:
 				error = True
+				message = 'ERROR - Unable to process channel: ' + self.Channels.chan_DS_Chan[notFound]
 				return error, message
-			self.LP.chan_list = [id1]
-			self.LP.chan_index = [ind1]
-			self.LP.node_list = [(self.Channels.chan_US_Node[ind1])]
-			self.LP.node_list.append(self.Channels.chan_DS_Node[ind1])
-			id = ind1
-			while not finished:
-				i = i + 1
-				chan = self.Channels.chan_DS_Chan[id]
-				if(chan=='------'):
-					finished = True
-				else:
-					self.LP.chan_list.append(chan)
-					try:
-						id = self.Channels.chan_name.index(chan)
-						self.LP.chan_index.append(id)
-						self.LP.node_list.append(self.Channels.chan_DS_Node[id])
-					except:
-						error = True
-						message = 'ERROR - Unable to process channel: '+chan
-						return error, message
-			if not error:
-				self.LP.connected = True
-			return error, message
-
 		else: # two channels selected (check for more than two in main routine)
-			finished = False
-			found = False
-			i = 0
-			chan_list = tuple(self.Channels.chan_name)
-			# check 1st ID exists
-			try:
-				ind1 = chan_list.index(str(id1))
-			except:
-				error = True
-				message = 'ERROR - ID not found: '+str(id1)
-				return error, message
 			# check 2nd ID exists
-			try:
-				ind2 = chan_list.index(str(id2))
-			except:
-				#QMessageBox.information(iface.mainWindow(),"ERROR", ("ID not found: " + str(id2)))
+			ind2 = self.Channels.chan_name2index.get(str(id2))
+			if ind2 is None:
 				error = True
-				message = 'ERROR - ID not found: '+str(id2)
+				message = 'ERROR - ID not found: ' + str(id2)
 				return error, message
-			# assume ID2 is downstream of ID1
-			endchan = id2
-			self.LP.chan_list = [id1]
-			self.LP.chan_index = [ind1]
-			self.LP.node_list = [(self.Channels.chan_US_Node[ind1])]
-			self.LP.node_list.append(self.Channels.chan_DS_Node[ind1])
-			id = ind1
-			while not finished:
-				i = i + 1
-				chan = self.Channels.chan_DS_Chan[id]
-				if(chan=='------'):
-					finished = True
-				elif(chan==endchan):
-					found = True
-					finished = True
-					self.LP.chan_list.append(chan)
-					try:
-						id = self.Channels.chan_name.index(chan)
-						self.LP.chan_index.append(id)
-						self.LP.node_list.append(self.Channels.chan_DS_Node[id])
-					except:
-						error = True
-						message = 'ERROR - Unable to process channel: '+chan
-						return error, message
-				else:
-					self.LP.chan_list.append(chan)
-					try:
-						id = self.Channels.chan_name.index(chan)
-						self.LP.chan_index.append(id)
-						self.LP.node_list.append(self.Channels.chan_DS_Node[id])
-					except:
-						error = True
-						message = 'ERROR - ID not found: '+str(id)
-						return error, message
-
-			if not (found): # id2 is not downstream of 1d1, reverse direction and try again...
-				#QMessageBox.information(iface.mainWindow(), "DEBUG", "reverse direction and try again")
-				finished = False
-				found = False
-				i = 0
-				endchan = id1
-				self.LP.chan_list = [id2]
-				self.LP.chan_index = [ind2]
-				self.LP.node_list = [(self.Channels.chan_US_Node[ind2])]
-				self.LP.node_list.append(self.Channels.chan_DS_Node[ind2])
-				id = ind2
-				while not finished:
-					i = i + 1
-					chan = self.Channels.chan_DS_Chan[id]
-					if(chan=='------'):
-						finished = True
-					elif(chan==endchan):
-						found = True
-						finished = True
-						self.LP.chan_list.append(chan)
-						try:
-							id = self.Channels.chan_name.index(chan)
-							self.LP.chan_index.append(id)
-							self.LP.node_list.append(self.Channels.chan_DS_Node[id])
-						except:
-							error = True
-							message = 'ERROR - Unable to process channel: '+chan
-							return error, message
-					else:
-						self.LP.chan_list.append(chan)
-						try:
-							id = self.Channels.chan_name.index(chan)
-							self.LP.chan_index.append(id)
-							self.LP.node_list.append(self.Channels.chan_DS_Node[id])
-						except:
-							error = True
-							message = 'ERROR - Unable to process channel: '+chan
-							return error, message
-			if not (found): # id1 and 1d2 are not connected
+			# assume ID2 is downstream of ID1, otherwise reverse direction
+			path = None
+			for us, ds in ((ind1, ind2), (ind2, ind1)):
+				path, notFound = self.Channels.pathBetween(us, ds)
+				if path is not None:
+					break
+				if notFound > -1:
+					error = True
+					message = 'ERROR - Unable to process channel: ' + self.Channels.chan_DS_Chan[notFound]
+					return error, message
+			if path is None: # id1 and 1d2 are not connected
 				error = True
-				message = 'Channels ' +id1 + ' and '+id2+' are not connected'
+				message = 'Channels ' + str(id1) + ' and ' + str(id2) + ' are not connected'
 				return error, message
-			else:
-				if not error:
-					self.LP.connected = True
-			return error, message
+
+		self.LP.chan_list = [self.Channels.chan_name[x] for x in path]
+		self.LP.chan_index = path
+		self.LP.node_list = [self.Channels.chan_US_Node[path[0]]]
+		self.LP.node_list.extend(self.Channels.chan_DS_Node[x] for x in path)
+		self.LP.connected = True
+
+		return error, message
 
 	def LP_getStaticData(self):
 		# get the channel and node properties length, elevations etc doesn't change with results
@@ -1789,7 +2502,7 @@ class ResData():
 
 		for i, nd in enumerate(self.LP.node_list):
 			try: #get node index and elevations
-				ind = self.nodes.node_name.index(nd)
+				ind = self.nodes.node_name2index[nd]
 				self.LP.node_index.append(ind)
 				self.LP.node_bed.append(self.nodes.node_bed[ind])
 				self.LP.node_top.append(self.nodes.node_top[ind])
@@ -1798,7 +2511,7 @@ class ResData():
 				message = 'Unable to find node in _Nodes.csv file. Node: '+nd
 				return error, message
 			try: #get index to data in 1d_H.csv used when getting temporal data
-				ind = self.Data_1D.H.Header.index(nd)
+				ind = self.Data_1D.H.headerIndex(nd)
 				self.LP.H_nd_index.append(ind)
 			except:
 				error = True
@@ -1850,7 +2563,7 @@ class ResData():
 			chan_list = self.nodes.node_channels[nd_ind]
 			for j in range(nchan):
 				chan = chan_list[j]
-				indC = self.Channels.chan_name.index(chan)
+				indC = self.Channels.chan_name2index[chan]
 				usC = self.Channels.chan_US_Chan[indC]
 				dsC = self.Channels.chan_DS_Chan[indC]
 				if usC == "------" and dsC == "------": #channel is pit channel
@@ -1900,42 +2613,76 @@ class ResData():
 			error = True
 			message = 'ERROR - Closest time: '+str(self.times[t_ind])+' outside time search tolerance: '+str(dt_tol)
 			return  error, message
+		error, message, data = self.LP_getDataMatrix(dat_type)
+		if error:
+			return error, message
 		if dat_type == 'Water Level':
-			self.LP.Hdata = []
-			if not self.Data_1D.H.loaded:
+			self.LP.Hdata = data[t_ind]
+		else:
+			self.LP.Edata = data[t_ind]
+
+		return error, message
+
+	def LP_getDataMatrix(self, dat_type):
+		"""
+		Returns the long profile data for every timestep as a 2D array (timestep x chainage). Levels are
+		limited to the channel inverts. The array is calculated once for the current connectivity and
+		cached in the LP object.
+
+		:param dat_type: str -> 'Water Level' or 'Energy Level'
+		:return: bool error, str message, numpy.ma.MaskedArray
+		"""
+
+		error = False
+		message = None
+		if dat_type == 'Water Level':
+			ts = self.Data_1D.H
+			if not ts.loaded:
 				error = True
 				message = 'ERROR - No water level data loaded.'
-				return error, message
-			for i, h_ind in enumerate(self.LP.H_nd_index):
-				if i == 0:
-					self.LP.Hdata.append(max(self.Data_1D.H.Values[t_ind,h_ind], self.LP.chan_inv[i]))
-				elif i < len(self.LP.H_nd_index) - 1:
-					self.LP.Hdata.append(max(self.Data_1D.H.Values[t_ind,h_ind], self.LP.chan_inv[2*i-1]))
-					self.LP.Hdata.append(max(self.Data_1D.H.Values[t_ind,h_ind], self.LP.chan_inv[2*i]))
-				else:
-					self.LP.Hdata.append(max(self.Data_1D.H.Values[t_ind,h_ind], self.LP.chan_inv[2*i-1]))
+				return error, message, None
 		elif dat_type == 'Energy Level':
-			self.LP.Edata = []
-			if not self.Data_1D.E.loaded:
+			ts = self.Data_1D.E
+			if not ts.loaded:
 				error = True
 				message = 'ERROR - No energy level data loaded.'
-				return error, message
-			for i, h_ind in enumerate(self.LP.H_nd_index):
-				if i == 0:
-					self.LP.Edata.append(max(self.Data_1D.E.Values[t_ind,h_ind], self.LP.chan_inv[i]))
-				elif i < len(self.LP.H_nd_index) - 1:
-					self.LP.Edata.append(max(self.Data_1D.E.Values[t_ind,h_ind], self.LP.chan_inv[2*i-1]))
-					self.LP.Edata.append(max(self.Data_1D.E.Values[t_ind,h_ind], self.LP.chan_inv[2*i]))
-				else:
-					self.LP.Edata.append(max(self.Data_1D.E.Values[t_ind,h_ind], self.LP.chan_inv[2*i-1]))
+				return error, message, None
 		else:
 			error = True
 			message = 'ERROR - Only head or energy supported for LP temporal data'
-			return  error, message
+			return error, message, None
 
-		return error, message
+		nodes = tuple(self.LP.H_nd_index)
+		if nodes != self.LP.matrixNodes:
+			self.LP.matrices = {}
+			self.LP.matrixNodes = nodes
+		if dat_type in self.LP.matrices:
+			return error, message, self.LP.matrices[dat_type]
+
+		# upstream and downstream node repeated for each internal node - matches dist_chan_inverts
+		repeats = numpy.full(len(nodes), 2, dtype=int)
+		if nodes:
+			repeats[0] = 1
+			repeats[-1] = 1
+		cols = numpy.repeat(nodes, repeats)
+		inverts = numpy.array(self.LP.chan_inv[:cols.size], dtype=float)
+		data = numpy.ma.maximum(ts.getColumns(cols), inverts)
+		self.LP.matrices[dat_type] = data
+
+		return error, message, data
+
+	@property
+	def times(self):
+		if self._times is None:
+			self._times = self.timeSteps()
+		return self._times
+
+	@times.setter
+	def times(self, times):
+		self._times = times
 
 	def __init__(self):
+		self._times = None
 		self.script_version = version
 		self.filename = None
 		self.fpath = None
@@ -1964,6 +2711,11 @@ class ResData():
 		self.ncDims = []
 		self.ncVars = []
 
+		# compact storage of time series values (see Timeseries) - set before Load
+		self.compact = False
+		self.compactDtype = numpy.float32
+		self.timesPool = []  # time vectors shared between result types
+
 	def getResFileFormat(self):
 		try:
 			data = numpy.genfromtxt(self.filename, dtype=str, delimiter="==")
@@ -2017,6 +2769,11 @@ class ResData():
 			message = "ERROR - TPC file does not exist: {0}".format(fname)
 			return error, message
 
+		for ts in self.timeseries():
+			ts.compact = self.compact
+			ts.compactDtype = self.compactDtype
+			ts.timesPool = self.timesPool
+
 		self.resFileFormat = self.getResFileFormat()
 		if self.resFileFormat == "CSV":  # use CSV if available
 			pass
@@ -2258,8 +3015,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('1D Water Levels')
-						if self.nTypes == 1:
-							self.times = self.Data_1D.H.Values[:,1]
 				elif self.resFileFormat == "NC":
 					if self.netcdf_fpath:
 						error, message = self.Data_1D.H.loadFromNetCDF(self.netcdf_fpath, "water_levels_1d", "node_names",
@@ -2269,8 +3024,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('1D Water Levels')
-						if self.nTypes == 1:
-							self.times = self.Data_1D.H.Values[:, 1]
 			elif dat_type == '1D Energy Levels':
 				if self.resFileFormat == "CSV":
 					if rdata != 'NONE':
@@ -2280,8 +3033,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('1D Energy Levels')
-						if self.nTypes == 1:
-							self.times = self.Data_1D.H.Values[:,1]
 				elif self.resFileFormat == "NC":
 					if self.netcdf_fpath:
 						error, message = self.Data_1D.E.loadFromNetCDF(self.netcdf_fpath, "energy_levels_1d", "node_names",
@@ -2291,8 +3042,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('1D Energy Levels')
-						if self.nTypes == 1:
-							self.times = self.Data_1D.E.Values[:, 1]
 			elif dat_type == 'Reporting Location Points Water Levels':
 				if self.resFileFormat == "CSV":
 					if rdata != 'NONE':
@@ -2302,8 +3051,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('RL Water Levels')
-						if self.nTypes == 1:
-							self.times = self.Data_RL.H_P.Values[:, 1]
 				elif self.resFileFormat == "NC":
 					if self.netcdf_fpath:
 						error, message = self.Data_RL.H_P.loadFromNetCDF(self.netcdf_fpath, "water_levels_rl", "name_water_levels_rl",
@@ -2314,8 +3061,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('RL Water Levels')
-						if self.nTypes == 1:
-							self.times = self.Data_RL.H_P.Values[:, 1]
 			elif dat_type == 'Reporting Location Lines Flows':
 				if self.resFileFormat == "CSV":
 					if rdata != 'NONE':
@@ -2325,8 +3070,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('RL Flows')
-						if self.nTypes == 1:
-							self.times = self.Data_RL.Q_L.Values[:, 1]
 				elif self.resFileFormat == "NC":
 					if self.netcdf_fpath:
 						error, message = self.Data_RL.Q_L.loadFromNetCDF(self.netcdf_fpath, "flows_rl", "name_flows_rl",
@@ -2337,8 +3080,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('RL Flows')
-						if self.nTypes == 1:
-							self.times = self.Data_RL.Q_L.Values[:, 1]
 			elif dat_type == 'Reporting Location Regions Volumes':
 				if self.resFileFormat == "CSV":
 					if rdata != 'NONE':
@@ -2348,8 +3089,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('RL Region Volume')
-						if self.nTypes == 1:
-							self.times = self.Data_RL.Vol_R.Values[:, 1]
 						try:
 							chk_nLocs = self.Data_RL.nRegion
 							if (chk_nLocs != self.Data_RL.Vol_R.nLocs):
@@ -2368,8 +3107,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('RL Region Volume')
-						if self.nTypes == 1:
-							self.times = self.Data_RL.Vol_R.Values[:, 1]
 			elif dat_type == '1D Node Maximums':
 				if rdata != 'NONE':
 					fullpath = getOSIndependentFilePath(self.fpath, rdata)
@@ -2391,8 +3128,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('1D Flows')
-						if self.nTypes == 1:
-							self.times = self.Data_1D.Q.Values[:,1]
 				elif self.resFileFormat == "NC":
 					if self.netcdf_fpath:
 						error, message = self.Data_1D.Q.loadFromNetCDF(self.netcdf_fpath, "flow_1d",
@@ -2404,8 +3139,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('1D Flows')
-						if self.nTypes == 1:
-							self.times = self.Data_1D.Q.Values[:, 1]
 			elif dat_type == '1D Flow Areas':
 				if self.resFileFormat == "CSV":
 					if rdata != 'NONE':
@@ -2415,8 +3148,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('1D Flow Area')
-						if self.nTypes == 1:
-							self.times = self.Data_1D.A.Values[:,1]
 				elif self.resFileFormat == "NC":
 					if self.netcdf_fpath:
 						error, message = self.Data_1D.A.loadFromNetCDF(self.netcdf_fpath, "flow_areas_1d",
@@ -2428,8 +3159,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('1D Flow Area')
-						if self.nTypes == 1:
-							self.times = self.Data_1D.A.Values[:, 1]
 			elif dat_type == '1D Velocities':
 				if self.resFileFormat == "CSV":
 					if rdata != 'NONE':
@@ -2439,8 +3168,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('1D Velocities')
-						if self.nTypes == 1:
-							self.times = self.Data_1D.V.Values[:,1]
 				elif self.resFileFormat == "NC":
 					if self.netcdf_fpath:
 						error, message = self.Data_1D.V.loadFromNetCDF(self.netcdf_fpath, "velocities_1d",
@@ -2452,8 +3179,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('1D Velocities')
-						if self.nTypes == 1:
-							self.times = self.Data_1D.V.Values[:, 1]
 			elif dat_type.find('2D Line Flow Area') >= 0:
 				if self.resFileFormat == "CSV":
 					if rdata != 'NONE':
@@ -2484,8 +3209,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('2D Line Flow Area')
-						if self.nTypes == 1:
-							self.times = self.Data_2D.QA.Values[:, 1]
 			elif dat_type.find('2D Line Flow') >= 0:
 				if self.resFileFormat == "CSV":
 					if rdata != 'NONE':
@@ -2497,8 +3220,6 @@ class ResData():
 						if error:
 							return error, message
 						self.nTypes = self.nTypes + 1
-						if self.nTypes == 1:
-							self.times = self.Data_2D.Q.Values[:,1]
 						self.Types.append('2D Line Flow')
 						try:
 							chk_nLocs = int(dat_type[indA+1:indB])
@@ -2519,8 +3240,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('2D Line Flow')
-						if self.nTypes == 1:
-							self.times = self.Data_2D.Q.Values[:, 1]
 			elif dat_type.find('2D Line X-Flow') >= 0:
 				if self.resFileFormat == "CSV":
 					if rdata != 'NONE':
@@ -2533,8 +3252,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('2D Line X-Flow')
-						if self.nTypes == 1:
-							self.times = self.Data_2D.Qx.Values[:, 1]
 				elif self.resFileFormat == "NC":
 					if self.netcdf_fpath:
 						pass  # for now not written to netcdf
@@ -2547,8 +3264,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('2D Line X-Flow')
-						if self.nTypes == 1:
-							self.times = self.Data_2D.Qx.Values[:, 1]
 			elif dat_type.find('2D Line Y-Flow') >= 0:
 				if self.resFileFormat == "CSV":
 					if rdata != 'NONE':
@@ -2561,8 +3276,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('2D Line Y-Flow')
-						if self.nTypes == 1:
-							self.times = self.Data_2D.Qy.Values[:, 1]
 				elif self.resFileFormat == "NC":
 					if self.netcdf_fpath:
 						pass  # for now not written to netcdf
@@ -2575,8 +3288,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('2D Line Y-Flow')
-						if self.nTypes == 1:
-							self.times = self.Data_2D.Qy.Values[:, 1]
 			elif dat_type.find('2D Point Gauge Level') >= 0:
 				if self.resFileFormat == "CSV":
 					if rdata != 'NONE':
@@ -2609,8 +3320,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('2D Point Gauge Level')
-						if self.nTypes == 1:
-							self.times = self.Data_2D.GL.Values[:, 1]
 			elif dat_type.find('2D Point Water Level') >= 0:
 				if self.resFileFormat == "CSV":
 					if rdata != 'NONE':
@@ -2623,8 +3332,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('2D Point Water Level')
-						if self.nTypes == 1:
-							self.times = self.Data_2D.H.Values[:,1]
 						try:
 							chk_nLocs = int(dat_type[indA+1:indB])
 							if (chk_nLocs != self.Data_2D.H.nLocs):
@@ -2644,8 +3351,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('2D Point Water Level')
-						if self.nTypes == 1:
-							self.times = self.Data_2D.H.Values[:, 1]
 			elif dat_type.find('2D Point X-Vel') >= 0:
 				if self.resFileFormat == "CSV":
 					if rdata != 'NONE':
@@ -2678,8 +3383,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('2D Point X-Vel')
-						if self.nTypes == 1:
-							self.times = self.Data_2D.Vx.Values[:, 1]
 			elif dat_type.find('2D Point Y-Vel') >= 0:
 				if self.resFileFormat == "CSV":
 					if rdata != 'NONE':
@@ -2712,8 +3415,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('2D Point Y-Vel')
-						if self.nTypes == 1:
-							self.times = self.Data_2D.Vy.Values[:, 1]
 			elif dat_type.find('2D Point u-Vel') >= 0:
 				if self.resFileFormat == "CSV":
 					if rdata != 'NONE':
@@ -2726,8 +3427,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('2D Point u-Vel')
-						if self.nTypes == 1:
-							self.times = self.Data_2D.Vu.Values[:, 1]
 				elif self.resFileFormat == "NC":
 					if self.netcdf_fpath:
 						pass  # for now not written to netcdf
@@ -2740,8 +3439,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('2D Point u-Vel')
-						if self.nTypes == 1:
-							self.times = self.Data_2D.Vu.Values[:, 1]
 			elif dat_type.find('2D Point v-Vel') >= 0:
 				if self.resFileFormat == "CSV":
 					if rdata != 'NONE':
@@ -2754,8 +3451,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('2D Point v-Vel')
-						if self.nTypes == 1:
-							self.times = self.Data_2D.Vv.Values[:, 1]
 				elif self.resFileFormat == "NC":
 					if self.netcdf_fpath:
 						pass  # for now not written to netcdf
@@ -2768,8 +3463,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('2D Point v-Vel')
-						if self.nTypes == 1:
-							self.times = self.Data_2D.Vv.Values[:, 1]
 			elif dat_type.find('2D Point Flow Direction') >= 0:
 				if self.resFileFormat == "CSV":
 					if rdata != 'NONE':
@@ -2782,8 +3475,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('2D Point Velocity Angle')
-						if self.nTypes == 1:
-							self.times = self.Data_2D.VA.Values[:, 1]
 				elif self.resFileFormat == "NC":
 					if self.netcdf_fpath:
 						pass  # for now not written to netcdf
@@ -2796,8 +3487,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('2D Point Velocity Angle')
-						if self.nTypes == 1:
-							self.times = self.Data_2D.VA.Values[:, 1]
 			elif dat_type.find('2D Point Velocity') >= 0:
 				if self.resFileFormat == "CSV":
 					if rdata != 'NONE':
@@ -2829,8 +3518,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('2D Point Velocity')
-						if self.nTypes == 1:
-							self.times = self.Data_2D.V.Values[:, 1]
 			elif dat_type.find('2D Line Integral Flow') >= 0:
 				if self.resFileFormat == "CSV":
 					if rdata != 'NONE':
@@ -2862,8 +3549,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('2D Line Integral Flow')
-						if self.nTypes == 1:
-							self.times = self.Data_2D.QI.Values[:, 1]
 			elif dat_type.find('2D Line Structure Flow') >= 0:
 				if self.resFileFormat == "CSV":
 					if rdata != 'NONE':
@@ -2895,8 +3580,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('2D Line Structure Flow')
-						if self.nTypes == 1:
-							self.times = self.Data_2D.QS.Values[:, 1]
 			elif dat_type.find('2D Line U/S Structure Water') >= 0:
 				if self.resFileFormat == "CSV":
 					if rdata != 'NONE':
@@ -2928,8 +3611,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('2D Structure Levels')
-						if self.nTypes == 1:
-							self.times = self.Data_2D.HUS.Values[:, 1]
 			elif dat_type.find('2D Line D/S Structure Water') >= 0:
 				if self.resFileFormat == "CSV":
 					if rdata != 'NONE':
@@ -2961,8 +3642,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('2D Structure Levels')
-						if self.nTypes == 1:
-							self.times = self.Data_2D.HDS.Values[:, 1]
 			elif dat_type.find('2D Region Average Water Level') >= 0:
 				if self.resFileFormat == "CSV":
 					if rdata != 'NONE':
@@ -2994,8 +3673,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('2D Region Average Water Level')
-						if self.nTypes == 1:
-							self.times = self.Data_2D.HAvg.Values[:, 1]
 			elif dat_type.find('2D Region Max Water Level') >= 0:
 				if self.resFileFormat == "CSV":
 					if rdata != 'NONE':
@@ -3027,8 +3704,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('2D Region Max Water Level')
-						if self.nTypes == 1:
-							self.times = self.Data_2D.HMax.Values[:, 1]
 			elif dat_type.find('2D Region Flow into Region') >= 0:
 				if self.resFileFormat == "CSV":
 					if rdata != 'NONE':
@@ -3059,8 +3734,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('2D Region Flow into')
-						if self.nTypes == 1:
-							self.times = self.Data_2D.QIn.Values[:, 1]
 			elif dat_type.find('2D Region Flow out of Region') >= 0:
 				if self.resFileFormat == "CSV":
 					if rdata != 'NONE':
@@ -3091,8 +3764,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('2D Region Flow out of')
-						if self.nTypes == 1:
-							self.times = self.Data_2D.QOut.Values[:, 1]
 			elif dat_type.find('2D Region Volume') >= 0:
 				if self.resFileFormat == "CSV":
 					if rdata != 'NONE':
@@ -3123,8 +3794,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('2D Region Volume')
-						if self.nTypes == 1:
-							self.times = self.Data_2D.Vol.Values[:, 1]
 			elif dat_type.find('Region Sink/Source') >= 0:
 				if self.resFileFormat == "CSV":
 					if rdata != 'NONE':
@@ -3155,8 +3824,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('2D Region Sink/Source')
-						if self.nTypes == 1:
-							self.times = self.Data_2D.SS.Values[:, 1]
 			elif dat_type == 'Reporting Location Points Maximums':
 				if rdata != 'NONE':
 					fullpath = getOSIndependentFilePath(self.fpath, rdata)
@@ -3184,8 +3851,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('1D Mass Balance Error')
-						if self.nTypes == 1:
-							self.times = self.Data_1D.MB.Values[:, 1]
 				elif self.resFileFormat == "NC":
 					if self.netcdf_fpath:
 						error, message = self.Data_1D.MB.loadFromNetCDF(self.netcdf_fpath, "mass_balance_error_1d",
@@ -3197,8 +3862,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('1D Mass Balance Error')
-						if self.nTypes == 1:
-							self.times = self.Data_1D.MB.Values[:, 1]
 			elif dat_type == "1D Node Regime":
 				if self.resFileFormat == "CSV":
 					if rdata != 'NONE':
@@ -3208,8 +3871,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('1D Node Flow Regime')
-						if self.nTypes == 1:
-							self.times = self.Data_1D.NF.Values[:, 1].astype(float)
 				elif self.resFileFormat == "NC":
 					if self.netcdf_fpath:
 						error, message = self.Data_1D.NF.loadFromNetCDF(self.netcdf_fpath, "node_flow_regime_1d",
@@ -3221,8 +3882,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('1D Node Flow Regime')
-						if self.nTypes == 1:
-							self.times = self.Data_1D.NF.Values[:, 1]
 			elif dat_type == "1D Channel Regime":
 				if self.resFileFormat == "CSV":
 					if rdata != 'NONE':
@@ -3232,8 +3891,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('1D Channel Flow Regime')
-						if self.nTypes == 1:
-							self.times = self.Data_1D.CF.Values[:, 1].astype(float)
 				elif self.resFileFormat == "NC":
 					if self.netcdf_fpath:
 						error, message = self.Data_1D.CF.loadFromNetCDF(self.netcdf_fpath, "channel_flow_regime_1d",
@@ -3245,8 +3902,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('1D Channel Flow Regime')
-						if self.nTypes == 1:
-							self.times = self.Data_1D.CF.Values[:, 1]
 			elif dat_type == "1D Channel Losses":
 				if self.resFileFormat == "CSV":
 					if rdata != 'NONE':
@@ -3256,8 +3911,6 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('1D Channel Losses')
-						if self.nTypes == 1:
-							self.times = self.Data_1D.CL.Values[:, 1]
 				elif self.resFileFormat == "NC":
 					if self.netcdf_fpath:
 						error, message = self.Data_1D.CL.loadFromNetCDF(self.netcdf_fpath, "losses_1d",
@@ -3269,17 +3922,101 @@ class ResData():
 							return error, message
 						self.nTypes = self.nTypes + 1
 						self.Types.append('1D Channel Losses')
-						if self.nTypes == 1:
-							self.times = self.Data_1D.CL.Values[:, 1]
 			else:
 				print('Warning - Unknown Data Type '+dat_type)
-		#successful load
+		#successful load - netcdf is kept open while there are result types still to be read
+		if not [x for x in self.timeseries() if x.deferred is not None]:
+			self.close()
+		return error, message
+
+	def timeseries(self):
+		"""
+		Returns all Timeseries objects (1D, 2D and RL) whether or not they have been loaded.
+
+		:return: list -> Timeseries
+		"""
+
+		timeseries = []
+		for data in (self.Data_1D, self.Data_2D, self.Data_RL):
+			timeseries.extend([x for x in vars(data).values() if isinstance(x, Timeseries)])
+
+		return timeseries
+
+	def preload(self, executor, typesTS=(), typesLP=()):
+		"""
+		Reads the values of the given result types concurrently rather than on first access. Only the result
+		types that are selected for plotting are read, the rest are still read on demand. Accessing a result
+		type that is still being read waits for it to finish. NetCDF results are still read on demand as the
+		netcdf library is not thread safe.
+
+		:param executor: concurrent.futures.Executor
+		:param typesTS: list -> str time series result types e.g. 'Level' (same names as getTSData)
+		:param typesLP: list -> str long profile result types e.g. 'Water Level'
+		:return: list -> concurrent.futures.Future
+		"""
+
+		if self.resFileFormat != "CSV":
+			return []
+
+		timeseries = []
+		for res in typesTS:
+			if res.upper() in ("FLOW REGIME", "NF", "CF"):
+				timeseries.extend([self.Data_1D.NF, self.Data_1D.CF])
+				continue
+			for dom in ("1D", "2D", "RL"):
+				ts = self.getTimeseries(dom, res)
+				if ts is not None:
+					timeseries.append(ts)
+		for res in typesLP:
+			if res == 'Water Level':
+				timeseries.append(self.Data_1D.H)
+			elif res == 'Energy Level':
+				timeseries.append(self.Data_1D.E)
+
+		futures = []
+		for ts in self.timeseries():
+			if ts.deferred is not None and [x for x in timeseries if x is ts]:
+				futures.append(executor.submit(ts.loadValues))
+
+		return futures
+
+	def memoryFootprint(self):
+		"""
+		Returns the memory used by time series values for each loaded result type. Result types that
+		have not been read yet use no memory.
+
+		:return: dict -> str result type e.g. '1D H': int bytes. Includes 'Times' (shared compact time
+		                 vectors) and 'Total'.
+		"""
+
+		footprint = {}
+		for dom, data in (('1D', self.Data_1D), ('2D', self.Data_2D), ('RL', self.Data_RL)):
+			for name, ts in vars(data).items():
+				if isinstance(ts, Timeseries) and ts.isValuesLoaded():
+					footprint['{0} {1}'.format(dom, name)] = ts.memoryFootprint()
+		footprint['Times'] = sum([x.nbytes for x in self.timesPool])
+		footprint['Total'] = sum(footprint.values())
+
+		return footprint
+
+	def close(self):
+		"""
+		Closes the netcdf file if open. Any result types not yet read will no longer be available.
+
+		:return: void
+		"""
+
+		for ts in self.timeseries():
+			if ts.deferred is not None and self.resFileFormat == "NC":
+				ts.deferred = None
+				ts.loaded = False
+			ts.ncReader = None
 		if self.ncid.value > 0:
 			self.ncdll.nc_close(self.ncid)
+			self.ncid = ctypes.c_int(0)
 		if self.ncopen:
 			self.ncopen.close()
 			self.ncopen = None
-		return error, message
 	
 	def pointResultTypesTS(self):
 		"""
@@ -3428,55 +4165,55 @@ class ResData():
 		"""
 		
 		if self.Data_1D.H.loaded:
-			return self.Data_1D.H.Values[:,1]
+			return self.Data_1D.H.getTimes()
 		elif self.Data_1D.V.loaded:
-			return self.Data_1D.V.Values[:,1]
+			return self.Data_1D.V.getTimes()
 		elif self.Data_1D.E.loaded:
-			return self.Data_1D.E.Values[:,1]
+			return self.Data_1D.E.getTimes()
 		elif self.Data_1D.Q.loaded:
-			return self.Data_1D.Q.Values[:,1]
+			return self.Data_1D.Q.getTimes()
 		elif self.Data_1D.A.loaded:
-			return self.Data_1D.A.Values[:,1]
+			return self.Data_1D.A.getTimes()
 		elif self.Data_2D.H.loaded:
-			return self.Data_2D.H.Values[:,1]
+			return self.Data_2D.H.getTimes()
 		elif self.Data_2D.V.loaded:
-			return self.Data_2D.V.Values[:,1]
+			return self.Data_2D.V.getTimes()
 		elif self.Data_2D.Q.loaded:
-			return self.Data_2D.Q.Values[:,1]
+			return self.Data_2D.Q.getTimes()
 		elif self.Data_2D.GL.loaded:
-			return self.Data_2D.GL.Values[:,1]
+			return self.Data_2D.GL.getTimes()
 		elif self.Data_2D.QA.loaded:
-			return self.Data_2D.QA.Values[:,1]
+			return self.Data_2D.QA.getTimes()
 		elif self.Data_2D.QI.loaded:
-			return self.Data_2D.QI.Values[:,1]
+			return self.Data_2D.QI.getTimes()
 		elif self.Data_2D.Vx.loaded:
-			return self.Data_2D.Vx.Values[:,1]
+			return self.Data_2D.Vx.getTimes()
 		elif self.Data_2D.Vy.loaded:
-			return self.Data_2D.Vy.Values[:,1]
+			return self.Data_2D.Vy.getTimes()
 		elif self.Data_2D.QS.loaded:
-			return self.Data_2D.QS.Values[:,1]
+			return self.Data_2D.QS.getTimes()
 		elif self.Data_2D.HUS.loaded:
-			return self.Data_2D.HUS.Values[:,1]
+			return self.Data_2D.HUS.getTimes()
 		elif self.Data_2D.HDS.loaded:
-			return self.Data_2D.HDS.Values[:,1]
+			return self.Data_2D.HDS.getTimes()
 		elif self.Data_2D.HAvg.loaded:
-			return self.Data_2D.HAvg.Values[:,1]
+			return self.Data_2D.HAvg.getTimes()
 		elif self.Data_2D.HMax.loaded:
-			return self.Data_2D.HMax.Values[:,1]
+			return self.Data_2D.HMax.getTimes()
 		elif self.Data_2D.QIn.loaded:
-			return self.Data_2D.QIn.Values[:,1]
+			return self.Data_2D.QIn.getTimes()
 		elif self.Data_2D.QOut.loaded:
-			return self.Data_2D.QOut.Values[:,1]
+			return self.Data_2D.QOut.getTimes()
 		elif self.Data_2D.SS.loaded:
-			return self.Data_2D.SS.Values[:,1]
+			return self.Data_2D.SS.getTimes()
 		elif self.Data_2D.Vol.loaded:
-			return self.Data_2D.Vol.Values[:,1]
+			return self.Data_2D.Vol.getTimes()
 		elif self.Data_RL.H_P.loaded:
-			return self.Data_RL.H_P.Values[:,1]
+			return self.Data_RL.H_P.getTimes()
 		elif self.Data_RL.Q_L.loaded:
-			return self.Data_RL.Q_L.Values[:,1]
+			return self.Data_RL.Q_L.getTimes()
 		elif self.Data_RL.Vol_R.loaded:
-			return self.Data_RL.Vol_R.Values[:,1]
+			return self.Data_RL.Vol_R.getTimes()
 		else:
 			return []
 		
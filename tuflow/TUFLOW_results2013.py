@@ -3,6 +3,7 @@ import numpy
 import csv
 import sys
 from tuflow.tuflowqgis_library import getOSIndependentFilePath
+from tuflow import TUFLOW_results_csv
 version = '2015-05-AA'
 
 class LP():
@@ -77,10 +78,7 @@ class Timeseries():
     def __init__(self,fullpath,prefix, simID):
         self.loaded = False
         try:
-            with open(fullpath, 'r') as csvfile:
-                reader = csv.reader(csvfile, delimiter=',', quotechar='"')
-                header = next(reader)
-            csvfile.close()
+            header = TUFLOW_results_csv.readHeader(fullpath)
         except:
             print("ERROR - Error reading header from: "+fullpath)
         header[0]='Timestep'
@@ -98,7 +96,7 @@ class Timeseries():
             header [i] = a
         self.Header = header
         try:
-            self.Values = numpy.genfromtxt(fullpath, delimiter=",", skip_header=1)
+            self.Values, end = TUFLOW_results_csv.readValues(fullpath, len(header))
             self.loaded = True
         except:
             print("ERROR - Error reading data from: "+fullpath)
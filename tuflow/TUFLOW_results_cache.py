@@ -0,0 +1,175 @@
+import os
+import json
+import numpy
+
+
+CACHE_EXT = '.tscache'
+CACHE_MAGIC = b'TUFLOWTS'
+CACHE_VERSION = 1
+CACHE_ALIGN = 64  # byte alignment of the value block so it can be memory mapped
+
+
+class TimeseriesCache():
+	"""
+	Binary sidecar cache for time series results.
+
+	The cache is written next to the source file (csv or netcdf) the first time it is loaded and is
+	memory mapped on subsequent loads. The cache is only used if the size and modified time of the source
+	file match the values recorded when the cache was written.
+
+	File layout:
+		8 bytes magic, uint32 version, uint32 length of json block, json block (header, ids etc),
+		padding to CACHE_ALIGN bytes, values (C order)
+	"""
+
+	def __init__(self, source, key=''):
+		"""
+		:param source: str -> full path to source file
+		:param key: str -> optional key e.g. netcdf variable name if source contains more than one result type
+		"""
+
+		self.source = source
+		self.key = key
+		if key:
+			self.path = '{0}.{1}{2}'.format(source, key, CACHE_EXT)
+		else:
+			self.path = '{0}{1}'.format(source, CACHE_EXT)
+
+	def sourceStamp(self):
+		"""
+		Returns the size and modified time of the source file.
+
+		:return: tuple -> int size, float mtime
+		"""
+
+		try:
+			stat = os.stat(self.source)
+		except OSError:
+			return None, None
+
+		return stat.st_size, stat.st_mtime
+
+	def readHeader(self):
+		"""
+		Reads the json block of the cache file.
+
+		:return: dict metadata, int byte offset to values. None, None if cache does not exist or is not valid.
+		"""
+
+		if not os.path.exists(self.path):
+			return None, None
+
+		try:
+			with open(self.path, 'rb') as fo:
+				magic = fo.read(len(CACHE_MAGIC))
+				if magic != CACHE_MAGIC:
+					return None, None
+				version, length = numpy.frombuffer(fo.read(8), dtype='<u4')
+				if version != CACHE_VERSION:
+					return None, None
+				meta = json.loads(fo.read(int(length)).decode('utf-8'))
+		except (OSError, ValueError):
+			return None, None
+
+		offset = len(CACHE_MAGIC) + 8 + int(length)
+		offset += -offset % CACHE_ALIGN
+
+		return meta, offset
+
+	def isValid(self):
+		"""
+		Checks the cache exists and is up to date with the source file.
+
+		:return: bool
+		"""
+
+		meta, offset = self.readHeader()
+		if meta is None:
+			return False
+
+		size, mtime = self.sourceStamp()
+		if size is None:
+			return False
+
+		return meta['source_size'] == size and meta['source_mtime'] == mtime
+
+	def read(self):
+		"""
+		Opens the cached values as a read-only memory map.
+
+		:return: dict metadata, numpy.memmap values. None, None if cache is not valid.
+		"""
+
+		meta, offset = self.readHeader()
+		if meta is None:
+			return None, None
+
+		size, mtime = self.sourceStamp()
+		if meta['source_size'] != size or meta['source_mtime'] != mtime:
+			return None, None
+
+		try:
+			values = numpy.memmap(self.path, dtype=meta['dtype'], mode='r', offset=offset,
+			                      shape=tuple(meta['shape']))
+		except (OSError, ValueError):
+			return None, None
+
+		return meta, values
+
+	def write(self, values, meta):
+		"""
+		Writes values and metadata to the cache. Failures (e.g. read only result folder) are ignored
+		as the cache is only an optimisation.
+
+		:param values: numpy.ndarray -> 2D numeric array
+		:param meta: dict -> json serialisable metadata e.g. header, ids
+		:return: bool -> True if cache written
+		"""
+
+		values = numpy.ascontiguousarray(numpy.ma.getdata(values))
+		if values.dtype.kind not in 'fiu' or values.ndim != 2:
+			return False
+
+		size, mtime = self.sourceStamp()
+		if size is None:
+			return False
+
+		meta = dict(meta)
+		meta['source_size'] = size
+		meta['source_mtime'] = mtime
+		meta['dtype'] = values.dtype.str
+		meta['shape'] = list(values.shape)
+		block = json.dumps(meta).encode('utf-8')
+
+		offset = len(CACHE_MAGIC) + 8 + len(block)
+		padding = -offset % CACHE_ALIGN
+
+		tmp = '{0}.tmp'.format(self.path)
+		try:
+			with open(tmp, 'wb') as fo:
+				fo.write(CACHE_MAGIC)
+				fo.write(numpy.array([CACHE_VERSION, len(block)], dtype='<u4').tobytes())
+				fo.write(block)
+				fo.write(b'\x00' * padding)
+				values.tofile(fo)
+			os.replace(tmp, self.path)
+		except OSError:
+			try:
+				os.remove(tmp)
+			except OSError:
+				pass
+			return False
+
+		return True
+
+	def remove(self):
+		"""
+		Deletes the cache file if it exists.
+
+		:return: void
+		"""
+
+		try:
+			os.remove(self.path)
+		except OSError:
+			pass
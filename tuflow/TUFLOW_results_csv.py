@@ -0,0 +1,123 @@
+import re
+import csv
+import warnings
+import numpy
+
+
+CHUNK_SIZE = 2 ** 24  # bytes read per chunk when parsing values (16 MB)
+
+
+class HeaderPatterns():
+	"""
+	Compiled patterns used to strip the simulation name and result prefix from TUFLOW time series
+	csv column names e.g. 'H ND_001 [M01_5m_001]' -> 'ND_001'. Compiled once per result type
+	rather than once per column.
+	"""
+
+	def __init__(self, prefix, simID):
+		self.simID = re.compile(r"\[?{0}]?".format(simID))
+		self.prefix = re.compile(r"{0}\s".format(prefix), re.IGNORECASE)
+
+	def split(self, col):
+		"""
+		Splits a column name into the loss name (if any) and element ID.
+
+		:param col: str -> column name
+		:return: str loss name, str ID. None, None if the prefix is not found.
+		"""
+
+		# strip simulation name - highly unlikely more than one match
+		a = "".join(self.simID.split(col, 2)).strip()
+		# strip prefix - only take the first occurrence just in case there's more than one match
+		rx = self.prefix.search(a)
+		if rx is None:
+			return None, None
+
+		return a[:rx.span()[0]], a[rx.span()[1]:]
+
+
+def readHeader(fullpath):
+	"""
+	Reads the header row of a TUFLOW time series csv.
+
+	:param fullpath: str
+	:return: list -> str column names
+	"""
+
+	with open(fullpath, 'r') as csvfile:
+		reader = csv.reader(csvfile, delimiter=',', quotechar='"')
+		return next(reader)
+
+
+def parseBlock(block, ncols, dtype=float):
+	"""
+	Parses complete csv lines into a 2D array. Numeric blocks are parsed in bulk with numpy.fromstring,
+	falling back to numpy.genfromtxt if the block contains anything fromstring can't read
+	(e.g. empty fields or '******').
+
+	:param block: bytes -> complete lines
+	:param ncols: int -> number of columns
+	:param dtype: type -> float or str
+	:return: numpy.ndarray (rows x ncols)
+	"""
+
+	nrows = block.count(b'\n') + (0 if block.endswith(b'\n') else 1)
+	if dtype is float:
+		text = block.replace(b'\r', b'').rstrip(b'\n').replace(b'\n', b',').decode('utf-8', 'replace')
+		with warnings.catch_warnings():
+			warnings.simplefilter('ignore')
+			try:
+				values = numpy.fromstring(text, dtype=float, sep=',')
+			except ValueError:
+				values = numpy.array([])
+		if values.size == nrows * ncols:
+			return values.reshape((nrows, ncols))
+
+	lines = [x for x in block.decode('utf-8', 'replace').splitlines() if x.strip()]
+	values = numpy.genfromtxt(lines, delimiter=",", dtype=dtype)
+
+	return numpy.atleast_2d(values)
+
+
+def readValues(fullpath, ncols, dtype=float, offset=None, chunkSize=CHUNK_SIZE, partial=True):
+	"""
+	Reads the values of a TUFLOW time series csv in chunks.
+
+	:param fullpath: str
+	:param ncols: int -> number of columns (length of header)
+	:param dtype: type -> float or str
+	:param offset: int -> byte position to start reading from. None to start after the header row.
+	:param chunkSize: int -> number of bytes read per chunk
+	:param partial: bool -> read a last line without a line ending if it has the expected number of columns.
+	                        Should be False if the file is still being written.
+	:return: numpy.ndarray (rows x ncols), int byte position after the last row read
+	"""
+
+	chunks = []
+	with open(fullpath, 'rb') as fo:
+		if offset is None:
+			fo.readline()
+		else:
+			fo.seek(offset)
+		position = fo.tell()
+		remainder = b''
+		while True:
+			block = fo.read(chunkSize)
+			if not block:
+				break
+			block = remainder + block
+			end = block.rfind(b'\n') + 1
+			remainder = block[end:]
+			if block[:end].strip():
+				chunks.append(parseBlock(block[:end], ncols, dtype))
+			position += end
+
+	# last line may be incomplete if the simulation is still running
+	if partial and remainder.strip() and remainder.count(b',') + 1 == ncols:
+		chunks.append(parseBlock(remainder, ncols, dtype))
+		position += len(remainder)
+
+	if not chunks:
+		return numpy.zeros((0, ncols), dtype=dtype), position
+
+	return numpy.concatenate(chunks), position
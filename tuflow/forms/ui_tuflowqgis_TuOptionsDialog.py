@@ -103,6 +103,9 @@ class Ui_TuViewOptions(object):
         self.sbXAxisLabelRotation.setMaximum(359)
         self.sbXAxisLabelRotation.setObjectName("sbXAxisLabelRotation")
         self.gridLayout_2.addWidget(self.sbXAxisLabelRotation, 6, 3, 1, 1)
+        self.cbCompact1D = QtWidgets.QCheckBox(self.groupBox)
+        self.cbCompact1D.setObjectName("cbCompact1D")
+        self.gridLayout_2.addWidget(self.cbCompact1D, 7, 0, 1, 4)
         self.verticalLayout.addWidget(self.groupBox)
         self.groupBox_3 = QtWidgets.QGroupBox(TuViewOptions)
         self.groupBox_3.setObjectName("groupBox_3")
@@ -198,6 +201,8 @@ class Ui_TuViewOptions(object):
         self.label_7.setText(_translate("TuViewOptions", "Preview: "))
         self.label_8.setText(_translate("TuViewOptions", "X-Axis Label Rotation (deg):"))
         self.leDateFormat.setText(_translate("TuViewOptions", "DD/MM/YYYY hh:mm:ss"))
+        self.cbCompact1D.setToolTip(_translate("TuViewOptions", "Store 1D time series values as single precision without the time columns. Applies to results loaded after changing this setting."))
+        self.cbCompact1D.setText(_translate("TuViewOptions", "Compact 1D Time Series Storage (lower memory)"))
         self.groupBox_3.setTitle(_translate("TuViewOptions", "Auto Play"))
         self.label_3.setText(_translate("TuViewOptions", "Auto Play Speed (sec)"))
         self.groupBox_4.setTitle(_translate("TuViewOptions", "Map Plotting"))
@@ -0,0 +1,121 @@
+import os
+import sys
+import time
+import tempfile
+from qgis.core import (QgsApplication, QgsMeshLayer, QgsProject, QgsPrintLayout, QgsLayoutExporter, QgsLayoutSize,
+                       QgsUnitTypes, QgsMeshDatasetIndex)
+from PyQt5.QtCore import QSize
+from PyQt5.QtGui import QFont, QColor
+
+# animation module imports its ui forms by name
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'forms'))
+
+# initialise QGIS data providers
+argv = [bytes(x, 'utf-8') for x in sys.argv]
+qgis = QgsApplication(argv, False)
+qgis.initQgis()
+
+from tuflow.tuflowqgis_tuviewer.tuflowqgis_tuanimation import animation, prepare_composition
+
+
+# usage: python animation_speed_test.py <mesh result e.g. .xmdf or .dat> [2dm] [frames]
+path_mesh = sys.argv[1] if len(sys.argv) > 1 else r"C:\TUFLOW\results\M01_5m_001.xmdf"
+path_2dm = sys.argv[2] if len(sys.argv) > 2 else '{0}.2dm'.format(os.path.splitext(path_mesh)[0])
+nFrames = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+img_size = (1280, 720)
+dpi = 96
+
+
+def labelProperties(position):
+	return {'label': 'Speed Test', 'font': QFont(), 'font colour': QColor(0, 0, 0), 'background': True,
+	        'background color': QColor(255, 255, 255), 'frame': False, 'frame color': QColor(0, 0, 0),
+	        'position': position}
+
+
+def loadMesh():
+	layer = QgsMeshLayer(path_2dm, 'speed_test', 'mdal')
+	if path_mesh != path_2dm:
+		layer.dataProvider().addDataset(path_mesh)
+	QgsProject.instance().addMapLayer(layer)
+
+	return layer
+
+
+def config(layer, tmpdir):
+	dp = layer.dataProvider()
+	scalar = 0
+	for i in range(dp.datasetGroupCount()):
+		if dp.datasetCount(i) > 2:
+			scalar = i
+			break
+	count = min(dp.datasetCount(scalar), nFrames)
+	tStart = dp.datasetMetadata(QgsMeshDatasetIndex(scalar, 0)).time()
+	tEnd = dp.datasetMetadata(QgsMeshDatasetIndex(scalar, count - 1)).time()
+
+	return {'layer': layer,
+	        'time': (tStart, tEnd),
+	        'img_size': img_size,
+	        'tmp_imgfile': os.path.join(tmpdir, '%03d.png'),
+	        'layers': [layer],
+	        'extent': layer.extent(),
+	        'layout': {'type': 'default', 'file': None, 'title': labelProperties(0), 'time': labelProperties(1),
+	                   'legend': labelProperties(3)},
+	        'scalar index': scalar,
+	        'vector index': -1,
+	        'active scalar': dp.datasetGroupMetadata(scalar).name(),
+	        'tmpdir': tmpdir}, count
+
+
+def rebuiltLayout(cfg, count):
+	"""Layout built from scratch for every frame - how animation frames were exported previously."""
+
+	l = cfg['layer']
+	w, h = cfg['img_size']
+	cfg['dpi'] = dpi
+	for i in range(count):
+		rs = l.rendererSettings()
+		rs.setActiveScalarDataset(QgsMeshDatasetIndex(cfg['scalar index'], i))
+		l.setRendererSettings(rs)
+		cfg['time text'] = '{0:.2f}'.format(l.dataProvider().datasetMetadata(QgsMeshDatasetIndex(cfg['scalar index'], i)).time())
+
+		layout = QgsPrintLayout(QgsProject.instance())
+		layout.initializeDefaults()
+		layout.renderContext().setDpi(dpi)
+		layout.setUnits(QgsUnitTypes.LayoutMillimeters)
+		layout.pageCollection().page(0).setPageSize(QgsLayoutSize(w * 25.4 / dpi, h * 25.4 / dpi, QgsUnitTypes.LayoutMillimeters))
+		prepare_composition(layout, 0, cfg, cfg['layout'], cfg['extent'], cfg['layers'], None, cfg['tmpdir'], None)
+
+		settings = QgsLayoutExporter.ImageExportSettings()
+		settings.dpi = dpi
+		settings.imageSize = QSize(w, h)
+		QgsLayoutExporter(layout).exportToImage(cfg['tmp_imgfile'] % (i + 1), settings)
+
+
+if __name__ == '__main__':
+	layer = loadMesh()
+	if not layer.isValid():
+		print('Could not load mesh: {0}'.format(path_2dm))
+		sys.exit(1)
+
+	tmpdir = tempfile.mkdtemp(prefix='tuflow')
+	cfg, count = config(layer, tmpdir)
+	print('Frames: {0} at {1}x{2}'.format(count, *img_size))
+
+	start = time.time()
+	rebuiltLayout(cfg, count)
+	tRebuilt = time.time() - start
+	print('Layout rebuilt every frame: {0:.2f} frames/s'.format(count / tRebuilt))
+
+	cfg['workers'] = 1
+	start = time.time()
+	animation(cfg, None)
+	tReused = time.time() - start
+	print('Layout re-used, one map at a time: {0:.2f} frames/s'.format(count / tReused))
+	print('Speed up: {0:.1f}x'.format(tRebuilt / tReused))
+
+	del cfg['workers']
+	start = time.time()
+	animation(cfg, None)
+	tParallel = time.time() - start
+	print('Maps rendered in parallel: {0:.2f} frames/s'.format(count / tParallel))
+	print('Speed up: {0:.1f}x'.format(tRebuilt / tParallel))
@@ -0,0 +1,45 @@
+import os
+import sys
+import time
+import tempfile
+import numpy
+from tuflow import TUFLOW_results_csv
+
+
+# size of the test csv - TUFLOW time series csv layout (Timestep, Time, then one column per element)
+target_size = 1024 ** 3  # bytes
+nLocs = 5000
+path_csv = os.path.join(tempfile.gettempdir(), "speed_test_1d_H.csv")
+
+
+def writeTestCsv(path, size, nLocs):
+	header = ['Timestep', 'Time'] + ['H ND_{0} [speed_test]'.format(x) for x in range(nLocs)]
+	with open(path, 'w') as fo:
+		fo.write(','.join(header) + '\n')
+		i = 0
+		while fo.tell() < size:
+			values = numpy.round(numpy.random.random((100, nLocs)) * 10, 3)
+			for row in values:
+				i += 1
+				fo.write('{0},{1:.4f},'.format(i, i / 60.) + ','.join(['{0:.3f}'.format(x) for x in row]) + '\n')
+
+
+if __name__ == '__main__':
+	if not os.path.exists(path_csv) or os.path.getsize(path_csv) < target_size:
+		print('Writing test csv: {0}'.format(path_csv))
+		writeTestCsv(path_csv, target_size, nLocs)
+	print('File size: {0:.0f} MB'.format(os.path.getsize(path_csv) / 1024 ** 2))
+
+	start = time.time()
+	header = TUFLOW_results_csv.readHeader(path_csv)
+	values, end = TUFLOW_results_csv.readValues(path_csv, len(header))
+	tFast = time.time() - start
+	print('TUFLOW_results_csv.readValues: {0:.1f} s'.format(tFast))
+
+	if '--skip-genfromtxt' not in sys.argv:
+		start = time.time()
+		valuesGen = numpy.genfromtxt(path_csv, delimiter=",", skip_header=1)
+		tGen = time.time() - start
+		print('numpy.genfromtxt: {0:.1f} s'.format(tGen))
+		print('Speed up: {0:.1f}x'.format(tGen / tFast))
+		print('Values match: {0}'.format(numpy.array_equal(values, valuesGen, equal_nan=True)))
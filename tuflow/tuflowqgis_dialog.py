@@ -47,6 +47,7 @@ except:
 	import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
 from tuflow.tuflowqgis_library import interpolate, convertStrftimToTuviewftim, convertTuviewftimToStrftim, browse
+from tuflow.tuflowqgis_tuviewer.tuflowqgis_turesultsindex import TuResultTimesteps
 sys.path.append(os.path.dirname(os.path.abspath(__file__)) + "/forms")
 currentFolder = os.path.dirname(os.path.abspath(__file__))
 
@@ -2558,6 +2559,9 @@ class TuOptionsDialog(QDialog, Ui_TuViewOptions):
 		
 		# x axis label rotation
 		self.sbXAxisLabelRotation.setValue(self.tuOptions.xAxisLabelRotation)
+		
+		# compact 1D time series storage
+		self.cbCompact1D.setChecked(self.tuOptions.compact1D)
 			
 		# play time delay
 		self.sbPlaySpeed.setValue(self.tuOptions.playDelay)
@@ -2646,6 +2650,10 @@ class TuOptionsDialog(QDialog, Ui_TuViewOptions):
 		# x axis label rotation
 		self.tuOptions.xAxisLabelRotation = self.sbXAxisLabelRotation.value()
 		
+		# compact 1D time series storage
+		self.tuOptions.compact1D = self.cbCompact1D.isChecked()
+		settings.setValue('TUFLOW/tuview_compact1D', self.tuOptions.compact1D)
+		
 		# play time delay
 		self.tuOptions.playDelay = self.sbPlaySpeed.value()
 		
@@ -2793,7 +2801,7 @@ class TuBatchPlotExportDialog(QDialog, Ui_BatchPlotExport):
 				for mesh in self.mcbResultMesh.checkedItems():
 					r = self.tuView.tuResults.results[mesh]
 					for rtype, t in r.items():
-						if type(t) is dict:  # map outputs results stored in dict, time series results stored as tuple
+						if isinstance(t, (dict, TuResultTimesteps)):  # map outputs results stored in dict, time series results stored as tuple
 							for time, items in t.items():
 								if time == '-99999':
 									maximum = True
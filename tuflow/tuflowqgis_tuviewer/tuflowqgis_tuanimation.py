@@ -18,6 +18,7 @@ from ui_animation_dialog import Ui_AnimationDialog
 from animation_plot_properties import Ui_PlotProperties
 from label_properties import Ui_textPropertiesDialog
 from image_properties import Ui_ImageProperties
+from tuflow.tuflowqgis_tuviewer.tuflowqgis_tuframerenderer import TuFrameRenderer
 from tuflow.tuflowqgis_library import tuflowqgis_find_layer, applyMatplotLibArtist, convertTimeToFormattedTime, convertFormattedTimeToTime
 import matplotlib
 import numpy as np
@@ -35,6 +36,7 @@ from matplotlib.patches import Patch
 from matplotlib.patches import Polygon
 import matplotlib.dates as mdates
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 
 
 # http://stackoverflow.com/questions/377017/test-if-executable-exists-in-python
@@ -244,10 +246,14 @@ def addLineToPlot(fig, ax, line, label):
 	if type(line) is matplotlib.lines.Line2D:
 		a, = ax.plot(line.get_data()[0], line.get_data()[1], label=label)
 		applyMatplotLibArtist(a, line)
+		return a
 	elif type(line) is matplotlib.patches.Polygon:
 		xy = line.get_xy()
 		poly = Polygon(xy, facecolor='0.9', edgecolor='0.5', label=label)
 		ax.add_patch(poly)
+		return poly
+	
+	return None
 
 
 def isSecondaryNeeded(neededLabels, allLabels, allAxis):
@@ -337,6 +343,201 @@ def transformMapCoordToLayout(layout, extent, point, margin):
 	return QPointF(layoutX + margin[0], layoutY + margin[2])
 	
 			
+class TuPlotInset():
+	"""
+	Plot inset for animations. The figure is built once and kept between frames. Each frame only the artists that
+	have changed (e.g. the current time line) are drawn over a saved copy of the rest of the figure (blitting) and the
+	figure is handed to the layout picture as a raster rather than saving and re-reading an svg.
+	
+	Lines that change are only blitted if the axis limits are set in the plot properties - otherwise the limits may
+	change as well and the figure has to be built again (see update).
+	"""
+	
+	def __init__(self, properties, layout_type, layout_item, isdatetime, dateformat, dpi):
+		self.properties = properties
+		self.layout_type = layout_type
+		self.layout_item = layout_item
+		self.isdatetime = isdatetime
+		self.dateformat = dateformat
+		self.dpi = dpi
+		self.fig = None
+		self.canvas = None
+		self.key = None  # plotted labels and axis - figure is built again if these change
+		self.artists = {}  # index of source line: artist in inset
+		self.data = {}  # index of source line: data when last drawn
+		self.background = None  # figure without animated artists
+		self.frame = 0
+	
+	@staticmethod
+	def artistData(artist):
+		if isinstance(artist, matplotlib.lines.Line2D):
+			return artist.get_xdata(), artist.get_ydata()
+		elif isinstance(artist, matplotlib.patches.Polygon):
+			return artist.get_xy(),
+		
+		return ()
+	
+	@staticmethod
+	def isSameData(data1, data2):
+		if len(data1) != len(data2):
+			return False
+		for a, b in zip(data1, data2):
+			a, b = np.asarray(a), np.asarray(b)
+			if a.shape != b.shape:
+				return False
+			if a.dtype.kind == 'f' and b.dtype.kind == 'f':
+				if not ((a == b) | (np.isnan(a) & np.isnan(b))).all():
+					return False
+			elif not (a == b).all():
+				return False
+		
+		return True
+	
+	def isFixedLimits(self):
+		"""
+		:return: bool -> True if axis limits don't depend on the data
+		"""
+		
+		return not self.properties.xUseMatplotLibDefault and not self.properties.yUseMatplotLibDefault
+	
+	def build(self, lines, labs, axis, labels):
+		"""
+		Build figure.
+		
+		:param lines: list -> matplotlib artists from TuView plot
+		:param labs: list -> str
+		:param axis: list -> str 'axis 1' or 'axis 2'
+		:param labels: list -> str labels to plot
+		:return: void
+		"""
+		
+		self.fig = Figure()
+		self.canvas = FigureCanvasAgg(self.fig)
+		ax = self.fig.add_subplot(111)
+		ax2 = None
+		y2 = isSecondaryNeeded(labels, labs, axis)
+		if y2:
+			ax2 = ax.twinx()
+		setPlotProperties(self.fig, ax, self.properties, ax2, self.layout_type, self.layout_item, self.isdatetime,
+		                  self.dateformat)
+		self.fig.set_dpi(self.dpi)
+		self.key = (tuple(labs), tuple(axis), tuple(labels))
+		self.artists.clear()
+		self.data.clear()
+		for i, line in enumerate(lines):
+			if labs[i] in labels or labs[i] == 'Current Time':
+				if y2 and axis[i] == 'axis 2':
+					artist = addLineToPlot(self.fig, ax2, line, labs[i])
+				else:
+					artist = addLineToPlot(self.fig, ax, line, labs[i])
+				if artist is not None:
+					artist.set_animated(labs[i] == 'Current Time')
+					self.artists[i] = artist
+					self.data[i] = self.artistData(line)
+		if self.properties.cbLegend.isChecked():
+			legend(ax, self.properties.cboLegendPos.currentIndex())
+		self.fig.tight_layout()
+		self.drawBackground()
+	
+	def drawBackground(self):
+		"""
+		Draw figure without the animated artists and keep a copy.
+		
+		:return: void
+		"""
+		
+		self.canvas.draw()
+		self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+	
+	def update(self, lines, labs, axis, labels, layout_item):
+		"""
+		Update figure for the current frame.
+		
+		:param lines: list -> matplotlib artists from TuView plot
+		:param labs: list -> str
+		:param axis: list -> str
+		:param labels: list -> str
+		:param layout_item: QgsLayoutItemPicture
+		:return: bool -> False if figure needs to be built again
+		"""
+		
+		if self.fig is None or layout_item is not self.layout_item:
+			return False
+		if (tuple(labs), tuple(axis), tuple(labels)) != self.key:
+			return False
+		
+		redraw = False
+		for i, artist in self.artists.items():
+			line = lines[i]
+			data = self.artistData(line)
+			if labs[i] == 'Current Time':
+				# y data of the current time line is set to the axis limits (see addLineToPlot)
+				if self.isSameData(data[:1], self.data[i][:1]):
+					continue
+				artist.set_xdata(line.get_xdata())
+				artist.set_ydata(artist.axes.get_ylim())
+			else:
+				if self.isSameData(data, self.data[i]):
+					continue
+				if not self.isFixedLimits():
+					return False
+				if isinstance(artist, matplotlib.lines.Line2D):
+					artist.set_data(*data)
+				else:
+					artist.set_xy(data[0])
+				if not artist.get_animated():
+					artist.set_animated(True)
+					redraw = True
+			self.data[i] = data
+		
+		if redraw:
+			self.drawBackground()
+		
+		return True
+	
+	def render(self):
+		"""
+		Draw animated artists over background.
+		
+		:return: QImage
+		"""
+		
+		self.canvas.restore_region(self.background)
+		for artist in self.artists.values():
+			if artist.get_animated():
+				artist.axes.draw_artist(artist)
+		w, h = self.canvas.get_width_height()
+		buffer = bytes(self.canvas.buffer_rgba())
+		image = QImage(buffer, w, h, QImage.Format_RGBA8888)
+		
+		return image.copy()  # copy so image doesn't reference buffer
+	
+	def picturePath(self, dir, name):
+		"""
+		Render frame and return path for layout picture. Image is embedded in the path (base64) where QGIS supports it
+		otherwise it is written to a png in dir.
+		
+		:param dir: str
+		:param name: str
+		:return: str
+		"""
+		
+		image = self.render()
+		if Qgis.QGIS_VERSION_INT >= 31600:
+			ba = QByteArray()
+			buffer = QBuffer(ba)
+			buffer.open(QIODevice.WriteOnly)
+			image.save(buffer, 'PNG')
+			buffer.close()
+			return 'base64:{0}'.format(bytes(ba.toBase64()).decode('ascii'))
+		
+		self.frame += 1
+		fname = os.path.join('{0}'.format(dir), '{0}-{1}.png'.format(name, self.frame))
+		image.save(fname)
+		
+		return fname
+
+
 def composition_set_plots(dialog, cfg, time, layout, dir, layout_type, showCurrentTime, retainFlow):
 
 	layoutcfg = cfg['layout']
@@ -344,12 +545,9 @@ def composition_set_plots(dialog, cfg, time, layout, dir, layout_type, showCurre
 	margin = cfg['page margin'] if 'page margin' in cfg else None
 
 	# update tuplot with new time and if time series, show current time - but don't draw
-	rendered = cfg['rendered'] if 'rendered' in cfg else True
 	dialog.tuView.tuPlot.updateCurrentPlot(0, retain_flow=retainFlow, draw=False, time=time,
-	                                       show_current_time=showCurrentTime, mesh_rendered=rendered,
-	                                       plot_active_scalar=cfg['active scalar'])
-	dialog.tuView.tuPlot.updateCurrentPlot(1, draw=False, time=time, mesh_rendered=rendered,
-	                                       plot_active_scalar=cfg['active scalar'])
+	                                       show_current_time=showCurrentTime, plot_active_scalar=cfg['active scalar'])
+	dialog.tuView.tuPlot.updateCurrentPlot(1, draw=False, time=time, plot_active_scalar=cfg['active scalar'])
 	
 	# split out lines into specified plots
 	for plot in sorted(layoutcfg['plots']):
@@ -388,34 +586,44 @@ def composition_set_plots(dialog, cfg, time, layout, dir, layout_type, showCurre
 					labels.pop(i)
 
 		if layout_type == 'default':
-			cPlot = QgsLayoutItemPicture(layout)
-			cPlot.setId('plot_{0}'.format(plot))
-			layout.addItem(cPlot)
+			cPlot = findLayoutItem(layout, 'plot_{0}'.format(plot))  # re-use plot from previous frame
+			if cPlot is None:
+				cPlot = QgsLayoutItemPicture(layout)
+				cPlot.setId('plot_{0}'.format(plot))
+				layout.addItem(cPlot)
 			cPlot.attemptResize(QgsLayoutSize(properties.sbFigSizeX.value(), properties.sbFigSizeY.value()))
 		elif layout_type == 'template':
 			cPlot = findLayoutItem(layout, 'plot_{0}'.format(plot))
 		else:
 			return
 		
-		fig, ax = plt.subplots()
-		ax2 = None
 		lines, labs, axis = dialog.plotItems(ptype, include_duplicates=True)
-		y2 = isSecondaryNeeded(labels, labs, axis)
-		if y2:
-			ax2 = ax.twinx()
-		setPlotProperties(fig, ax, properties, ax2, layout_type, cPlot, isdatetime, dateformat)
-		for i, line in enumerate(lines):
-			if labs[i] in labels or labs[i] == 'Current Time':
-				if y2 and axis[i] == 'axis 2':
-					addLineToPlot(fig, ax2, line, labs[i])
-				else:
-					addLineToPlot(fig, ax, line, labs[i])
-		if properties.cbLegend.isChecked():
-			legend(ax, properties.cboLegendPos.currentIndex())
-		fig.tight_layout()
-		datetimestr = '{0}'.format(datetime.now()).replace(':', '-')
-		fname = os.path.join('{0}'.format(cfg['tmpdir']), '{0}-{1}-{2}-{3}.svg'.format(l.name(), plot, time, datetimestr))
-		fig.savefig(fname)
+		if 'plot insets' in cfg:  # animation - figure kept between frames and rendered to raster
+			inset = cfg['plot insets'][plot] if plot in cfg['plot insets'] else None
+			if inset is None or not inset.update(lines, labs, axis, labels, cPlot):
+				inset = TuPlotInset(properties, layout_type, cPlot, isdatetime, dateformat, cfg['dpi'])
+				inset.build(lines, labs, axis, labels)
+				cfg['plot insets'][plot] = inset
+			fname = inset.picturePath(cfg['tmpdir'], '{0}-{1}-{2}'.format(l.name(), plot, time))
+		else:
+			fig, ax = plt.subplots()
+			ax2 = None
+			y2 = isSecondaryNeeded(labels, labs, axis)
+			if y2:
+				ax2 = ax.twinx()
+			setPlotProperties(fig, ax, properties, ax2, layout_type, cPlot, isdatetime, dateformat)
+			for i, line in enumerate(lines):
+				if labs[i] in labels or labs[i] == 'Current Time':
+					if y2 and axis[i] == 'axis 2':
+						addLineToPlot(fig, ax2, line, labs[i])
+					else:
+						addLineToPlot(fig, ax, line, labs[i])
+			if properties.cbLegend.isChecked():
+				legend(ax, properties.cboLegendPos.currentIndex())
+			fig.tight_layout()
+			datetimestr = '{0}'.format(datetime.now()).replace(':', '-')
+			fname = os.path.join('{0}'.format(cfg['tmpdir']), '{0}-{1}-{2}-{3}.svg'.format(l.name(), plot, time, datetimestr))
+			fig.savefig(fname)
 		layoutcfg['plots'][plot]['source'] = fname
 		
 		if cPlot:
@@ -611,6 +819,93 @@ def _page_size(layout, margin):
 	return QgsLayoutSize(width, height)
 
 
+def update_composition(layout, cfg, time, dialog, dir, layout_type, showCurrentTime, retainFlow):
+	"""
+	Updates the time dependent items (time label and plots) of a layout already prepared by prepare_composition
+	or prepare_composition_from_template. Lets the same layout be exported for each animation frame rather than
+	building (or reading from template) a new layout every frame.
+	
+	:param layout: QgsPrintLayout
+	:param cfg: dict
+	:param time: float
+	:param dialog: TuAnimationDialog
+	:param dir: str
+	:param layout_type: str 'default' or 'template'
+	:param showCurrentTime: bool
+	:param retainFlow: bool
+	:return: void
+	"""
+	
+	layoutcfg = cfg['layout']
+	margin = cfg['page margin'] if 'page margin' in cfg else None
+	
+	if layout_type == 'template':
+		composition_set_time(layout, cfg['time text'])
+	elif 'time' in layoutcfg:
+		composition_set_time(layout, cfg['time text'])
+		cTime = findLayoutLabel(layout, 'time')
+		if cTime is not None:
+			cTime.adjustSizeToText()
+			set_item_pos(cTime, layoutcfg['time']['position'], layout, margin)
+	
+	if 'plots' in layoutcfg:
+		composition_set_plots(dialog, cfg, time, layout, dir, layout_type, showCurrentTime, retainFlow)
+
+
+def animation_time_text(time, dialog):
+	"""
+	Time label text for animation frame.
+	
+	:param time: float
+	:param dialog: TuAnimationDialog or None
+	:return: str
+	"""
+	
+	unit = dialog.tuView.tuOptions.timeUnits if dialog is not None else 'h'
+	timetext = convertTimeToFormattedTime(time, unit=unit)
+	if dialog is not None:
+		if dialog.tuView.tuOptions.xAxisDates:
+			if time in dialog.tuView.tuResults.time2date:
+				timetext = dialog.tuView.tuResults.time2date[time]
+				timetext = dialog.tuView.tuResults._dateFormat.format(timetext)
+	
+	return timetext
+
+
+def animation_set_datasets(cfg, i):
+	"""
+	Set mesh layer to render timestep.
+	
+	:param cfg: dict
+	:param i: int dataset index
+	:return: void
+	"""
+	
+	l = cfg['layer']
+	rs = l.rendererSettings()
+	asd = cfg['scalar index']
+	rs.setActiveScalarDataset(QgsMeshDatasetIndex(asd, i))
+	avd = cfg['vector index']
+	rs.setActiveVectorDataset(QgsMeshDatasetIndex(avd, i))
+	l.setRendererSettings(rs)
+
+
+def animation_save_frame(cfg, n, image):
+	"""
+	Write frame to video stream if streaming otherwise save to numbered image file.
+	
+	:param cfg: dict
+	:param n: int frame number starting at 1
+	:param image: QImage
+	:return: void
+	"""
+	
+	if 'video stream' in cfg:
+		cfg['video stream'].write(image)
+	elif not image.save(os.path.abspath(cfg['tmp_imgfile'] % n)):
+		raise RuntimeError()
+
+
 def animation(cfg, iface, progress_fn=None, dialog=None, preview=False):
 	margin = cfg['page margin'] if 'page margin' in cfg else (0, 0, 0, 0)
 	dpi = 96
@@ -628,72 +923,81 @@ def animation(cfg, iface, progress_fn=None, dialog=None, preview=False):
 
 	time_from, time_to = cfg['time']
 
+	# frames to export - dataset index and time
+	frames = []
+	for i in range(count):
+		time = l.dataProvider().datasetMetadata(QgsMeshDatasetIndex(dataset_group_index, i)).time()
+		if time < time_from or time > time_to:
+			continue
+		frames.append((i, time))
+	if not frames:
+		return None
+
 	# store original values
 	original_rs = l.rendererSettings()
 
+	# plot figures kept between frames - see TuPlotInset
+	cfg['plot insets'] = {}
+
+	# Prepare layout - built once on the first frame and only the time dependent items are updated after that
+	i, time = frames[0]
+	cfg['time text'] = animation_time_text(time, dialog)
+	animation_set_datasets(cfg, i)
+
+	layout = QgsPrintLayout(QgsProject.instance())
+	layout.initializeDefaults()
+	layout.setName('tuflow')
+
+	layoutcfg = cfg['layout']
+	if layoutcfg['type'] == 'file':
+		layout_type = 'template'
+		prepare_composition_from_template(layout, cfg, time, dialog, os.path.dirname(imgfile), True, True)
+		# when using composition from template, match video's aspect ratio to paper size
+		# by updating video's width (keeping the height)
+		aspect = _page_size(layout, margin).width() / _page_size(layout, margin).height()
+		w = int(round(aspect * h))
+	else:  # type == 'default'
+		layout_type = 'default'
+		layout.renderContext().setDpi(dpi)
+		layout.setUnits(QgsUnitTypes.LayoutMillimeters)
+		main_page = layout.pageCollection().page(0)
+		main_page.setPageSize(QgsLayoutSize(w * 25.4 / dpi, h * 25.4 / dpi, QgsUnitTypes.LayoutMillimeters))
+		prepare_composition(layout, time, cfg, layoutcfg, extent, layers, crs, os.path.dirname(imgfile), dialog)
+
+	if preview:
+		return layout
+
+	def update_frame(frame):
+		cfg['time text'] = animation_time_text(frame[1], dialog)
+		update_composition(layout, cfg, frame[1], dialog, os.path.dirname(imgfile), layout_type, True, True)
+
 	# animate
-	imgnum = 0
-	for i in range(count):
+	try:
+		if TuFrameRenderer.isSupported(layout):
+			# maps for several frames rendered in parallel - static layers under the result are only rendered once
+			kwargs = {'workers': cfg['workers']} if 'workers' in cfg else {}
+			renderer = TuFrameRenderer(layout, dpi, QSize(w, h), dynamic_layers=[l], **kwargs)
+			renderer.render(frames, lambda x: animation_set_datasets(cfg, x[0]), update_frame,
+			                lambda n, image: animation_save_frame(cfg, n, image), progress_fn)
+		else:
+			layout_exporter = QgsLayoutExporter(layout)
+			for n, frame in enumerate(frames):
 
-		if progress_fn:
-			progress_fn(i, count)
+				if progress_fn:
+					progress_fn(n, len(frames))
 
-		time = l.dataProvider().datasetMetadata(QgsMeshDatasetIndex(dataset_group_index, i)).time()
-		if time < time_from or time > time_to:
-			continue
-		timetext = convertTimeToFormattedTime(time, unit=dialog.tuView.tuOptions.timeUnits)
-		if dialog is not None:
-			if dialog.tuView.tuOptions.xAxisDates:
-				if time in dialog.tuView.tuResults.time2date:
-					timetext = dialog.tuView.tuResults.time2date[time]
-					timetext = dialog.tuView.tuResults._dateFormat.format(timetext)
-		cfg['time text'] = timetext
-
-		# Set to render next timesteps
-		rs = l.rendererSettings()
-		asd = cfg['scalar index']
-		rs.setActiveScalarDataset(QgsMeshDatasetIndex(asd, i))
-		avd = cfg['vector index']
-		rs.setActiveVectorDataset(QgsMeshDatasetIndex(avd, i))
-		l.setRendererSettings(rs)
-
-		# Prepare layout
-		layout = QgsPrintLayout(QgsProject.instance())
-		layout.initializeDefaults()
-		layout.setName('tuflow')
-
-		layoutcfg = cfg['layout']
-		if layoutcfg['type'] == 'file':
-			prepare_composition_from_template(layout, cfg, time, dialog, os.path.dirname(imgfile), True, True)
-			# when using composition from template, match video's aspect ratio to paper size
-			# by updating video's width (keeping the height)
-			aspect = _page_size(layout, margin).width() / _page_size(layout, margin).height()
-			w = int(round(aspect * h))
-		else:  # type == 'default'
-			layout.renderContext().setDpi(dpi)
-			layout.setUnits(QgsUnitTypes.LayoutMillimeters)
-			main_page = layout.pageCollection().page(0)
-			main_page.setPageSize(QgsLayoutSize(w * 25.4 / dpi, h * 25.4 / dpi, QgsUnitTypes.LayoutMillimeters))
-			prepare_composition(layout, time, cfg, layoutcfg, extent, layers, crs, os.path.dirname(imgfile), dialog)
-
-		imgnum += 1
-		fname = imgfile % imgnum
-		layout_exporter = QgsLayoutExporter(layout)
-		image_export_settings = QgsLayoutExporter.ImageExportSettings()
-		image_export_settings.dpi = dpi
-		image_export_settings.imageSize = QSize(w, h)
-		res = layout_exporter.exportToImage(os.path.abspath(fname), image_export_settings)
-		if res != QgsLayoutExporter.Success:
-			raise RuntimeError()
-		
-		if preview:
-			return layout
+				if n > 0:
+					animation_set_datasets(cfg, frame[0])
+					update_frame(frame)
 
-	if progress_fn:
-		progress_fn(count, count)
+				image = layout_exporter.renderPageToImage(0, QSize(w, h), dpi)
+				animation_save_frame(cfg, n + 1, image)
 
-	# restore original settings
-	l.setRendererSettings(original_rs)
+		if progress_fn:
+			progress_fn(len(frames), len(frames))
+	finally:
+		# restore original settings
+		l.setRendererSettings(original_rs)
 
 
 def set_composer_item_label(item, itemcfg):
@@ -1051,13 +1355,96 @@ def prepare_composition(layout, time, cfg, layoutcfg, extent, layers, crs, dir,
 		set_item_pos(cNorthArrow, itemcfg['position'], layout, margin, buffer=2)
 		
 
-def images_to_video(tmp_img_dir="/tmp/vid/%03d.png", output_file="/tmp/vid/test.avi", fps=10, qual=1,
-					ffmpeg_bin="ffmpeg"):
+def video_options(qual):
 	if qual == 0:  # lossless
-		opts = ["-vcodec", "ffv1"]
+		return ["-vcodec", "ffv1"]
 	else:
 		bitrate = 10000 if qual == 1 else 2000
-		opts = ["-vcodec", "mpeg4", "-b", str(bitrate) + "K"]
+		return ["-vcodec", "mpeg4", "-b", str(bitrate) + "K"]
+
+
+class TuVideoStream():
+	"""
+	Encodes frames straight to video by piping raw RGBA pixels to ffmpeg's stdin. Saves writing every frame to a
+	temporary image file that ffmpeg then has to read and decode again (see images_to_video).
+	
+	ffmpeg is started when the first frame is written as the frame size isn't known until then.
+	"""
+	
+	def __init__(self, output_file="/tmp/vid/test.avi", fps=10, qual=1, ffmpeg_bin="ffmpeg"):
+		self.output_file = output_file
+		self.fps = fps
+		self.qual = qual
+		self.ffmpeg_bin = ffmpeg_bin
+		self.size = None  # QSize of frames
+		self.process = None  # subprocess.Popen
+		self.log = None  # log file
+		self.frames = 0  # number of frames written
+	
+	def open(self, size):
+		"""
+		Start ffmpeg.
+		
+		:param size: QSize frame size in pixels
+		:return: void
+		"""
+		
+		self.size = size
+		cmd = [self.ffmpeg_bin, "-f", "rawvideo", "-pix_fmt", "rgba",
+		       "-s", "{0}x{1}".format(size.width(), size.height()), "-framerate", str(self.fps), "-i", "-"]
+		cmd += video_options(self.qual)
+		cmd += ["-r", str(self.fps), "-f", "avi", "-y", self.output_file]
+		
+		self.log = tempfile.NamedTemporaryFile(prefix="tuflow", suffix=".txt", delete=False)
+		self.log.write(str.encode(" ".join(cmd) + "\n\n"))
+		self.log.flush()
+		self.process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=self.log, stderr=self.log)
+	
+	def write(self, image):
+		"""
+		Write frame. Raises OSError if ffmpeg can't be started or has stopped.
+		
+		:param image: QImage
+		:return: void
+		"""
+		
+		if self.process is None:
+			self.open(image.size())
+		if image.size() != self.size:
+			image = image.scaled(self.size)
+		image = image.convertToFormat(QImage.Format_RGBA8888)
+		bits = image.constBits()
+		bits.setsize(image.byteCount())
+		self.process.stdin.write(bits.asstring())
+		self.frames += 1
+	
+	def close(self):
+		"""
+		Finish encoding.
+		
+		:return: bool -> True if video was written successfully
+		         str -> log file
+		"""
+		
+		if self.process is None:
+			return False, None
+		
+		try:
+			self.process.stdin.close()
+		except OSError:
+			pass  # ffmpeg already stopped
+		res = self.process.wait()
+		self.process = None
+		self.log.close()
+		if res == 0:
+			os.remove(self.log.name)  # only keep the log on error
+		
+		return res == 0, self.log.name
+
+
+def images_to_video(tmp_img_dir="/tmp/vid/%03d.png", output_file="/tmp/vid/test.avi", fps=10, qual=1,
+					ffmpeg_bin="ffmpeg"):
+	opts = video_options(qual)
 
 	# if images do not start with 1: -start_number 14
 	cmd = [ffmpeg_bin, "-f", "image2", "-framerate", str(fps), "-i", tmp_img_dir]
@@ -2539,16 +2926,32 @@ class TuAnimationDialog(QDialog, Ui_AnimationDialog):
 		for pb, dialog in self.pbDialogs.items():
 			dialog.setDefaults(self, self.dialog2Plot[dialog][0].text(), self.dialog2Plot[dialog][1].text().split(';;'),
 			                   xAxisDates=self.tuView.tuOptions.xAxisDates)
-		self.layout = animation(d, self.iface, prog, self, preview)
+		if preview:
+			self.layout = animation(d, self.iface, prog, self, preview)
+		else:
+			# stream frames straight to ffmpeg - fall back to writing images and converting only if ffmpeg
+			# can't be started or stops on the first frame. If encoding fails later on, converting images with
+			# the same options would most likely fail again so the stream's log is reported instead.
+			stream = TuVideoStream(output_file, fps, self.quality(), self.ffmpeg_bin)
+			d['video stream'] = stream
+			streamed = True
+			try:
+				self.layout = animation(d, self.iface, prog, self, preview)
+				ffmpeg_res, logfile = stream.close()
+			except OSError:
+				ffmpeg_res, logfile = stream.close()
+				streamed = stream.frames > 0
+			if not streamed:
+				del d['video stream']
+				self.layout = animation(d, self.iface, prog, self, preview)
+				ffmpeg_res, logfile = images_to_video(img_output_tpl, output_file, fps, self.quality(), self.ffmpeg_bin)
 		self.tuView.tuPlot.updateCurrentPlot(0, retain_flow=True)
 		self.tuView.tuPlot.updateCurrentPlot(1)
 		
 		if preview:
 			self.iface.openLayoutDesigner(layout=self.layout)
 		else:
-			ffmpeg_res, logfile = images_to_video(img_output_tpl, output_file, fps, self.quality(), self.ffmpeg_bin)
-			
-			if ffmpeg_res:
+			if ffmpeg_res or streamed:  # no images to keep when frames were streamed
 				shutil.rmtree(tmpdir)
 			
 			QApplication.restoreOverrideCursor()
@@ -2559,6 +2962,11 @@ class TuAnimationDialog(QDialog, Ui_AnimationDialog):
 			
 			if ffmpeg_res:
 				QMessageBox.information(self, "Export", "The export of animation was successful!")
+			elif streamed:
+				QMessageBox.warning(self, "Export",
+				                    "An error occurred when encoding the video.\n\n"
+				                    "This should not happen. Please email support@tuflow.com "
+				                    "with the contents from the log file:\n" + str(logfile))
 			else:
 				QMessageBox.warning(self, "Export",
 				                    "An error occurred when converting images to video. "
@@ -0,0 +1,283 @@
+import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtWidgets import QProgressBar, QPushButton
+from qgis.core import QgsApplication, QgsPointXY, QgsWkbTypes
+from tuflow.tuflowqgis_tuviewer.tuflowqgis_turesultsindex import TuResultsIndex, TuResultTimesteps
+from tuflow.tuflowqgis_tuviewer.tuflowqgis_tuextraction import TuExtractionCancelled
+from tuflow.tuflowqgis_library import lineToPoints
+
+
+class TuBatchPlotExport():
+	"""
+	Batch export of time series (point features) or cross sections (line features) to CSV or image.
+	
+	Rather than plotting feature by feature, the points for all features are located in one vectorised pass
+	(see TuMeshSampler) and each timestep dataset is read once for all features. CSV files are then written
+	from a pool of worker threads. Images go through the plot (matplotlib) so they are drawn on the main thread.
+	
+	Features are processed in batches (see batchSize) so memory stays bounded for large layers.
+	"""
+	
+	def __init__(self, TuView):
+		self.tuView = TuView
+		self.iface = TuView.iface
+		self.tuResults = TuView.tuResults
+		self.tuPlot = TuView.tuPlot
+		self.tuPlot2D = TuView.tuPlot.tuPlot2D
+		self.batchSize = 1000  # features extracted together
+		self.chunkSize = 50  # timesteps read between progress updates
+		self.workers = min(8, os.cpu_count() or 1)  # threads writing csv
+		self.cancelled = False
+		self.progress = None  # QProgressBar
+		self.steps = 1
+		self.stepsComplete = 0
+	
+	def isCanceled(self):
+		"""
+		Same as QgsTask.isCanceled so export can be passed as a task to TuPlot2D.timeSeriesValues.
+		
+		:return: bool
+		"""
+		
+		QgsApplication.processEvents()  # let cancel button respond
+		return self.cancelled
+	
+	def cancel(self):
+		"""
+		Cancel the export.
+		
+		:return: void
+		"""
+		
+		self.cancelled = True
+	
+	def export(self, vLayer, features, mLayers, resultTypes, format, outputFolder, nameIndex, imageFormat, **kwargs):
+		"""
+		Export time series or cross sections for features.
+		
+		:param vLayer: QgsVectorLayer
+		:param features: list -> QgsFeature
+		:param mLayers: list -> QgsMeshLayer
+		:param resultTypes: list -> str result type e.g. 'depth'
+		:param format: str 'csv' or 'image'
+		:param outputFolder: str output folder
+		:param nameIndex: int attribute index used for naming files or None
+		:param imageFormat: str extension e.g. '.png'
+		:param kwargs: str time -> time key for cross sections e.g. '1.000000' or 'Maximum'
+		               str time_formatted -> time as displayed e.g. '01:00:00'
+		:return: bool -> True for successful, False for unsuccessful or cancelled
+		"""
+		
+		self.cancelled = False
+		if vLayer.geometryType() == QgsWkbTypes.PointGeometry:
+			plotNo = 0
+		elif vLayer.geometryType() == QgsWkbTypes.LineGeometry:
+			plotNo = 1
+		else:
+			return False
+		
+		names = []
+		for f in features:
+			if nameIndex is not None:
+				names.append('{0}'.format(f.attributes()[nameIndex]))
+			elif plotNo == 0:
+				names.append('Time_Series_{0}'.format(f.id()))
+			else:
+				names.append('Cross_Section_{0}'.format(f.id()))
+		
+		self.initProgress(format, len(features))
+		reserved = set()  # output files already taken by this export
+		try:
+			with ThreadPoolExecutor(max_workers=self.workers) as pool:
+				jobs = []
+				for i in range(0, len(features), self.batchSize):
+					batch = features[i:i+self.batchSize]
+					if plotNo == 0:
+						outputs = self.timeSeries(batch, mLayers, resultTypes)
+					else:
+						outputs = self.crossSections(batch, mLayers, resultTypes, **kwargs)
+					for j, (data, labels, types) in enumerate(outputs):
+						if self.isCanceled():
+							raise TuExtractionCancelled()
+						name = names[i+j]
+						if not data:
+							self.updateProgress()
+							continue
+						if format == 'csv':
+							outFile = self.uniqueFile(outputFolder, name, '.csv', reserved)
+							header = self.tuPlot.getCSVHeader(plotNo, data, labels, types)
+							jobs.append(pool.submit(self.tuPlot.writeCSV, outFile, header, data))
+						else:
+							outFile = self.uniqueFile(outputFolder, name, imageFormat, reserved)
+							self.tuPlot.drawPlot(plotNo, data, labels, types, export=outFile)
+						self.updateProgress()
+				for job in jobs:
+					job.result()  # raise any errors from writing
+		except TuExtractionCancelled:
+			return False
+		finally:
+			self.iface.messageBar().clearWidgets()
+		
+		return True
+	
+	def timeSeries(self, features, mLayers, resultTypes):
+		"""
+		Extract time series for a batch of point features.
+		
+		:param features: list -> QgsFeature
+		:param mLayers: list -> QgsMeshLayer
+		:param resultTypes: list -> str
+		:return: list -> tuple (data, labels, types) for each feature
+		"""
+		
+		points = [QgsPointXY(f.geometry().asPoint()) for f in features]
+		outputs = [([], [], []) for f in features]
+		for layer in mLayers:
+			for rtype in resultTypes:
+				r = self.tuResults.getResult(TuResultsIndex(layer.name(), rtype, None, False))
+				if not r:
+					continue
+				x = []
+				for item in r.values():
+					if self.tuView.tuOptions.timeUnits == 's':
+						x.append(item[0] / 3600)
+					else:
+						x.append(item[0])
+				values = self.readValues(layer, [item[-1] for item in r.values()], points)
+				label = '{0}'.format(rtype) if len(mLayers) == 1 else '{1}: {0}'.format(rtype, layer.name())
+				for j, (data, labels, types) in enumerate(outputs):
+					y = values[:,j].tolist()
+					# seems to error when x axis is dates and y axis all nan
+					if self.tuView.tuOptions.xAxisDates and np.isnan(values[:,j]).all():
+						y[0] = 0
+					data.append((x, y))
+					labels.append(label)
+					types.append(rtype)
+		
+		return outputs
+	
+	def crossSections(self, features, mLayers, resultTypes, **kwargs):
+		"""
+		Extract cross sections for a batch of line features.
+		
+		:param features: list -> QgsFeature
+		:param mLayers: list -> QgsMeshLayer
+		:param resultTypes: list -> str
+		:param kwargs: str time -> time key; str time_formatted
+		:return: list -> tuple (data, labels, types) for each feature
+		"""
+		
+		timestep = kwargs['time'] if 'time' in kwargs and kwargs['time'] else self.tuResults.activeTime
+		timestepFormatted = kwargs['time_formatted'] if 'time_formatted' in kwargs else ''
+		
+		# sample all lines together - not using TuPlot2D.getLinePoints so plotted lines stay cached
+		resolution = self.tuView.tuOptions.resolution
+		mapUnits = self.iface.mapCanvas().mapUnits()
+		points, chainages, offsets = [], [], [0]
+		for f in features:
+			p, c, d = lineToPoints(f, resolution, mapUnits)
+			if p is None or c is None or d is None:
+				p, c = [], []
+			points += list(p)
+			chainages.append(c)
+			offsets.append(len(points))
+		
+		outputs = [([], [], []) for f in features]
+		for layer in mLayers:
+			for rtype in resultTypes:
+				if timestep == 'Maximum' or timestep == -99999 or timestep == '-99999.000000':
+					isMax = True
+				else:
+					isMax = self.tuResults.isMax(rtype)
+				result = self.tuResults.getResult(TuResultsIndex(layer.name(), rtype, timestep, isMax),
+				                                  force_get_time='next lower')
+				if not result or isinstance(result, (dict, TuResultTimesteps)):
+					continue
+				values = self.readValues(layer, [result[-1]], points)[0]
+				name = rtype
+				if self.tuResults.isMax(rtype):
+					name = '{0}/Final'.format(rtype) if rtype.lower() == 'minimum dt' else '{0}/Maximums'.format(rtype)
+				label = '{0} [{1}]'.format(name, timestepFormatted) if len(mLayers) == 1 else \
+					'{2}: {0} [{1}]'.format(name, timestepFormatted, layer.name())
+				for j, (data, labels, types) in enumerate(outputs):
+					if offsets[j+1] == offsets[j]:  # line could not be converted to points
+						continue
+					data.append((chainages[j][:], values[offsets[j]:offsets[j+1]].tolist()))
+					labels.append(label)
+					types.append(rtype)
+		
+		return outputs
+	
+	def readValues(self, layer, results, points):
+		"""
+		Read values for all points - each timestep dataset is read in a few large blocks, or with a single call if
+		the points are spread over most of the mesh (see TuPlot2D.readBlocks). Timesteps are read in chunks so
+		progress can be updated and export cancelled.
+		
+		:param layer: QgsMeshLayer
+		:param results: list -> QgsMeshDatasetIndex
+		:param points: list -> QgsPointXY
+		:return: numpy.ndarray (timesteps x points)
+		"""
+		
+		values = []
+		for i in range(0, len(results), self.chunkSize):
+			values.append(self.tuPlot.extraction.run(None, lambda task: self.tuPlot2D.timeSeriesValues(
+				layer, results[i:i+self.chunkSize], points, task=self)))
+			QgsApplication.processEvents()
+		
+		return np.vstack(values) if values else np.zeros((0, len(points)))
+	
+	def uniqueFile(self, outputFolder, name, extension, reserved):
+		"""
+		Unique output file name. Files are written by worker threads so names handed out are also reserved.
+		
+		:param outputFolder: str
+		:param name: str
+		:param extension: str e.g. '.csv'
+		:param reserved: set -> str file names already handed out
+		:return: str
+		"""
+		
+		outFile = '{0}{1}'.format(os.path.join(outputFolder, name), extension)
+		iterator = 1
+		while os.path.exists(outFile) or outFile in reserved:
+			outFile = '{0}_{2}{1}'.format(os.path.join(outputFolder, name), extension, iterator)
+			iterator += 1
+		reserved.add(outFile)
+		
+		return outFile
+	
+	def initProgress(self, format, featureCount):
+		"""
+		Message bar with progress and cancel button.
+		
+		:param format: str 'csv' or 'image'
+		:param featureCount: int
+		:return: void
+		"""
+		
+		self.steps = max(featureCount, 1)
+		self.stepsComplete = 0
+		self.iface.messageBar().clearWidgets()
+		progressWidget = self.iface.messageBar().createMessage("TUFLOW Viewer", " Exporting {0}s . . .".format(format))
+		self.progress = QProgressBar()
+		self.progress.setMaximum(100)
+		progressWidget.layout().addWidget(self.progress)
+		cancelButton = QPushButton('Cancel')
+		cancelButton.clicked.connect(self.cancel)
+		progressWidget.layout().addWidget(cancelButton)
+		self.iface.messageBar().pushWidget(progressWidget)
+		self.iface.mainWindow().repaint()
+	
+	def updateProgress(self):
+		"""
+		Increment progress by one feature.
+		
+		:return: void
+		"""
+		
+		self.stepsComplete += 1
+		if self.progress is not None:
+			self.progress.setValue(int(self.stepsComplete / self.steps * 100))
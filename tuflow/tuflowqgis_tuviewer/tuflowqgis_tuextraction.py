@@ -0,0 +1,175 @@
+import threading
+from PyQt5.QtCore import QCoreApplication, QThread
+from qgis.core import QgsApplication, QgsTask
+
+
+class TuExtractionCancelled(Exception):
+	"""
+	Raised inside an extraction function when the task running it has been cancelled.
+	
+	"""
+	
+	pass
+
+
+class TuExtractionScheduler():
+	"""
+	Runs plot data extraction in QgsTask workers so the GUI isn't blocked while results are read from large meshes.
+	
+	Extraction requests are submitted to a channel e.g. (0, '2d') for 2D time series. Results are handed back to
+	the callback on the main thread in the order they were submitted to the channel. Cancelling a channel
+	(e.g. when the plot is cleared because the user clicked again or the time changed) cancels the running tasks and
+	drops any results not yet handed back.
+	
+	Extraction functions are run one at a time (see lock) so that the state they share - the cached mesh samplers
+	and their value blocks - is only changed by one function at a time. Background tasks don't read from the
+	layer's own data provider, which the map is rendered from. They read from a copy of the layer owned by the
+	mesh cache, and the mesh and locator are built on the main thread before tasks are submitted (see
+	TuResults2D.prepareExtraction and TuResults2D.getExtractionProvider). Cancel the tasks and take the lock
+	before clearing anything a running task may be using e.g. when a layer is removed - cancelled tasks stop
+	before their extraction function starts (see run).
+	"""
+	
+	def __init__(self):
+		self.lock = threading.RLock()  # held while an extraction function runs
+		self.channels = {}  # channel: list -> dict job { 'task', 'callback', 'done', 'result' }
+		self.idleCallbacks = {}  # channel: list -> callable called once all results have been handed back
+	
+	def submit(self, channel, function, callback, **kwargs):
+		"""
+		Run extraction function in a background task.
+		
+		:param channel: hashable e.g. (0, '2d')
+		:param function: callable(task) -> extracted data. Should call checkCancelled(task) regularly
+		:param callback: callable(data) -> called on the main thread with the data returned by function
+		:param kwargs: str description -> task description
+		               list layers -> QgsMapLayer task is cancelled if any are removed from the project
+		               callable progress -> called on the main thread with task progress (0 - 100)
+		:return: QgsTask
+		"""
+		
+		description = kwargs['description'] if 'description' in kwargs else 'TUFLOW Viewer: Extracting Plot Data'
+		layers = kwargs['layers'] if 'layers' in kwargs else []
+		progress = kwargs['progress'] if 'progress' in kwargs else None
+		
+		job = {'task': None, 'callback': callback, 'done': False, 'result': None}
+		task = QgsTask.fromFunction(description, self.run, function,
+		                            on_finished=lambda e, result=None: self.finished(channel, job, e, result))
+		job['task'] = task  # keep reference to task otherwise it is garbage collected before it runs
+		if layers:
+			task.setDependentLayers(layers)
+		if progress is not None:
+			task.progressChanged.connect(progress)
+		
+		if channel not in self.channels:
+			self.channels[channel] = []
+		self.channels[channel].append(job)
+		QgsApplication.taskManager().addTask(task)
+		
+		return task
+	
+	def run(self, task, function):
+		"""
+		Runs extraction function while holding the lock. Also used to run extraction on the main thread so that it
+		can't run at the same time as an extraction function in a background task.
+		
+		:param task: QgsTask or None if not run in a task
+		:param function: callable(task)
+		:return: data returned by function
+		"""
+		
+		with self.lock:
+			self.checkCancelled(task)
+			return function(task)
+	
+	def finished(self, channel, job, exception, result):
+		"""
+		Called on the main thread when a task finishes. Hands results back in submission order.
+		
+		:param channel: hashable
+		:param job: dict
+		:param exception: Exception or None
+		:param result: data returned by extraction function
+		:return: void
+		"""
+		
+		jobs = self.channels[channel] if channel in self.channels else []
+		if not [x for x in jobs if x is job]:  # cancelled
+			return
+		
+		job['done'] = True
+		job['result'] = result if exception is None else None
+		if exception is not None and not job['task'].isCanceled() and not isinstance(exception, TuExtractionCancelled):
+			QgsApplication.messageLog().logMessage('Error extracting plot data: {0}'.format(exception),
+			                                       'TUFLOW Viewer')
+		
+		while jobs and jobs[0]['done']:
+			job = jobs.pop(0)
+			if job['result'] is not None:
+				job['callback'](job['result'])
+		
+		if not jobs and channel in self.idleCallbacks:
+			for callback in self.idleCallbacks.pop(channel):
+				callback()
+	
+	def whenIdle(self, channel, callback):
+		"""
+		Calls callback once all results submitted to the channel have been handed back, or straight away if there
+		is nothing pending. Dropped if the channel is cancelled.
+		
+		:param channel: hashable
+		:param callback: callable()
+		:return: void
+		"""
+		
+		if not self.isBusy(channel):
+			callback()
+		else:
+			self.idleCallbacks.setdefault(channel, []).append(callback)
+	
+	def cancel(self, channel=None):
+		"""
+		Cancels running tasks and drops pending results.
+		
+		:param channel: hashable or None to cancel all channels
+		:return: void
+		"""
+		
+		channels = list(self.channels) if channel is None else [channel]
+		for c in channels:
+			if c in self.channels:
+				for job in self.channels[c]:
+					if not job['done']:
+						job['task'].cancel()
+				del self.channels[c]
+			if c in self.idleCallbacks:
+				del self.idleCallbacks[c]
+	
+	def isBusy(self, channel=None):
+		"""
+		:param channel: hashable or None for any channel
+		:return: bool -> True if there are results still to be handed back
+		"""
+		
+		if channel is None:
+			return any(self.channels.values())
+		
+		return bool(self.channels[channel]) if channel in self.channels else False
+	
+	@staticmethod
+	def isMainThread():
+		"""
+		:return: bool -> True if called from the main (GUI) thread
+		"""
+		
+		return QThread.currentThread() == QCoreApplication.instance().thread()
+	
+	@staticmethod
+	def checkCancelled(task):
+		"""
+		:param task: QgsTask or None
+		:return: void
+		"""
+		
+		if task is not None and task.isCanceled():
+			raise TuExtractionCancelled()
@@ -0,0 +1,88 @@
+import numpy as np
+
+
+class TuFlowLine():
+	"""
+	Integrates flow across a line for all timesteps at once. Segment widths and directions are calculated
+	once from the line sample points and flow is calculated from depth and velocity arrays
+	(timesteps x points) e.g. from TuPlot2D.timeSeriesValues.
+	
+	Flow across each segment is the average depth x segment width x average velocity magnitude. Flow is
+	positive if the average velocity points to the left of the line direction and negative if it points to
+	the right. Where the average velocity has no direction, the direction of the previous segment's velocity
+	is used.
+	"""
+	
+	def __init__(self, chainages, directions):
+		"""
+		:param chainages: list -> float chainage of each point
+		:param directions: list -> float direction (0 - 360 deg) from the previous point to the point, None for the
+		                           first point (see lineToPoints)
+		"""
+		
+		self.chainages = np.array(chainages, dtype=float)
+		self.widths = np.diff(self.chainages)
+		
+		angles = np.array([np.nan if x is None else x for x in directions[1:]], dtype=float)
+		angles = np.radians(angles)
+		self.dirX = np.nan_to_num(np.cos(angles))  # no direction = no flow
+		self.dirY = np.nan_to_num(np.sin(angles))
+	
+	def __len__(self):
+		return self.chainages.size
+	
+	@staticmethod
+	def average(values):
+		"""
+		Average of adjacent values. If one value is nan the other value is used.
+		
+		:param values: numpy.ndarray -> float (timesteps x points)
+		:return: numpy.ndarray -> float (timesteps x segments)
+		"""
+		
+		prev, curr = values[:,:-1], values[:,1:]
+		av = (prev + curr) / 2.
+		av = np.where(np.isnan(prev), curr, av)
+		av = np.where(np.isnan(curr), prev, av)
+		
+		return av
+	
+	def flow(self, depth, velMag, velX, velY):
+		"""
+		Calculate flow across the line.
+		
+		:param depth: numpy.ndarray -> float (timesteps x points)
+		:param velMag: numpy.ndarray -> float (timesteps x points) velocity magnitude
+		:param velX: numpy.ndarray -> float (timesteps x points) velocity x component
+		:param velY: numpy.ndarray -> float (timesteps x points) velocity y component
+		:return: numpy.ndarray -> float (timesteps) flow
+		"""
+		
+		nt = depth.shape[0]
+		if self.widths.size == 0:
+			return np.zeros(nt)
+		
+		# no velocity where point is dry
+		depth = np.where(np.isnan(depth), 0., depth)
+		wet = depth > 0
+		velMag = np.where(wet & ~np.isnan(velMag), velMag, 0.)
+		velX = np.where(wet, velX, 0.)
+		velY = np.where(wet, velY, 0.)
+		
+		avDepth = (depth[:,:-1] + depth[:,1:]) / 2.
+		avVelMag = (velMag[:,:-1] + velMag[:,1:]) / 2.
+		avVelX = self.average(velX)
+		avVelY = self.average(velY)
+		
+		# carry velocity direction forward from previous segment if it has no direction
+		hasDir = ~(np.isnan(avVelX) | np.isnan(avVelY) | ((avVelX == 0) & (avVelY == 0)))
+		ind = np.where(hasDir, np.arange(self.widths.size), -1)
+		ind = np.maximum.accumulate(ind, axis=1)
+		rows = np.arange(nt)[:,None]
+		flowX = np.where(ind >= 0, avVelX[rows, np.maximum(ind, 0)], 0.)
+		flowY = np.where(ind >= 0, avVelY[rows, np.maximum(ind, 0)], 0.)
+		
+		# +ve if flow is anti-clockwise from line direction, -ve if clockwise, zero if parallel
+		sign = np.sign(self.dirX * flowY - self.dirY * flowX)
+		
+		return (avDepth * self.widths * avVelMag * sign).sum(axis=1)
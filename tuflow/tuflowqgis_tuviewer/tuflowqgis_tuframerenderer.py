@@ -0,0 +1,271 @@
+import os
+from PyQt5.QtCore import QSizeF, QPointF
+from PyQt5.QtGui import QImage, QPainter, QColor
+from qgis.core import (QgsLayoutExporter, QgsLayoutItem, QgsLayoutItemMap, QgsLayoutItemPage, QgsFillSymbol,
+                       QgsMapRendererParallelJob, QgsMapSettings)
+
+
+class TuBackgroundCache():
+	"""
+	Keeps the static layers of a map (the layers below the time varying layers e.g. aerials, basemaps, model GIS)
+	rendered so that for each frame or map only the time varying layers and anything above them are rendered
+	and drawn over the cached image.
+	
+	The cached image is kept for one extent / image size and is rendered again if these or the layers change.
+	
+	Labels are drawn above every layer and placed together, so labelled layers are never cached - they and
+	everything above them are rendered every time (see splitLayers) and the background is rendered without labels.
+	"""
+	
+	def __init__(self):
+		self.key = None
+		self.image = None  # QImage
+	
+	@staticmethod
+	def splitLayers(layers, dynamic):
+		"""
+		Split layers into layers that need rendering every time and static layers below them. Labelled layers
+		are rendered every time so their labels are drawn above the time varying layers.
+		
+		:param layers: list -> QgsMapLayer in render order (top layer first) i.e. QgsMapSettings.layers()
+		:param dynamic: list -> QgsMapLayer time varying layers
+		:return: list -> QgsMapLayer layers to render every time
+		         list -> QgsMapLayer static layers
+		"""
+		
+		if not [x for x in layers if x in dynamic]:
+			return [], layers[:]
+		
+		indexes = [i for i, x in enumerate(layers) if x in dynamic or TuBackgroundCache.isLabelled(x)]
+		n = max(indexes) + 1
+		return layers[:n], layers[n:]
+	
+	@staticmethod
+	def isLabelled(layer):
+		"""
+		:param layer: QgsMapLayer
+		:return: bool -> True if layer draws labels
+		"""
+		
+		return hasattr(layer, 'labelsEnabled') and layer.labelsEnabled() and layer.labeling() is not None
+	
+	def background(self, settings, layers):
+		"""
+		Static layers rendered with map settings.
+		
+		:param settings: QgsMapSettings
+		:param layers: list -> QgsMapLayer static layers
+		:return: QImage
+		"""
+		
+		size = settings.outputSize()
+		key = (settings.extent().toString(), size.width(), size.height(), settings.outputDpi(),
+		       settings.destinationCrs().authid(), tuple(x.id() for x in layers))
+		if key != self.key or self.image is None:
+			backgroundSettings = QgsMapSettings(settings)
+			backgroundSettings.setLayers(layers)
+			backgroundSettings.setFlag(QgsMapSettings.DrawLabeling, False)
+			job = QgsMapRendererParallelJob(backgroundSettings)
+			job.start()
+			job.waitForFinished()
+			self.image = job.renderedImage()
+			self.key = key
+		
+		return self.image
+
+
+class TuFrameRenderer():
+	"""
+	Renders animation frames with the map for several frames being rendered at the same time.
+	
+	The map is rendered separately from the rest of the layout using QgsMapRendererParallelJob. Map jobs are started
+	for the next frames (up to workers) while earlier frames are finished off, so mesh datasets are rendered in
+	parallel rather than one frame after another. Map layer renderers take a copy of the active datasets when the
+	job is started, so the mesh renderer settings can be moved on to the next frame straight away.
+	
+	The rest of the layout (labels, legend, plots) is rendered on the main thread with the map item hidden and drawn
+	over the map image. Frames are handed back in order.
+	
+	If time varying layers are given (dynamic_layers) the static layers below them are rendered once and cached
+	(see TuBackgroundCache) and only the time varying layers and anything above them are rendered for each frame.
+	
+	Only layouts where the reference map is the only map, sits under every other item and has no frame, grid,
+	overview or rotation are supported (see isSupported) e.g. the default animation layout.
+	"""
+	
+	def __init__(self, layout, dpi, size, **kwargs):
+		"""
+		:param layout: QgsPrintLayout
+		:param dpi: float
+		:param size: QSize -> output image size in pixels
+		:param kwargs: int workers -> number of frames rendered at the same time
+		               list dynamic_layers -> QgsMapLayer time varying layers e.g. result mesh layer
+		               TuBackgroundCache background_cache -> cache to share between renderers e.g. for map export
+		"""
+		
+		self.layout = layout
+		self.layoutMap = layout.referenceMap()
+		self.dpi = dpi
+		self.size = size
+		self.workers = kwargs['workers'] if 'workers' in kwargs else min(4, os.cpu_count() or 1)
+		self.dynamicLayers = kwargs['dynamic_layers'] if 'dynamic_layers' in kwargs else None
+		self.backgroundCache = kwargs['background_cache'] if 'background_cache' in kwargs else TuBackgroundCache()
+		self.exporter = QgsLayoutExporter(layout)
+		self.page = layout.pageCollection().page(0)
+		self.pageSymbol = None  # original page style while rendering
+		self.jobs = []  # (QgsMapRendererParallelJob, QImage background or None) in frame order
+	
+	@staticmethod
+	def isSupported(layout):
+		"""
+		:param layout: QgsPrintLayout
+		:return: bool -> True if map can be rendered separately from rest of layout
+		"""
+		
+		layoutMap = layout.referenceMap()
+		if layoutMap is None or layout.pageCollection().pageCount() != 1:
+			return False
+		if layoutMap.frameEnabled() or layoutMap.mapRotation() != 0:
+			return False
+		if layoutMap.grids().size() or layoutMap.overviews().size():
+			return False
+		for item in layout.items():
+			if not isinstance(item, QgsLayoutItem) or isinstance(item, QgsLayoutItemPage) or item is layoutMap:
+				continue
+			if isinstance(item, QgsLayoutItemMap) or item.zValue() < layoutMap.zValue():
+				return False
+		
+		return True
+	
+	def render(self, frames, setFrame, updateFrame, saveFrame, progress=None):
+		"""
+		Render frames.
+		
+		:param frames: list -> frame passed to callbacks e.g. (dataset index, time)
+		:param setFrame: callable(frame) -> sets map layers to frame e.g. active mesh datasets
+		:param updateFrame: callable(frame) -> updates time dependent layout items e.g. time label
+		:param saveFrame: callable(int frame number starting at 1, QImage)
+		:param progress: callable(int, int count)
+		:return: void
+		"""
+		
+		count = len(frames)
+		self.start()
+		try:
+			started = 0
+			for n, frame in enumerate(frames):
+				# keep workers busy rendering the next frames
+				while started < count and len(self.jobs) < self.workers:
+					setFrame(frames[started])
+					self.jobs.append(self.startMap())
+					started += 1
+				
+				job, background = self.jobs.pop(0)
+				job.waitForFinished()
+				updateFrame(frame)
+				saveFrame(n + 1, self.composite(job.renderedImage(), background))
+				
+				if progress is not None:
+					progress(n + 1, count)
+		finally:
+			self.finish()
+	
+	def renderImage(self):
+		"""
+		Render layout as it is currently set up e.g. for a single map export.
+		
+		:return: QImage
+		"""
+		
+		self.start()
+		try:
+			job, background = self.startMap()
+			job.waitForFinished()
+			return self.composite(job.renderedImage(), background)
+		finally:
+			self.finish()
+	
+	def start(self):
+		"""
+		Hides map and page background so rest of the layout can be drawn over the map image.
+		
+		:return: void
+		"""
+		
+		self.pageSymbol = self.page.pageStyleSymbol().clone()
+		self.page.setPageStyleSymbol(QgsFillSymbol.createSimple({'color': '0,0,0,0', 'outline_style': 'no'}))
+		self.layoutMap.setVisibility(False)
+	
+	def finish(self):
+		"""
+		Cancels any map jobs still running and restores layout.
+		
+		:return: void
+		"""
+		
+		for job, background in self.jobs:
+			job.cancelWithoutBlocking()
+		for job, background in self.jobs:
+			job.waitForFinished()
+		self.jobs.clear()
+		
+		self.layoutMap.setVisibility(True)
+		if self.pageSymbol is not None:
+			self.page.setPageStyleSymbol(self.pageSymbol)
+			self.pageSymbol = None
+	
+	def scale(self):
+		"""
+		:return: float -> pixels per layout unit
+		"""
+		
+		return self.size.width() / self.page.rect().width()
+	
+	def startMap(self):
+		"""
+		Start rendering map with layers as currently set. Static layers come from the background cache if
+		time varying layers have been given.
+		
+		:return: QgsMapRendererParallelJob
+		         QImage static layers or None if all layers are being rendered
+		"""
+		
+		scale = self.scale()
+		rect = self.layoutMap.rect()
+		size = QSizeF(round(rect.width() * scale), round(rect.height() * scale))
+		settings = self.layoutMap.mapSettings(self.layoutMap.extent(), size, scale * 25.4, True)
+		background = None
+		if self.dynamicLayers is not None:
+			layers, staticLayers = self.backgroundCache.splitLayers(settings.layers(), self.dynamicLayers)
+			if staticLayers:
+				background = self.backgroundCache.background(settings, staticLayers)
+				settings.setLayers(layers)
+				settings.setBackgroundColor(QColor(0, 0, 0, 0))
+		job = QgsMapRendererParallelJob(settings)
+		job.start()
+		
+		return job, background
+	
+	def composite(self, mapImage, background=None):
+		"""
+		Draw map image over cached static layers and rest of layout over map image.
+		
+		:param mapImage: QImage
+		:param background: QImage static layers or None
+		:return: QImage
+		"""
+		
+		image = QImage(self.size, QImage.Format_ARGB32)
+		image.fill(self.pageSymbol.color())
+		overlay = self.exporter.renderPageToImage(0, self.size, self.dpi)
+		
+		scale = self.scale()
+		pos = self.layoutMap.pos() - self.page.pos()
+		painter = QPainter(image)
+		if background is not None:
+			painter.drawImage(QPointF(pos.x() * scale, pos.y() * scale), background)
+		painter.drawImage(QPointF(pos.x() * scale, pos.y() * scale), mapImage)
+		painter.drawImage(0, 0, overlay)
+		painter.end()
+		
+		return image
@@ -16,6 +16,7 @@ from tuflow.tuflowqgis_tuviewer.tuflowqgis_tuanimation import (ImagePropertiesDi
 from tuflow.tuflowqgis_library import (tuflowqgis_find_layer, convertTimeToFormattedTime, convertFormattedTimeToTime,
                                        browse)
 from tuflow.tuflowqgis_tuviewer.tuflowqgis_turesults import TuResults
+from tuflow.tuflowqgis_tuviewer.tuflowqgis_tuframerenderer import TuFrameRenderer, TuBackgroundCache
 
 
 
@@ -171,6 +172,12 @@ def makeMap(cfg, iface, progress_fn=None, dialog=None, preview=False, iteration=
 			res = layout_exporter.exportToPdf(imgfile, pdf_export_settings)
 		elif ext.lower() == '.svg':
 			res = layout_exporter.exportToSvg(imgfile, svg_export_settings)
+		elif TuFrameRenderer.isSupported(layout):
+			# static layers under the result mesh layers rendered once and re-used for each map
+			dynamic = [x for x in layout.referenceMap().layersToRender() if isinstance(x, QgsMeshLayer)]
+			kwargs = {'background_cache': cfg['background cache']} if 'background cache' in cfg else {}
+			renderer = TuFrameRenderer(layout, dpi, QSize(w, h), dynamic_layers=dynamic, **kwargs)
+			res = QgsLayoutExporter.Success if renderer.renderImage().save(imgfile) else QgsLayoutExporter.FileError
 		else:
 			res = layout_exporter.exportToImage(imgfile, image_export_settings)
 		
@@ -1564,7 +1571,8 @@ class TuMapDialog(QDialog, Ui_MapDialog):
 		     'page margin': pageMargin,
 		     'datetime': self.tuView.tuOptions.xAxisDates,
 		     'dateformat': self.tuView.tuOptions.dateFormat,
-		     'dynamic axis update': self.cbDynamicAxisLimits.isChecked()
+		     'dynamic axis update': self.cbDynamicAxisLimits.isChecked(),
+		     'background cache': TuBackgroundCache()
 		     }
 		tmpdir = tempfile.mkdtemp(suffix='tflw_maps')
 		d['tmpdir'] = tmpdir
@@ -1579,7 +1587,6 @@ class TuMapDialog(QDialog, Ui_MapDialog):
 				time = self.tableMaps.item(i, 3).text()
 				# result layer
 				layer = self.tableMaps.item(i, 0).text()
-				d['rendered'] = False
 				if layer not in self.tuView.tuResults.results and \
 						os.path.splitext(os.path.basename(layer))[0] not in self.tuView.tuResults.results:
 					imported = self.tuView.tuMenuBar.tuMenuFunctions.load2dResults(result_2D=[[layer]])
@@ -1622,7 +1629,6 @@ class TuMapDialog(QDialog, Ui_MapDialog):
 			
 			# result layer
 			layer = self.tableMaps.item(i, 0).text()
-			d['rendered'] = False
 			if layer not in self.tuView.tuResults.results and \
 					os.path.splitext(os.path.basename(layer))[0] not in self.tuView.tuResults.results:
 				imported = self.tuView.tuMenuBar.tuMenuFunctions.load2dResults(result_2D=[[layer]])
@@ -129,6 +129,8 @@ class TuContextMenu():
 		self.remove1d2dResults_action = QAction(closeResultsIcon, 'Close Results', self.resultsMenu)
 		self.remove2dResults_action = QAction('Close Results - Map Outputs', self.resultsMenu)
 		self.remove1dResults_action = QAction('Close Results - Time Series', self.resultsMenu)
+		self.follow1dResults_action = QAction('Follow Running Simulation - Time Series', self.resultsMenu)
+		self.follow1dResults_action.setCheckable(True)
 		
 		self.resultsMenu.addAction(self.load1d2dResults_action)
 		self.resultsMenu.addAction(self.load2dResults_action)
@@ -137,6 +139,8 @@ class TuContextMenu():
 		self.resultsMenu.addAction(self.remove1d2dResults_action)
 		self.resultsMenu.addAction(self.remove2dResults_action)
 		self.resultsMenu.addAction(self.remove1dResults_action)
+		self.resultsMenu.addSeparator()
+		self.resultsMenu.addAction(self.follow1dResults_action)
 		
 		self.load2dResults_action.triggered.connect(self.tuMenuFunctions.load2dResults)
 		self.load1dResults_action.triggered.connect(self.tuMenuFunctions.load1dResults)
@@ -144,6 +148,7 @@ class TuContextMenu():
 		self.remove1d2dResults_action.triggered.connect(self.tuMenuFunctions.remove1d2dResults)
 		self.remove2dResults_action.triggered.connect(self.tuMenuFunctions.remove2dResults)
 		self.remove1dResults_action.triggered.connect(self.tuMenuFunctions.remove1dResults)
+		self.follow1dResults_action.triggered.connect(self.tuMenuFunctions.follow1dResults)
 		
 		return True
 	
@@ -155,6 +160,10 @@ class TuContextMenu():
 		:return: bool -> True for successful, False for unsuccessful
 		"""
 		
+		followed = self.tuView.tuResults.tuResults1D.followed
+		selected = [x.text() for x in self.tuView.OpenResults.selectedItems()]
+		self.follow1dResults_action.setChecked(bool(selected) and all([x in followed for x in selected]))
+		
 		self.resultsMenu.popup(self.tuView.OpenResults.mapToGlobal(pos))
 		
 		return True
@@ -18,6 +18,7 @@ from tuflow.tuflowqgis_dialog import tuflowqgis_scenarioSelection_dialog, tuflow
 from tuflow.tuflowqgis_tuviewer.tuflowqgis_tuanimation import TuAnimationDialog
 from tuflow.tuflowqgis_tuviewer.tuflowqgis_tumap import TuMapDialog
 from tuflow.tuflowqgis_tuviewer.tuflowqgis_turesults import TuResults
+from tuflow.tuflowqgis_tuviewer.tuflowqgis_tubatchexport import TuBatchPlotExport
 
 
 class TuMenuFunctions():
@@ -306,6 +307,23 @@ class TuMenuFunctions():
 		
 		return True
 	
+	def follow1dResults(self, checked):
+		"""
+		Turns follow mode on or off for the selected time series results i.e. new timesteps written by a
+		simulation that is still running are loaded periodically.
+		
+		:param checked: bool
+		:return: bool -> True for successful, False for unsuccessful
+		"""
+		
+		results = []
+		for item in self.tuView.OpenResults.selectedItems():
+			results.append(item.text())
+		
+		self.tuView.tuResults.tuResults1D.setFollow(results, checked)
+		
+		return True
+	
 	def updateMapPlotWindows(self):
 		"""
 		Update map window and all plot windows
@@ -1379,51 +1397,17 @@ class TuMenuFunctions():
 			nameIndex = None
 			
 		# convert formatted time back to what can be used to get results
+		timestepKey = None
 		if timestep:
 			if timestep == 'Maximum':
 				timestepKey = timestep
 			else:
 				timestepKey = '{0:.6f}'.format(convertFormattedTimeToTime(timestep))
-			
-		# setup progress bar
-		if featureCount:
-			complete = 0
-			self.iface.messageBar().clearWidgets()
-			progressWidget = self.iface.messageBar().createMessage("TUFLOW Viewer",
-			                                                       " Exporting {0}s . . .".format(format))
-			messageBar = self.iface.messageBar()
-			progress = QProgressBar()
-			progress.setMaximum(100)
-			progressWidget.layout().addWidget(progress)
-			messageBar.pushWidget(progressWidget, duration=1)
-			self.iface.mainWindow().repaint()
-			pComplete = 0
-			complete = 0
-		# loop through features and output
-		for f in featIterator:
-			if vLayer.geometryType() == QgsWkbTypes.PointGeometry:
-				if nameIndex is not None:
-					name = '{0}'.format(f.attributes()[nameIndex])
-				else:
-					name = 'Time_Series_{0}'.format(f.id())
-				self.tuView.tuPlot.tuPlot2D.plotTimeSeriesFromMap(
-					vLayer, f, bypass=True, mesh=mLayers, types=resultTypes, export=format,
-					export_location=outputFolder, name=name, export_format=imageFormat)
-			elif vLayer.geometryType() == QgsWkbTypes.LineGeometry:
-				if nameIndex is not None:
-					name = '{0}'.format(f.attributes()[nameIndex])
-				else:
-					name = 'Cross_Section_{0}'.format(f.id())
-				self.tuView.tuPlot.tuPlot2D.plotCrossSectionFromMap(
-					vLayer, f, bypass=True, mesh=mLayers, types=resultTypes, export=format,
-					export_location=outputFolder, name=name, time=timestepKey, time_formatted=timestep, export_format=imageFormat)
-			else:
-				return False
-			complete += 1
-			pComplete = complete / featureCount * 100
-			progress.setValue(pComplete)
-
-		return True
+		
+		# extract all features together and write outputs
+		batchExport = TuBatchPlotExport(self.tuView)
+		return batchExport.export(vLayer, list(featIterator), mLayers, resultTypes, format, outputFolder, nameIndex,
+		                          imageFormat, time=timestepKey, time_formatted=timestep)
 	
 	def openUserPlotDataManager(self):
 		"""
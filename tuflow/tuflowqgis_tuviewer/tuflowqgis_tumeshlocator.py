@@ -0,0 +1,336 @@
+import numpy as np
+from collections import OrderedDict
+
+
+class TuMeshLocator():
+	"""
+	Locates the mesh faces that points fall in and the vertex weightings used to interpolate values
+	at the points. Vertex coordinates and face connectivity are held as numpy arrays and the faces
+	are indexed with a uniform grid over their bounding boxes so thousands of points can be
+	located at once without building a geometry for each face.
+	
+	Faces can have any number of vertexes (triangles, quads, or polygons e.g. quadtree meshes). Faces are
+	padded to the largest vertex count.
+	"""
+	
+	def __init__(self, vertices, faces, facesPerCell=2):
+		"""
+		:param vertices: numpy.ndarray -> float (nVertices x 2) x, y coordinates
+		:param faces: list -> list -> int vertex indexes for each face
+		:param facesPerCell: float -> average number of faces per grid cell
+		"""
+		
+		self.vertices = np.asarray(vertices, dtype=float).reshape((-1, 2))
+		width = max([len(x) for x in faces] + [4])
+		self.faces = np.full((len(faces), width), -1, dtype=int)  # smaller faces padded with -1
+		self.valid = np.zeros(len(faces), dtype=bool)
+		for i, face in enumerate(faces):
+			if len(face) >= 3:
+				self.faces[i,:len(face)] = face
+				self.valid[i] = True
+		self.nVertex = (self.faces >= 0).sum(axis=1)
+		
+		self.buildIndex(facesPerCell)
+	
+	@classmethod
+	def fromMesh(cls, mesh):
+		"""
+		Creates a locator from a populated mesh.
+		
+		:param mesh: QgsMesh
+		:return: TuMeshLocator
+		"""
+		
+		vertices = np.zeros((mesh.vertexCount(), 2))
+		for i in range(mesh.vertexCount()):
+			v = mesh.vertex(i)
+			vertices[i] = (v.x(), v.y())
+		faces = [list(mesh.face(i)) for i in range(mesh.faceCount())]
+		
+		return cls(vertices, faces)
+	
+	def faceCoords(self, faces):
+		"""
+		Returns x and y coordinates of face vertexes. Padding repeats the first vertex (zero length
+		closing edges).
+		
+		:param faces: numpy.ndarray -> int face indexes
+		:return: numpy.ndarray x (n x width), numpy.ndarray y (n x width)
+		"""
+		
+		v = self.faces[faces]
+		v = np.where(v < 0, v[:,:1], v)
+		
+		return self.vertices[v,0], self.vertices[v,1]
+	
+	def buildIndex(self, facesPerCell):
+		"""
+		Builds a uniform grid index over the face bounding boxes. Each grid cell stores the faces whose
+		bounding box overlaps it (compressed sparse row layout: cellFaces[cellStart[i]:cellStart[i+1]]).
+		
+		:param facesPerCell: float
+		:return: void
+		"""
+		
+		faces = np.flatnonzero(self.valid)
+		if not faces.size:
+			self.origin = np.zeros(2)
+			self.cellSize = 1.
+			self.nx, self.ny = 1, 1
+			self.cellStart = np.zeros(2, dtype=int)
+			self.cellFaces = np.zeros(0, dtype=int)
+			return
+		
+		x, y = self.faceCoords(faces)
+		xmin, xmax, ymin, ymax = x.min(axis=1), x.max(axis=1), y.min(axis=1), y.max(axis=1)
+		self.origin = np.array([xmin.min(), ymin.min()])
+		width = max(xmax.max() - self.origin[0], 1e-9)
+		height = max(ymax.max() - self.origin[1], 1e-9)
+		self.cellSize = max((width * height * facesPerCell / faces.size) ** 0.5, 1e-9)
+		self.nx = int(width / self.cellSize) + 1
+		self.ny = int(height / self.cellSize) + 1
+		
+		ix0, ix1 = self.cellX(xmin), self.cellX(xmax)
+		iy0, iy1 = self.cellY(ymin), self.cellY(ymax)
+		nxFace = ix1 - ix0 + 1
+		counts = nxFace * (iy1 - iy0 + 1)
+		rep = np.repeat(np.arange(faces.size), counts)
+		offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+		cells = (iy0[rep] + offset // nxFace[rep]) * self.nx + ix0[rep] + offset % nxFace[rep]
+		
+		order = np.argsort(cells, kind='stable')
+		self.cellFaces = faces[rep[order]]
+		self.cellStart = np.searchsorted(cells[order], np.arange(self.nx * self.ny + 1))
+	
+	def cellX(self, x):
+		return np.clip(((x - self.origin[0]) / self.cellSize).astype(int), 0, self.nx - 1)
+	
+	def cellY(self, y):
+		return np.clip(((y - self.origin[1]) / self.cellSize).astype(int), 0, self.ny - 1)
+	
+	def contains(self, faces, px, py):
+		"""
+		Vectorised point in face test (crossing number). Points on a face edge are treated as inside.
+		
+		:param faces: numpy.ndarray -> int face indexes
+		:param px: numpy.ndarray -> float point x
+		:param py: numpy.ndarray -> float point y
+		:return: numpy.ndarray -> bool
+		"""
+		
+		x, y = self.faceCoords(faces)
+		x2, y2 = np.roll(x, -1, axis=1), np.roll(y, -1, axis=1)
+		px, py = px[:,None], py[:,None]
+		
+		with np.errstate(divide='ignore', invalid='ignore'):
+			crosses = ((y > py) != (y2 > py)) & (px < (x2 - x) * (py - y) / (y2 - y) + x)
+		inside = crosses.sum(axis=1) % 2 == 1
+		
+		# on edge
+		cross = (x2 - x) * (py - y) - (y2 - y) * (px - x)
+		scale = np.maximum(np.abs(x2 - x) + np.abs(y2 - y), 1e-12)
+		onEdge = (np.abs(cross) <= 1e-9 * scale * scale) & \
+		         (px >= np.minimum(x, x2)) & (px <= np.maximum(x, x2)) & \
+		         (py >= np.minimum(y, y2)) & (py <= np.maximum(y, y2))
+		
+		return inside | onEdge.any(axis=1)
+	
+	def locate(self, points):
+		"""
+		Returns the index of the face each point falls in. Where faces overlap (e.g. 1D and 2D mesh)
+		the lowest face index is used.
+		
+		:param points: list -> QgsPointXY or numpy.ndarray (n x 2)
+		:return: numpy.ndarray -> int face index, -1 if point is not within the mesh
+		"""
+		
+		xy = self.pointArray(points)
+		faceIndexes = np.full(xy.shape[0], -1, dtype=int)
+		if not xy.shape[0] or not self.cellFaces.size:
+			return faceIndexes
+		
+		px, py = xy[:,0], xy[:,1]
+		inGrid = (px >= self.origin[0]) & (px <= self.origin[0] + self.nx * self.cellSize) & \
+		         (py >= self.origin[1]) & (py <= self.origin[1] + self.ny * self.cellSize)
+		pts = np.flatnonzero(inGrid)
+		cells = self.cellY(py[pts]) * self.nx + self.cellX(px[pts])
+		
+		# candidate (point, face) pairs
+		start, end = self.cellStart[cells], self.cellStart[cells + 1]
+		counts = end - start
+		rep = np.repeat(np.arange(pts.size), counts)
+		offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+		candidates = self.cellFaces[start[rep] + offset]
+		pointIndexes = pts[rep]
+		
+		hit = self.contains(candidates, px[pointIndexes], py[pointIndexes])
+		pointIndexes, candidates = pointIndexes[hit], candidates[hit]
+		
+		# first hit for each point (candidates are sorted by face index within each point)
+		first = np.unique(pointIndexes, return_index=True)[1]
+		faceIndexes[pointIndexes[first]] = candidates[first]
+		
+		return faceIndexes
+	
+	def weights(self, points, faceIndexes):
+		"""
+		Barycentric vertex weightings for each point within its face. Faces with more than 3 vertexes
+		are split into a fan of triangles (v1, v2, v3), (v1, v3, v4), ... and the first triangle containing
+		the point is used.
+		https://codeplea.com/triangular-interpolation
+		
+		:param points: list -> QgsPointXY or numpy.ndarray (n x 2)
+		:param faceIndexes: numpy.ndarray -> int face index for each point (-1 if not in mesh)
+		:return: numpy.ndarray -> int (n x 3) vertex indexes (-1 if invalid),
+		         numpy.ndarray -> float (n x 3) weightings (nan if invalid)
+		"""
+		
+		xy = self.pointArray(points)
+		faceIndexes = np.asarray(faceIndexes, dtype=int)
+		n = xy.shape[0]
+		triangles = np.full((n, 3), -1, dtype=int)
+		weights = np.full((n, 3), np.nan)
+		found = np.flatnonzero(faceIndexes >= 0)
+		if not found.size:
+			return triangles, weights
+		
+		v = self.faces[faceIndexes[found]]
+		nVertex = self.nVertex[faceIndexes[found]]
+		xyFound = xy[found]
+		remaining = np.ones(found.size, dtype=bool)
+		eps = -1e-9
+		for k in range(1, self.faces.shape[1] - 1):
+			fan = remaining & (nVertex >= k + 2)
+			if not fan.any():
+				continue
+			tri = np.stack([v[fan,0], v[fan,k], v[fan,k+1]], axis=1)
+			w = self.triangleWeights(tri, xyFound[fan])
+			use = (w >= eps).all(axis=1)
+			idx = np.flatnonzero(fan)[use]
+			triangles[found[idx]] = tri[use]
+			weights[found[idx]] = w[use]
+			remaining[idx] = False
+		
+		return triangles, np.clip(weights, 0, 1)
+	
+	def triangleWeights(self, triangles, xy):
+		"""
+		:param triangles: numpy.ndarray -> int (n x 3) vertex indexes
+		:param xy: numpy.ndarray -> float (n x 2) point coordinates
+		:return: numpy.ndarray -> float (n x 3) weightings
+		"""
+		
+		v1x, v1y = self.vertices[triangles[:,0],0], self.vertices[triangles[:,0],1]
+		v2x, v2y = self.vertices[triangles[:,1],0], self.vertices[triangles[:,1],1]
+		v3x, v3y = self.vertices[triangles[:,2],0], self.vertices[triangles[:,2],1]
+		px, py = xy[:,0], xy[:,1]
+		
+		with np.errstate(divide='ignore', invalid='ignore'):
+			denom = (v2y - v3y) * (v1x - v3x) + (v3x - v2x) * (v1y - v3y)
+			w1 = ((v2y - v3y) * (px - v3x) + (v3x - v2x) * (py - v3y)) / denom
+			w2 = ((v3y - v1y) * (px - v3x) + (v1x - v3x) * (py - v3y)) / denom
+		
+		return np.stack([w1, w2, 1.0 - w1 - w2], axis=1)
+	
+	@staticmethod
+	def pointArray(points):
+		"""
+		:param points: list -> QgsPointXY / QgsPoint or numpy.ndarray (n x 2)
+		:return: numpy.ndarray -> float (n x 2)
+		"""
+		
+		if isinstance(points, np.ndarray):
+			return points.reshape((-1, 2)).astype(float)
+		
+		return np.array([(p.x(), p.y()) for p in points], dtype=float).reshape((-1, 2))
+
+
+class TuMeshSampler():
+	"""
+	Sparse interpolation matrix mapping mesh vertex (or face) values to sample points. Each point
+	references up to 3 of the required vertexes (ids) with a weighting so interpolating values at
+	all points for a timestep is a single gather and weighted sum.
+	
+	Build once per set of points (e.g. a cross section line at a given resolution) and re-use
+	for each timestep. Values read for a timestep can also be kept (see addBlock) so they don't need to be
+	read again e.g. when they are prefetched during playback.
+	"""
+	
+	maxBlocks = 64  # number of timesteps of values kept
+	
+	def __init__(self, locator, points, onFaces=False):
+		"""
+		:param locator: TuMeshLocator
+		:param points: list -> QgsPointXY or numpy.ndarray (n x 2)
+		:param onFaces: bool -> dataset values are stored on faces rather than vertexes
+		"""
+		
+		xy = locator.pointArray(points)
+		self.npoints = xy.shape[0]
+		self.onFaces = onFaces
+		faceIndexes = locator.locate(xy)
+		
+		if onFaces:
+			self.cols = np.flatnonzero(faceIndexes >= 0)  # points within the mesh
+			self.ids, inverse = np.unique(faceIndexes[self.cols], return_inverse=True)
+			self.inverse = inverse.reshape((-1, 1))
+			self.weights = np.ones(self.inverse.shape)
+		else:
+			triangles, weights = locator.weights(xy, faceIndexes)
+			self.cols = np.flatnonzero(triangles[:,0] >= 0)
+			self.ids, inverse = np.unique(triangles[self.cols], return_inverse=True)
+			self.inverse = inverse.reshape((-1, 3))
+			self.weights = weights[self.cols]
+		
+		# faces required to check active status
+		self.faces, self.faceInverse = np.unique(faceIndexes[self.cols], return_inverse=True)
+		
+		self.blocks = OrderedDict()  # key e.g. ( 'scalar', group, dataset ): ( values at ids, active faces )
+	
+	def getBlock(self, key):
+		"""
+		:param key: hashable e.g. ( 'scalar', group, dataset )
+		:return: tuple -> numpy.ndarray values at ids, numpy.ndarray active faces or None if not kept
+		"""
+		
+		if key not in self.blocks:
+			return None
+		
+		self.blocks.move_to_end(key)
+		return self.blocks[key]
+	
+	def addBlock(self, key, values, active):
+		"""
+		Keep values read for a timestep. Least recently used values are dropped once there are more than maxBlocks.
+		
+		:param key: hashable e.g. ( 'scalar', group, dataset )
+		:param values: numpy.ndarray -> float values at ids
+		:param active: numpy.ndarray -> bool active status of faces
+		:return: void
+		"""
+		
+		self.blocks[key] = (values, active)
+		self.blocks.move_to_end(key)
+		while len(self.blocks) > self.maxBlocks:
+			self.blocks.popitem(last=False)
+	
+	def apply(self, values, active=None):
+		"""
+		Interpolate values at the sample points.
+		
+		:param values: numpy.ndarray -> float (timesteps x ids) or (ids) values at required vertexes / faces
+		:param active: numpy.ndarray -> bool (timesteps x faces) or (faces) active status of required faces
+		:return: numpy.ndarray -> float (timesteps x points) nan where point is not within an active face
+		"""
+		
+		values = np.atleast_2d(values)
+		out = np.full((values.shape[0], self.npoints), np.nan)
+		if not self.cols.size:
+			return out
+		
+		sub = (values[:,self.inverse] * self.weights).sum(axis=2)
+		if active is not None:
+			sub[~np.atleast_2d(active)[:,self.faceInverse]] = np.nan
+		out[:,self.cols] = sub
+		
+		return out
@@ -31,6 +31,7 @@ class TuOptions():
 			self._dateFormat = _dateFormat
 		else:
 			self._dateFormat = '{0:%H}:{0:%M}'
+		self.compact1D = settings.value('TUFLOW/tuview_compact1D', False, type=bool)  # compact 1D time series storage
 	
 	def saveProject(self, project):
 		project.writeEntry("TUVIEW", "livemaptracking", str(self.liveMapTracking))
@@ -58,6 +59,8 @@ class TuOptions():
 		project.writeEntry("TUVIEW", "dateformat", self.dateFormat)
 		
 		project.writeEntry("TUVIEW", "_dateformat", self._dateFormat)
+		
+		project.writeEntry("TUVIEW", "compact1d", str(self.compact1D))
 	
 	def readProject(self, project):
 		liveMapTracking = project.readEntry("TUVIEW", "livemaptracking")[0]
@@ -89,4 +92,7 @@ class TuOptions():
 		
 		self.dateFormat = project.readEntry("TUVIEW", "dateformat")[0]
 		
-		self._dateFormat = project.readEntry("TUVIEW", "_dateformat")[0]
\ No newline at end of file
+		self._dateFormat = project.readEntry("TUVIEW", "_dateformat")[0]
+		
+		compact1D = project.readEntry("TUVIEW", "compact1d")[0]
+		self.compact1D = True if compact1D == 'True' else False
\ No newline at end of file
@@ -0,0 +1,195 @@
+from PyQt5.QtCore import QTimer, QElapsedTimer
+from tuflow.tuflowqgis_tuviewer.tuflowqgis_turesultsindex import TuResultsIndex
+
+
+class TuPlayback():
+	"""
+	Plays through the timesteps in the time combobox.
+	
+	Timesteps are advanced against a clock rather than one per timer tick. If the map or cross section for the
+	current timestep hasn't finished rendering when the next frame is due, the frame is dropped and playback jumps
+	straight to the timestep that is due once rendering has caught up.
+	
+	While playing, cross section values for the next timesteps are read ahead in a background task and kept with the
+	mesh samplers (see TuMeshSampler.addBlock, least recently used are dropped). Map datasets are not read ahead -
+	data providers don't generally keep dataset values in memory so reading them early wouldn't speed up rendering.
+	"""
+	
+	def __init__(self, TuView):
+		self.tuView = TuView
+		self.tuResults = TuView.tuResults
+		self.prefetch = 8  # number of timesteps read ahead
+		self.channel = (None, 'prefetch')  # see TuExtractionScheduler
+		self.startIndex = -1  # combobox index playback (re)started from
+		self.index = -1  # combobox index last set by playback
+		self.dropped = 0  # number of frames dropped
+		self.clock = QElapsedTimer()
+		self.timer = QTimer()
+		self.timer.setSingleShot(False)
+		self.timer.timeout.connect(self.nextFrame)
+	
+	def isPlaying(self):
+		"""
+		:return: bool -> True if playing
+		"""
+		
+		return self.timer.isActive()
+	
+	def start(self):
+		"""
+		Start playing from the current timestep.
+		
+		:return: void
+		"""
+		
+		self.timer.setInterval(max(int(self.tuView.tuOptions.playDelay * 1000), 1))  # sec to ms
+		self.startIndex = self.tuView.cboTime.currentIndex()
+		self.index = self.startIndex
+		self.dropped = 0
+		self.clock.start()
+		self.timer.start()
+		self.prefetchAfterFrame(self.index)
+	
+	def stop(self):
+		"""
+		Stop playing and cancel any reading ahead.
+		
+		:return: void
+		"""
+		
+		self.timer.stop()
+		self.tuView.tuPlot.extraction.cancel(self.channel)
+	
+	def isBehind(self):
+		"""
+		:return: bool -> True if the map or cross section for the current timestep is still being rendered
+		"""
+		
+		if self.tuView.canvas.isDrawing():
+			return True
+		
+		return self.tuView.tuPlot.extraction.isBusy((1, '2d'))
+	
+	def nextFrame(self):
+		"""
+		Advance to the timestep that is due. Called by the timer.
+		
+		:return: void
+		"""
+		
+		cboTime = self.tuView.cboTime
+		i = cboTime.currentIndex()
+		if i != self.index:  # time changed by user - continue playing from new time
+			self.startIndex = i
+			self.index = i
+			self.clock.restart()
+			return
+		
+		if i + 1 >= cboTime.count():
+			self.stop()
+			self.tuView.btnTimePlay.setChecked(False)
+			return
+		
+		if self.isBehind():
+			self.dropped += 1
+			return
+		
+		due = self.startIndex + int(round(self.clock.elapsed() / self.timer.interval()))
+		self.index = min(max(due, i + 1), cboTime.count() - 1)
+		
+		self.tuView.tuPlot.extraction.cancel(self.channel)
+		cboTime.setCurrentIndex(self.index)  # renders map and updates plots - see TuView.timeSliderChanged
+		self.prefetchAfterFrame(self.index)
+	
+	def prefetchAfterFrame(self, index):
+		"""
+		Read ahead once the cross section for the current frame has been extracted. Extraction functions run one
+		at a time so starting the read ahead straight away would hold up the current frame.
+		
+		:param index: int -> time combobox index of the current frame
+		:return: void
+		"""
+		
+		def prefetch():
+			if self.isPlaying() and self.index == index:
+				self.prefetchTimesteps(index + 1)
+		
+		self.tuView.tuPlot.extraction.whenIdle((1, '2d'), prefetch)
+	
+	def prefetchTimesteps(self, start):
+		"""
+		Read ahead cross section values for the timesteps following the current timestep in a background task.
+		
+		:param start: int -> time combobox index of first timestep to read
+		:return: bool -> True if a background task was started
+		"""
+		
+		cboTime = self.tuView.cboTime
+		keys = [self.tuResults.getTimeKey(cboTime.itemText(i)) for i in range(start, min(start + self.prefetch, cboTime.count()))]
+		if not keys:
+			return False
+		
+		# cross section lines currently plotted
+		sampleRequests = []  # (layer, mesh dataset indexes, points)
+		for layer, rtype, points in self.tuView.tuPlot.tuPlot2D.crossSectionRequests:
+			results = self.getResults(layer, rtype, keys)
+			if results:
+				sampleRequests.append((layer, results, points))
+		if not sampleRequests:
+			return False
+		
+		layers = []
+		for request in sampleRequests:
+			if request[0] not in layers:
+				layers.append(request[0])
+		if not self.tuResults.tuResults2D.prepareExtraction(layers):
+			return False
+		
+		self.tuView.tuPlot.extraction.cancel(self.channel)
+		self.tuView.tuPlot.extraction.submit(self.channel, lambda task: self.read(task, sampleRequests),
+		                                     lambda x: None, layers=layers,
+		                                     description='TUFLOW Viewer: Reading Ahead Timesteps')
+		
+		return True
+	
+	def getResults(self, layer, rtype, keys):
+		"""
+		Mesh dataset indexes for result type at each time key. Uses the next lower timestep the same as rendering.
+		
+		:param layer: QgsMeshLayer
+		:param rtype: str -> result type e.g. 'Depth'
+		:param keys: list -> str time key
+		:return: list -> QgsMeshDatasetIndex (no duplicates)
+		"""
+		
+		results = []
+		if self.tuResults.isMax(rtype) or self.tuResults.isMin(rtype):  # doesn't change with time
+			return results
+		
+		found = set()
+		for key in keys:
+			result = self.tuResults.getResult(TuResultsIndex(layer.name(), rtype, key, False),
+			                                  force_get_time='next lower')
+			if result and type(result) is tuple:
+				index = result[-1]
+				if (index.group(), index.dataset()) not in found:
+					found.add((index.group(), index.dataset()))
+					results.append(index)
+		
+		return results
+	
+	def read(self, task, sampleRequests):
+		"""
+		Reads ahead cross section values into the mesh sampler blocks. Run in a background task
+		(see TuExtractionScheduler).
+		
+		:param task: QgsTask
+		:param sampleRequests: list -> tuple (QgsMeshLayer, list QgsMeshDatasetIndex, list points)
+		:return: bool -> True
+		"""
+		
+		tuPlot2D = self.tuView.tuPlot.tuPlot2D
+		for layer, results, points in sampleRequests:
+			tuPlot2D.timeSeriesValues(layer, results, points, task=task, cache=True)
+		
+		return True
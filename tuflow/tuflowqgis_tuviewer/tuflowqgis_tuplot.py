@@ -28,6 +28,7 @@ from tuflow.tuflowqgis_tuviewer.tuflowqgis_tuplotselection import TuPlotSelectio
 from tuflow.tuflowqgis_tuviewer.tuflowqgis_turubberband import TuRubberBand
 from tuflow.tuflowqgis_tuviewer.tuflowqgis_tuflowline import TuFlowLine
 from tuflow.tuflowqgis_tuviewer.tuflowqgis_tuplot2d import TuPlot2D
+from tuflow.tuflowqgis_tuviewer.tuflowqgis_tuextraction import TuExtractionScheduler
 from tuflow.tuflowqgis_tuviewer.tuflowqgis_tuplot1d import TuPlot1D
 from tuflow.tuflowqgis_tuviewer.tuflowqgis_tuuserplotdata import TuUserPlotDataManager
 from tuflow.tuflowqgis_library import applyMatplotLibArtist, getMean, roundSeconds
@@ -149,6 +150,7 @@ class TuPlot():
 		self.tuFlowLine = TuFlowLine(self)
 		
 		# TuPlot2D class
+		self.extraction = TuExtractionScheduler()  # background extraction of plot data
 		self.tuPlot2D = TuPlot2D(self)
 		
 		# TuPlot1D class
@@ -346,6 +348,11 @@ class TuPlot():
 		parentLayout, figure, subplot, plotWidget, isSecondaryAxis, artists, labels, unit, yAxisLabelTypes, yAxisLabels, xAxisLabels, xAxisLimits, yAxisLimits = \
 			self.plotEnumerator(plotNo)
 		
+		# cancel any background extraction that would be drawn onto the cleared plot
+		self.extraction.cancel((plotNo, '2d'))
+		if 'retain_flow' not in kwargs or not kwargs['retain_flow']:
+			self.extraction.cancel((plotNo, 'flow'))
+		
 		# get axis limits
 		xLimits = subplot.get_xlim()
 		yLimits = subplot.get_ylim()
@@ -408,6 +415,7 @@ class TuPlot():
 		elif plotNo == 1:
 			self.clearedLongPlot = True
 			self.tuPlot2D.resetMultiLineCount()
+			self.tuPlot2D.crossSectionRequests = []
 		
 		# reset plot - but keep flow results if "retain_flow=True"
 		for i, label in enumerate(labels):
@@ -526,6 +534,11 @@ class TuPlot():
 			subplot2 = self.getSecondaryAxis(plotNo)
 			yLimits2 = subplot2.get_ylim()
 		
+		# stop reading ahead the last cross section line during playback - requests for a line share its points
+		if plotNo == 1 and self.tuPlot2D.crossSectionRequests:
+			last = self.tuPlot2D.crossSectionRequests[-1][2]
+			self.tuPlot2D.crossSectionRequests = [x for x in self.tuPlot2D.crossSectionRequests if x[2] is not last]
+		
 		# remove last point entry if any entry exists
 		if artists[0] or artists[1]:
 			
@@ -1233,7 +1246,6 @@ class TuPlot():
 		time = kwargs['time'] if 'time' in kwargs.keys() else None
 		showCurrentTime = kwargs['show_current_time'] if 'show_current_time' in kwargs.keys() else False
 		retainFlow = kwargs['retain_flow'] if 'retain_flow' in kwargs.keys() else False
-		meshRendered = kwargs['mesh_rendered'] if 'mesh_rendered' in kwargs.keys() else True
 		plotActiveScalar = kwargs['plot_active_scalar'] if 'plot_active_scalar' in kwargs else False
 		
 		if not plot:
@@ -1254,8 +1266,7 @@ class TuPlot():
 			for i, point in enumerate(self.tuRubberBand.markerPoints):
 				self.tuPlot2D.plotTimeSeriesFromMap(None, QgsPointXY(point), bypass=multi, plot='2D Only',
 				                                    draw=draw, time=time, show_current_time=showCurrentTime,
-				                                    retain_flow=retainFlow, mesh_rendered=meshRendered,
-				                                    plot_active_scalar=plotActiveScalar)
+				                                    retain_flow=retainFlow, plot_active_scalar=plotActiveScalar)
 			
 			for f in self.tuPlot2D.plotSelectionPointFeat:
 				# get feature name from attribute
@@ -1267,8 +1278,7 @@ class TuPlot():
 
 				self.tuPlot2D.plotTimeSeriesFromMap(None, f.geometry().asPoint(), bypass=multi, plot='2D Only',
 				                                    draw=draw, time=time, show_current_time=showCurrentTime,
-				                                    retain_flow=retainFlow, mesh_rendered=meshRendered,
-				                                    plot_active_scalar=plotActiveScalar, featName=featName)
+				                                    retain_flow=retainFlow, plot_active_scalar=plotActiveScalar, featName=featName)
 				
 			if self.tuPlot2D.multiPointSelectCount > 1:
 				self.tuPlot2D.reduceMultiPointCount(1)
@@ -1292,11 +1302,11 @@ class TuPlot():
 							except:
 								feat.setGeometry(QgsGeometry.fromPolyline([QgsPoint(x.x(), x.y()) for x in geom]))
 							self.tuPlot2D.plotFlowFromMap(None, feat, bypass=multiFlow, plot='flow only', draw=draw, time=time,
-							                              show_current_time=showCurrentTime, mesh_rendered=meshRendered)
+							                              show_current_time=showCurrentTime)
 					
 				for feat in self.tuPlot2D.plotSelectionFlowFeat:
 					self.tuPlot2D.plotFlowFromMap(None, feat, bypass=multiFlow, plot='flow only', draw=draw, time=time,
-					                              show_current_time=showCurrentTime, mesh_rendered=meshRendered)
+					                              show_current_time=showCurrentTime)
 					
 				if self.tuPlot2D.multiFlowLineSelectCount > 1:
 					self.tuPlot2D.reduceMultiFlowLineCount(1)
@@ -1329,7 +1339,6 @@ class TuPlot():
 		plot = kwargs['plot'] if 'plot' in kwargs.keys() else ''
 		draw = kwargs['draw'] if 'draw' in kwargs.keys() else True
 		time = kwargs['time'] if 'time' in kwargs.keys() else None
-		meshRendered = kwargs['mesh_rendered'] if 'mesh_rendered' in kwargs.keys() else True
 		plotActiveScalar = kwargs['plot_active_scalar'] if 'plot_active_scalar' in kwargs else False
 		
 		if time is not None:
@@ -1360,12 +1369,10 @@ class TuPlot():
 							feat.setGeometry(QgsGeometry.fromPolyline([QgsPoint(x.x(), x.y()) for x in geom]))
 						if i == 0:
 							self.tuPlot2D.plotCrossSectionFromMap(None, feat, bypass=multi, plot='2D Only', draw=draw,
-							                                      time=time, mesh_rendered=meshRendered,
-							                                      plot_active_scalar=plotActiveScalar)
+							                                      time=time, plot_active_scalar=plotActiveScalar)
 						else:
 							self.tuPlot2D.plotCrossSectionFromMap(None, feat, bypass=True, plot='2D Only', draw=draw,
-							                                      time=time, mesh_rendered=meshRendered,
-							                                      plot_active_scalar=plotActiveScalar)
+							                                      time=time, plot_active_scalar=plotActiveScalar)
 			
 			for feat in self.tuPlot2D.plotSelectionLineFeat:
 				# get feature name from attribute
@@ -1376,8 +1383,7 @@ class TuPlot():
 					featName = None
 
 				self.tuPlot2D.plotCrossSectionFromMap(None, feat, bypass=multi, plot='2D Only', draw=draw,
-				                                      time=time, mesh_rendered=meshRendered,
-				                                      plot_active_scalar=plotActiveScalar, featName=featName)
+				                                      time=time, plot_active_scalar=plotActiveScalar, featName=featName)
 				
 			if self.tuPlot2D.multiLineSelectCount > 1:
 				self.tuPlot2D.reduceMultiLineCount(1)
@@ -1406,7 +1412,6 @@ class TuPlot():
 		time = kwargs['time'] if 'time' in kwargs.keys() else None
 		showCurrentTime = kwargs['show_current_time'] if 'show_current_time' in kwargs.keys() else False
 		retainFlow = kwargs['retain_flow'] if 'retain_flow' in kwargs.keys() else False
-		meshRendered = kwargs['mesh_rendered'] if 'mesh_rendered' in kwargs.keys() else True
 		plotActiveScalar = kwargs['plot_active_scalar'] if 'plot_active_scalar' in kwargs else False
 
 		if plotNo is None:
@@ -1414,11 +1419,9 @@ class TuPlot():
 		
 		if plotNo == 0:
 			success = self.updateTimeSeriesPlot(update=update, retain_flow=retainFlow, draw=draw, time=time,
-			                                    show_current_time=showCurrentTime, mesh_rendered=meshRendered,
-			                                    plot_active_scalar=plotActiveScalar)
+			                                    show_current_time=showCurrentTime, plot_active_scalar=plotActiveScalar)
 		elif plotNo == 1:
-			success = self.updateCrossSectionPlot(draw=draw, time=time, mesh_rendered=meshRendered,
-			                                      plot_active_scalar=plotActiveScalar)
+			success = self.updateCrossSectionPlot(draw=draw, time=time, plot_active_scalar=plotActiveScalar)
 		
 		# disconnect map canvas refresh if it is connected - used for rendering after loading from project
 		try:
@@ -1694,6 +1697,33 @@ class TuPlot():
 		:return: bool -> True for successful, False for unsuccessful
 		"""
 
+		header = self.getCSVHeader(plotNo, data, labels, types)
+			
+		# unique output file name
+		outFile = '{0}.csv'.format(os.path.join(outputFolder, fileName))
+		iterator = 1
+		while os.path.exists(outFile):
+			outFile = '{0}_{1}.csv'.format(os.path.join(outputFolder, fileName), iterator)
+			iterator += 1
+			
+		# write data
+		self.writeCSV(outFile, header, data)
+			
+		return True
+	
+	def getCSVHeader(self, plotNo, data, labels, types):
+		"""
+		CSV column names using user defined dataset and axis labels (or default label if user has not changed it).
+		
+		:param plotNo: int enumerator -> 0: time series plot
+										 1: long profile plot
+										 2: cross section plot
+		:param data: list all data -> list x, y -> list axis data -> float value
+		:param labels: list -> str dataset label
+		:param types: list -> str result type
+		:return: str
+		"""
+		
 		# convert labels to user defined dataset labels (or default label if user has not changed it)
 		newLabels, newArtists = self.getNewPlotProperties(plotNo, labels, rtype='lines')  # newArtists not used for csv
 		
@@ -1702,8 +1732,29 @@ class TuPlot():
 		oldAxisNames = [xAxisLabel, yAxisLabelFirst, yAxisLabelSecond]
 		newAxisNames = self.getNewPlotProperties(plotNo, oldAxisNames, rtype='axis labels')  # only need X axis name for csv
 		
-		# sort data into format ready to write - first find any datasets that are different in length and index pos
+		# column names
+		lengthChanges, maxLength = self.getCSVLengthChanges(data)
+		header = ''
+		for i, l in enumerate(newLabels):
+			if i in lengthChanges:  # where there are data length changes, include X axis label again
+				header = '{0}{1},'.format(header, newAxisNames[0])
+			header = '{0}{1},'.format(header, l)  # add label
+		header = '{0}\n'.format(header[:-1])  # add return character and remove last comma
+		
+		return header
+	
+	@staticmethod
+	def getCSVLengthChanges(data):
+		"""
+		Find any datasets that are different in length and index pos - X axis values are written again where the
+		length changes.
+		
+		:param data: list all data -> list x, y -> list axis data -> float value
+		:return: list -> int dataset index, int maximum length
+		"""
+		
 		lengthChanges = []
+		maxLength = 0
 		for i in range(len(data)):
 			x = data[i][0]
 			if i == 0:
@@ -1715,9 +1766,26 @@ class TuPlot():
 					lengthChanges.append(i)
 					length = len(x)
 					maxLength = max(maxLength, len(x))
-		# next format data into string
-		datastring = ''
+		
+		return lengthChanges, maxLength
+	
+	@staticmethod
+	def writeCSV(outFile, header, data):
+		"""
+		Write data to CSV. Does not use the plot so can be called from a worker thread.
+		
+		:param outFile: str full path to output file
+		:param header: str column names (see getCSVHeader)
+		:param data: list all data -> list x, y -> list axis data -> float value
+		:return: bool -> True for successful, False for unsuccessful
+		"""
+		
+		lengthChanges, maxLength = TuPlot.getCSVLengthChanges(data)
+		
+		# format data into string
+		rows = []
 		for i in range(maxLength):  # iterate through longest series
+			row = []
 			for j in range(len(data)):  # iterate through the different data sets
 				x = data[j][0][i]
 				y = data[j][1][i]
@@ -1726,31 +1794,16 @@ class TuPlot():
 				if qIsNaN(y):
 					y = ''
 				if j in lengthChanges:  # where there are data length changes, include X axis values again
-					datastring = '{0}{1},'.format(datastring, x)
-				datastring = '{0}{1},'.format(datastring, y)  # add y value
-				if j + 1 == len(data):  # include return character and remove last comma
-					datastring = '{0}\n'.format(datastring[:-1])
-					
-		# column names
-		header = ''
-		for i, l in enumerate(newLabels):
-			if i in lengthChanges:  # where there are data length changes, include X axis label again
-				header = '{0}{1},'.format(header, newAxisNames[0])
-			header = '{0}{1},'.format(header, l)  # add label
-		header = '{0}\n'.format(header[:-1])  # add return character and remove last comma
-			
-		# unique output file name
-		outFile = '{0}.csv'.format(os.path.join(outputFolder, fileName))
-		iterator = 1
-		while os.path.exists(outFile):
-			outFile = '{0}_{1}.csv'.format(os.path.join(outputFolder, fileName), iterator)
-			iterator += 1
-			
+					row.append('{0}'.format(x))
+				row.append('{0}'.format(y))  # add y value
+			rows.append(','.join(row))
+		datastring = ''.join(['{0}\n'.format(x) for x in rows])
+		
 		# write data
 		with open(outFile, 'w') as fo:
 			fo.write(header)
 			fo.write(datastring)
-			
+		
 		return True
 		
 	def plotUserData(self, plotNo):
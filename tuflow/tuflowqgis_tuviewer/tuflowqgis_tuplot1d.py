@@ -71,6 +71,11 @@ class TuPlot1D():
 				# get result types for all selected types
 				for rtype in tuResults1D.typesTS:
 					
+					# extract all selected elements in one call per domain
+					batch = {}
+					if res.formatVersion == 2 and rtype.lower() not in ("flow regime", "losses"):
+						batch = self.getTSDataBatch(res, rtype)
+					
 					# get result for each selected element
 					for i, id in enumerate(tuResults1D.ids):
 						#types.append('{0}_1d'.format(rtype))
@@ -97,19 +102,12 @@ class TuPlot1D():
 						elif res.formatVersion == 2:  # 2015
 							dom = tuResults1D.domains[i]
 							source = tuResults1D.sources[i].upper()
-							if dom == '2D':
-								if rtype.upper().find('STRUCTURE FLOWS') >= 0 and source == 'QS':
-									typename = 'QS'
-								elif rtype.upper().find('STRUCTURE LEVELS') >= 0 and source == 'HU':
-									typename = 'HU'
-								elif rtype.upper().find('STRUCTURE LEVELS') >= 0 and source == 'HD':
-									typename = 'HD'
-								else:
-									typename = rtype
+							if i in batch:
+								found, ydata, message, xdata = batch[i]
 							else:
-								typename = rtype
-							found, ydata, message = res.getTSData(id, dom, typename, 'Geom')
-							xdata = res.times
+								typename = self.getTypeName(rtype, dom, source)
+								found, ydata, message = res.getTSData(id, dom, typename, 'Geom')
+								xdata = res.times
 							if type(ydata) is list:
 								if len(xdata) != len(ydata):
 									xAll.append([])
@@ -151,6 +149,62 @@ class TuPlot1D():
 		
 		return True
 	
+	def getTypeName(self, rtype, dom, source):
+		"""
+		Returns the result type name used to extract 2015 format time series data.
+
+		:param rtype: str -> result type e.g. 'Structure Levels'
+		:param dom: str -> domain e.g. '2D'
+		:param source: str -> element source e.g. 'HU'
+		:return: str
+		"""
+		
+		if dom == '2D':
+			if rtype.upper().find('STRUCTURE FLOWS') >= 0 and source == 'QS':
+				return 'QS'
+			elif rtype.upper().find('STRUCTURE LEVELS') >= 0 and source == 'HU':
+				return 'HU'
+			elif rtype.upper().find('STRUCTURE LEVELS') >= 0 and source == 'HD':
+				return 'HD'
+		
+		return rtype
+	
+	def getTSDataBatch(self, res, rtype):
+		"""
+		Extracts the time series data for all selected elements with a single call per domain and result type
+		rather than one call per element. Elements not found are left out so they can fall back to getTSData
+		which gives the error message.
+
+		:param res: TUFLOW_results.ResData
+		:param rtype: str -> result type e.g. 'Level'
+		:return: dict -> int element index: tuple (bool found, ydata, str message, xdata)
+		"""
+		
+		tuResults1D = self.tuView.tuResults.tuResults1D  # TuResults1D object
+		
+		# group selected elements by domain and type name
+		groups = {}
+		for i, id in enumerate(tuResults1D.ids):
+			dom = tuResults1D.domains[i]
+			source = tuResults1D.sources[i].upper()
+			typename = self.getTypeName(rtype, dom, source)
+			if (dom, typename) not in groups:
+				groups[(dom, typename)] = []
+			groups[(dom, typename)].append(i)
+		
+		batch = {}
+		for (dom, typename), indexes in groups.items():
+			ids = [tuResults1D.ids[i] for i in indexes]
+			found, data, message = res.getTSDataMany(ids, dom, typename)
+			if data is None:
+				continue
+			times = res.times  # output interval can differ between domains so keep times with data
+			for j, i in enumerate(indexes):
+				if found[j]:
+					batch[i] = (True, data[:,j], None, times)
+		
+		return batch
+	
 	def plot1dLongPlot(self, **kwargs):
 		"""
 		Plots 1D long plots based on selected features, results, and result types.
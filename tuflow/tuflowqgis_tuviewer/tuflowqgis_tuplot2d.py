@@ -5,9 +5,12 @@ from PyQt5.QtGui import *
 from PyQt5 import QtGui
 from qgis.core import *
 from PyQt5.QtWidgets  import *
-from tuflow.tuflowqgis_tuviewer.tuflowqgis_turesultsindex import TuResultsIndex
+from tuflow.tuflowqgis_tuviewer.tuflowqgis_turesultsindex import TuResultsIndex, TuResultTimesteps
+from tuflow.tuflowqgis_tuviewer.tuflowqgis_tuflux import TuFlowLine
+from tuflow.tuflowqgis_tuviewer.tuflowqgis_tuextraction import TuExtractionScheduler
 from tuflow.tuflowqgis_library import lineToPoints, getDirection
 from datetime import datetime, timedelta
+from collections import OrderedDict
 
 
 class TuPlot2D():
@@ -32,7 +35,10 @@ class TuPlot2D():
 			self.plotSelectionFlowFeat = []  # store feat for flow plotting so can update outside of active layer
 			self.flowProgressBar = None
 			self.progress = QProgressBar()
-			self.faceIndexes = []
+			self.linePoints = OrderedDict()  # (wkt, resolution, map units): points, chainages, directions
+			self.maxLinePoints = 32
+			self.crossSectionRequests = []  # (layer, result type, points) plotted in cross section - read ahead during playback
+			self.readGap = 1024  # unused values read between required indexes rather than making another provider call
 	
 	def plotTimeSeriesFromMap(self, vLayer, point, **kwargs):
 		"""
@@ -66,7 +72,6 @@ class TuPlot2D():
 		time = kwargs['time'] if 'time' in kwargs.keys() else None
 		showCurrentTime = kwargs['show_current_time'] if 'show_current_time' in kwargs.keys() else False
 		retainFlow = kwargs['retain_flow'] if 'retain_flow' in kwargs.keys() else False
-		meshRendered = kwargs['mesh_rendered'] if 'mesh_rendered' in kwargs.keys() else True
 		plotActiveScalar = kwargs['plot_active_scalar'] if 'plot_active_scalar' in kwargs else False
 		featName = kwargs['featName'] if 'featName' in kwargs else None
 		
@@ -83,7 +88,7 @@ class TuPlot2D():
 		
 		# Initialise variables
 		xAll = []
-		yAll = []
+		requests = []  # (layer, mesh dataset indexes, points) - values are extracted once all requests are collected
 		labels = []
 		types = []
 		
@@ -91,12 +96,6 @@ class TuPlot2D():
 		if not resultMesh:  # specified result meshes can be passed through kwargs (used for batch export not normal plotting)
 			resultMesh = activeMeshLayers
 		for layer in resultMesh:  # get plotting for all selected result meshes
-			if not meshRendered:
-				dp = layer.dataProvider()
-				mesh = QgsMesh()
-				dp.populateMesh(mesh)
-				si = QgsMeshSpatialIndex(mesh)
-			
 			# get plotting for all checked result types
 			if not resultTypes:  # specified result types can be passed through kwargs (used for batch export not normal plotting)
 				resultTypes = self.tuPlot.tuPlotToolbar.getCheckedItemsFromPlotOptions(0)
@@ -128,42 +127,15 @@ class TuPlot2D():
 
 				# iterate through result timesteps to get time series
 				x = []
-				y = []
 				for key, item in r.items():
 					if self.tuView.tuOptions.timeUnits == 's':
 						x.append(item[0] / 3600)
 					else:
 						x.append(item[0])
-					if meshRendered:  # easy
-						y.append(layer.datasetValue(item[-1], point).scalar())
-					else:  # not so easy
-						# pre-render means that we need to
-						# manually go get mesh face indexes
-						# then interpolate value from mesh vertices
-						if i == 0:
-							# first round - go get mesh faces that
-							# point fall in. If graphing for more than
-							# one result - don't need to do this step again
-							success = self.getFaceIndexes2(si, dp, [point], mesh)
-							if not success:
-								return False
-							if len(self.faceIndexes) != 1:
-								return False
-						y.append(self.preRenderDatasetValue(mesh, layer, item[-1], self.faceIndexes[0], point))
-				# check if y data has any values in it or if all nan
-				# seems to error when x axis is dates and y axis all nan
-				if self.tuView.tuOptions.xAxisDates:
-					allNaN = True
-					for a in y:
-						if not qIsNaN(a):
-							allNaN = False
-							break
-					if allNaN:
-						# insert one dummy value
-						y[0] = 0
+				# values for all timesteps are extracted at once - same for rendered and pre-rendered mesh
+				requests.append((layer, [item[-1] for item in r.values()], [QgsPointXY(point)]))
 				# add to overall data list
 				xAll.append(x)
-				yAll.append(y)
 				
 				# legend label for multi points
 				if export:
@@ -191,24 +163,84 @@ class TuPlot2D():
 		# increment point count for multi select
 		if bypass:  # multi select click
 			self.multiPointSelectCount += 1
-
+		
+		# extract values - in the background if plotting in tuview
+		self.extractPlotData((0, '2d'), requests,
+		                     lambda values: self.drawTimeSeriesFromMap(values, xAll, labels, types, **kwargs),
+		                     background=export is None and draw)
+			
+		return True
+	
+	def drawTimeSeriesFromMap(self, values, xAll, labels, types, **kwargs):
+		"""
+		Plot or export extracted time series values (see plotTimeSeriesFromMap).
+		
+		:param values: list -> numpy.ndarray (timesteps x 1) for each result type
+		:param xAll: list -> list float time
+		:param labels: list -> str
+		:param types: list -> str
+		:param kwargs: see plotTimeSeriesFromMap
+		:return: bool -> True for successful, False for unsuccessful
+		"""
+		
+		yAll = []
+		for v in values:
+			y = v[:,0].tolist()
+			# check if y data has any values in it or if all nan
+			# seems to error when x axis is dates and y axis all nan
+			if self.tuView.tuOptions.xAxisDates:
+				if np.isnan(v).all():
+					# insert one dummy value
+					y[0] = 0
+			yAll.append(y)
+		
 		data = list(zip(xAll, yAll))
 		if data:
-			if export is None:  # normal plot i.e. in tuview
-				self.tuPlot.drawPlot(0, data, labels, types, draw=draw, time=time, show_current_time=showCurrentTime)
-			elif export == 'image':  # plot through drawPlot however instead of drawing, save figure
-				# unique output file name
-				outFile = '{0}{1}'.format(os.path.join(exportOut, name), exportFormat)
-				iterator = 1
-				while os.path.exists(outFile):
-					outFile = '{0}_{2}{1}'.format(os.path.join(exportOut, name), exportFormat, iterator)
-					iterator += 1
-				self.tuPlot.drawPlot(0, data, labels, types, export=outFile)
-			elif export == 'csv':  # export to csv, don't plot
-				self.tuPlot.exportCSV(0, data, labels, types, exportOut, name)
-			else:  # catch all other cases and just do normal, although should never be triggered
-				self.tuPlot.drawPlot(0, data, labels, types, draw=draw, time=time, show_current_time=showCurrentTime)
-			
+			self.drawFromMap(0, data, labels, types, **kwargs)
+		
+		return True
+	
+	def drawFromMap(self, plotNo, data, labels, types, **kwargs):
+		"""
+		Draw plot data in tuview or export it to image or csv.
+		
+		:param plotNo: int enumerator -> 0: time series plot
+										 1: long profile plot
+		:param data: list all data -> list x, y -> list axis data -> float value
+		:param labels: list -> str
+		:param types: list -> str
+		:param kwargs: str export -> 'csv' or 'image'
+		:return: bool -> True for successful, False for unsuccessful
+		"""
+		
+		export = kwargs['export'] if 'export' in kwargs.keys() else None  # 'csv' or 'image'
+		exportOut = kwargs['export_location'] if 'export_location' in kwargs.keys() else None
+		exportFormat = kwargs['export_format'] if 'export_format' in kwargs.keys() else None
+		name = kwargs['name'] if 'name' in kwargs.keys() else None
+		draw = kwargs['draw'] if 'draw' in kwargs.keys() else True
+		time = kwargs['time'] if 'time' in kwargs.keys() and plotNo == 0 else None
+		showCurrentTime = kwargs['show_current_time'] if 'show_current_time' in kwargs.keys() else False
+		
+		if plotNo == 0:
+			plotKwargs = {'draw': draw, 'time': time, 'show_current_time': showCurrentTime}
+		else:
+			plotKwargs = {'draw': draw}
+		
+		if export is None:  # normal plot i.e. in tuview
+			self.tuPlot.drawPlot(plotNo, data, labels, types, **plotKwargs)
+		elif export == 'image':  # plot through drawPlot however instead of drawing, save figure
+			# unique output file name
+			outFile = '{0}{1}'.format(os.path.join(exportOut, name), exportFormat)
+			iterator = 1
+			while os.path.exists(outFile):
+				outFile = '{0}_{2}{1}'.format(os.path.join(exportOut, name), exportFormat, iterator)
+				iterator += 1
+			self.tuPlot.drawPlot(plotNo, data, labels, types, export=outFile)
+		elif export == 'csv':  # export to csv, don't plot
+			self.tuPlot.exportCSV(plotNo, data, labels, types, exportOut, name)
+		else:  # catch all other cases and just do normal, although should never be triggered
+			self.tuPlot.drawPlot(plotNo, data, labels, types, **plotKwargs)
+		
 		return True
 	
 	def plotCrossSectionFromMap(self, vLayer, feat, **kwargs):
@@ -241,7 +273,6 @@ class TuPlot2D():
 		exportFormat = kwargs['export_format'] if 'export_format' in kwargs.keys() else None
 		name = kwargs['name'] if 'name' in kwargs.keys() else None
 		draw = kwargs['draw'] if 'draw' in kwargs.keys() else True
-		meshRendered = kwargs['mesh_rendered'] if 'mesh_rendered' in kwargs.keys() else True
 		plotActiveScalar = kwargs['plot_active_scalar'] if 'plot_active_scalar' in kwargs else False
 		featName = kwargs['featName'] if 'featName' in kwargs else None
 		
@@ -258,7 +289,7 @@ class TuPlot2D():
 		
 		# get extraction points
 		resolution = self.tuView.tuOptions.resolution
-		points, chainage, direction = lineToPoints(feat, resolution, self.iface.mapCanvas().mapUnits())
+		points, chainage, direction = self.getLinePoints(feat, resolution)
 		if points is None or chainage is None or direction is None:
 			QMessageBox.critical(self.tuView, "TUFLOW Viewer", "Error Converting Cross Section From Long \ Lat\n"
 			                                                   "Double Check the Projection of the Workspace and Input"
@@ -267,7 +298,7 @@ class TuPlot2D():
 		
 		# initialise plotting variables
 		xAll = []
-		yAll = []
+		requests = []  # (layer, mesh dataset indexes, points) - values are extracted once all requests are collected
 		labels = []
 		types = []
 
@@ -275,12 +306,6 @@ class TuPlot2D():
 		if not resultMesh:  # specified result meshes can be passed through kwargs (used for batch export not normal plotting)
 			resultMesh = activeMeshLayers
 		for layer in resultMesh:
-			if not meshRendered:
-				dp = layer.dataProvider()
-				mesh = QgsMesh()
-				dp.populateMesh(mesh)
-				si = QgsMeshSpatialIndex(mesh)
-			
 			# get plotting for all checked result types
 			if not resultTypes:  # specified result types can be passed through kwargs (used for batch export not normal plotting)
 				resultTypes = self.tuPlot.tuPlotToolbar.getCheckedItemsFromPlotOptions(1)
@@ -314,44 +339,28 @@ class TuPlot2D():
 					isMin = self.tuView.tuResults.isMin(rtype)
 				# get result data for open mesh results, selected scalar datasets, and active time
 				tuResultsIndex = TuResultsIndex(layer.name(), rtype, timestep, isMax)
-				if not self.tuView.tuResults.getResult(tuResultsIndex, force_get_time='next lower'):
+				result = self.tuView.tuResults.getResult(tuResultsIndex, force_get_time='next lower')
+				if not result:
 					continue
-				elif type(self.tuView.tuResults.getResult(tuResultsIndex, force_get_time='next lower')) is dict:
+				elif isinstance(result, (dict, TuResultTimesteps)):
 					continue
 				types.append(rtype)
-				meshDatasetIndex = self.tuView.tuResults.getResult(tuResultsIndex, force_get_time='next lower')[-1]
+				meshDatasetIndex = result[-1]
 				if self.tuView.tuResults.isMax(rtype):
 					if rtype.lower() == 'minimum dt':
 						rtype = '{0}/Final'.format(rtype)
 					else:
 						rtype = '{0}/Maximums'.format(rtype)
 				
-				# iterate through points and extract data
-				x = []
-				y = []
-				for i in range(len(points)):
-					x.append(chainage[i])
-					if meshRendered:  # easy
-						y.append(layer.datasetValue(meshDatasetIndex, QgsPointXY(points[i])).scalar())
-					else:  # not as easy
-						# pre-render means that we need to
-						# manually go get mesh face indexes
-						# then interpolate value from mesh vertices
-						if j == 0 and i == 0:
-							# first round - go get mesh faces that
-							# points fall in. If graphing for more than
-							# one result - don't need to do this step again
-							success = self.getFaceIndexes2(si, dp, points, mesh)
-							if not success:
-								return False
-							if len(self.faceIndexes) != len(points):
-								return False
-						y.append(self.preRenderDatasetValue(mesh, layer, meshDatasetIndex,
-						                                    self.faceIndexes[i], points[i]))
+				# extract data at points - interpolation matrix is cached so only need to read values
+				# for the new timestep when the plot is updated
+				x = chainage[:]
+				requests.append((layer, [meshDatasetIndex], points))
+				if export is None and not isMax and not isMin:
+					self.crossSectionRequests.append((layer, types[-1], points))
 				
 				# add to overall data list
 				xAll.append(x)
-				yAll.append(y)
 				# legend label for multi lines
 				if export:
 					if featName is None:
@@ -378,23 +387,30 @@ class TuPlot2D():
 		# increment line count for multi select - for updateLongPlot function
 		if bypass:  # multi select click
 			self.multiLineSelectCount += 1
-
+		
+		# extract values - in the background if plotting in tuview
+		self.extractPlotData((1, '2d'), requests,
+		                     lambda values: self.drawCrossSectionFromMap(values, xAll, labels, types, **kwargs),
+		                     background=export is None and draw)
+		
+		return True
+	
+	def drawCrossSectionFromMap(self, values, xAll, labels, types, **kwargs):
+		"""
+		Plot or export extracted cross section values (see plotCrossSectionFromMap).
+		
+		:param values: list -> numpy.ndarray (1 x points) for each result type
+		:param xAll: list -> list float chainage
+		:param labels: list -> str
+		:param types: list -> str
+		:param kwargs: see plotCrossSectionFromMap
+		:return: bool -> True for successful, False for unsuccessful
+		"""
+		
+		yAll = [v[0].tolist() for v in values]
 		data = list(zip(xAll, yAll))
 		if data:
-			if export is None:  # normal plot i.e. in tuview
-				self.tuPlot.drawPlot(1, data, labels, types, draw=draw)
-			elif export == 'image':  # plot through drawPlot however instead of drawing, save figure
-				# unique output file name
-				outFile = '{0}{1}'.format(os.path.join(exportOut, name), exportFormat)
-				iterator = 1
-				while os.path.exists(outFile):
-					outFile = '{0}_{2}{1}'.format(os.path.join(exportOut, name), exportFormat, iterator)
-					iterator += 1
-				self.tuPlot.drawPlot(1, data, labels, types, export=outFile)
-			elif export == 'csv':  # export to csv, don't plot
-				self.tuPlot.exportCSV(1, data, labels, types, exportOut, name)
-			else:  # catch all other cases and just do normal, although should never be triggered
-				self.tuPlot.drawPlot(1, data, labels, types, draw=draw)
+			self.drawFromMap(1, data, labels, types, **kwargs)
 		
 		return True
 	
@@ -422,8 +438,6 @@ class TuPlot2D():
 		draw = kwargs['draw'] if 'draw' in kwargs.keys() else True
 		time = kwargs['time'] if 'time' in kwargs.keys() else None
 		showCurrentTime = kwargs['show_current_time'] if 'show_current_time' in kwargs.keys() else False
-		#meshRendered = kwargs['mesh_rendered'] if 'mesh_rendered' in kwargs.keys() else True
-		meshRendered = False  # finding values manually is a little quicker
 		resolution = kwargs['resolution'] if 'resolution' in kwargs.keys() else self.tuView.tuOptions.resolution
 		featName = kwargs['featName'] if 'featName' in kwargs else None
 		
@@ -436,7 +450,7 @@ class TuPlot2D():
 			else:
 				self.tuPlot.clearPlot(1, retain_1d=True, retain_2d=True)
 
-		points, chainages, directions = lineToPoints(feat, resolution, self.iface.mapCanvas().mapUnits())
+		points, chainages, directions = self.getLinePoints(feat, resolution)
 
 		if points is None or chainages is None or directions is None:
 			QMessageBox.critical(self.tuView, "TUFLOW Viewer", "Error Converting Cross Section From Long \ Lat\n"
@@ -446,45 +460,15 @@ class TuPlot2D():
 
 		# initialise plotting variables
 		xAll = []
-		yAll = []
+		requests = []  # (layer, lines, velocity mesh dataset indexes, depth kwargs) - flow is calculated once all requests are collected
 		labels = []
 		types = []
 		
-		# initialise progress bar
-		noFeatures = 1
-		noResults = len(activeMeshLayers)
-		noPoints = len(points)
-		noTimesteps = []
-		for layer in activeMeshLayers:
-			for resultType in results[layer.name()]:
-				if '_ts' not in resultType and '_lp' not in resultType and 'Maximum' not in resultType and \
-						'bed elevation' not in resultType.lower() and 'time' not in resultType and \
-						'dur' not in resultType:
-					tuResultsIndex = TuResultsIndex(layer.name(), resultType, None, False)
-					res = self.tuView.tuResults.getResult(tuResultsIndex)
-					if len(res) > 1:
-						noTimesteps.append(len(res))
-						break
-		maxProgress = 0
-		for ts in noTimesteps:
-			maxProgress += noFeatures * noPoints * ts
-		if maxProgress:
-			self.tuView.progressBar.setVisible(True)
-			self.tuView.progressBar.setRange(0, 100)
-			self.tuView.progressBar.setValue(0)
-			pComplete = 0
-			complete = 0
-		else:
+		if not activeMeshLayers:
 			return False
 		
 		# iterate through all selected results
-		for layer in activeMeshLayers:
-			if not meshRendered:
-				dp = layer.dataProvider()
-				mesh = QgsMesh()
-				dp.populateMesh(mesh)
-				si = QgsMeshSpatialIndex(mesh)
-
+		for k, layer in enumerate(activeMeshLayers):
 			# get velocity and either depth or water level
 			depth = None
 			velocity = None
@@ -533,179 +517,28 @@ class TuPlot2D():
 				bedTRI = TuResultsIndex(layer.name(), bedElevation, None, False)
 				bedRes = self.tuView.tuResults.getResult(bedTRI)
 
-			# iterate through result timesteps to get time series
+			# result timesteps
 			x = []
-			y = []
 			for key, velItem in velRes.items():
 				if self.tuView.tuOptions.timeUnits == 's':
 					x.append(velItem[0] / 3600)
 				else:
 					x.append(velItem[0])
-				
-				# iterate across line to get flow
-				sumFlow = 0
-				for i, point in enumerate(points):
-					if not meshRendered:
-						# pre-render means that we need to
-						# manually go get mesh face indexes
-						# then interpolate value from mesh vertices
-						if i == 0:
-							# first round - go get mesh faces that
-							# points fall in. If graphing for more than
-							# one result - don't need to do this step again
-							success = self.getFaceIndexes2(si, dp, points, mesh)
-							if not success:
-								return False
-							if len(self.faceIndexes) != len(points):
-								return False
-
-					chainage = chainages[i]
-					direction = directions[i]
-					qpoint = QgsPointXY(point)
-
-					# get depth - either directly or through water level and bed elevation
-					if depth is not None:
-						if meshRendered:
-							depthMag = layer.datasetValue(results[layer.name()][depth][key][-1],
-							                              qpoint).scalar()
-						else:
-							depthMag = self.preRenderDatasetValue(mesh, layer, results[layer.name()][depth][key][-1],
-							                                      self.faceIndexes[i], point)
-					else:
-						if meshRendered:
-							wlMag = layer.datasetValue(results[layer.name()][waterLevel][key][-1],
-							                           QgsPointXY(point)).scalar()
-							bedMag = layer.datasetValue(results[layer.name()][bedElevation][key][-1],
-							                            QgsPointXY(point)).scalar()
-						else:
-							wlMag = self.preRenderDatasetValue(mesh, layer, results[layer.name()][waterLevel][key][-1],
-							                                   self.faceIndexes[i], point)
-							bedMag = self.preRenderDatasetValue(mesh, layer, results[layer.name()][bedElevation][key][-1],
-							                                    self.faceIndexes[i], point)
-						depthMag = wlMag - bedMag
-					if qIsNaN(depthMag):
-						depthMag = 0
-						
-					if depthMag > 0:
-						# get velocity mag, x value, y value
-						if meshRendered:
-							velDataValue = layer.datasetValue(velItem[-1], qpoint)
-							
-							# velMag = layer.datasetValue(velItem[-1], qpoint).scalar()
-							velMag = velDataValue.scalar()
-
-							# velX = layer.datasetValue(velItem[-1], qpoint).x()
-							velX = velDataValue.x()
-
-							# velY = layer.datasetValue(velItem[-1], qpoint).y()
-							velY = velDataValue.y()
-						else:
-							velDataValue = self.preRenderDatasetValue(mesh, layer, velItem[-1], self.faceIndexes[i], point, value='vector')
-							
-							#velMag = self.preRenderDatasetValue(mesh, layer, velItem[-1], self.faceIndexes[i], point)
-							velMag = velDataValue[0]
-
-							velX = velDataValue[1]
-
-							velY = velDataValue[2]
-						if qIsNaN(velMag):
-							velMag = 0
-					else:
-						velMag = 0
-						velX = 0
-						velY = 0
-
-					# calculate flux across line segment
-					if i == 0:  # can't get flux at first point since there's no flow area
-						prevChainage = chainage
-						prevVelMag = velMag
-						prevVelX = velX
-						prevVelY = velY
-						prevDepthMag = depthMag
-						prevFlowDirection = None
-						complete += 1
-						pComplete = complete / maxProgress * 100
-						self.progress.setValue(pComplete)
-					
-					elif i > 0:
-						directionOpposite = direction + 180.0
-						if directionOpposite > 360.0:
-							directionOpposite -= 360.0
-
-						# get average values from current and previous values
-						avVelMag = (velMag + prevVelMag) / 2
-						if qIsNaN(prevVelX):
-							avVelX = velX
-						elif qIsNaN(velX):
-							avVelX = prevVelX
-						else:
-							avVelX = (velX + prevVelX) / 2
-						if qIsNaN(prevVelY):
-							avVelY = velY
-						elif qIsNaN(velY):
-							avVelY = prevVelY
-						else:
-							avVelY = (velY + prevVelY) / 2
-						avDepthMag = (depthMag + prevDepthMag) / 2
-
-						flowDirection = getDirection(None, None, x=avVelX, y=avVelY)
-						if flowDirection is None:
-							flowDirection = prevFlowDirection
-							if flowDirection is None:
-								prevChainage = chainage
-								prevVelMag = velMag
-								prevVelX = velX
-								prevVelY = velY
-								prevDepthMag = depthMag
-								prevFlowDirection = flowDirection
-								complete += 1
-								pComplete = complete / maxProgress * 100
-								self.progress.setValue(pComplete)
-								continue
-
-						if flowDirection == direction or flowDirection == directionOpposite:
-							flow = 0  # zero flow if flow is running parallel to line
-						else:
-							width = chainage - prevChainage
-							flow = avDepthMag * width * avVelMag
-							# determine direction
-							# need to consider what happens when line direction is > 180deg i.e. there is a
-							# spot where angle resets to zero when tracking round to the opposite direction
-							if direction > 180 and flowDirection < 180:
-								flowDirectionAdd = flowDirection + 360.0
-								if flowDirectionAdd > direction and flowDirection < directionOpposite:  # positive
-									sumFlow += flow
-								else:  # negative
-									sumFlow -= flow
-							elif direction > 180 and flowDirection > 180:
-								directionOppositeAdd = directionOpposite + 360.0
-								if flowDirection > direction and flowDirection < directionOppositeAdd:  # positive
-									sumFlow += flow
-								else:  # negativve
-									sumFlow -= flow
-							else:  # don't need to consider what happens when one of the direction exceed 360
-								if flowDirection > direction and flowDirection < directionOpposite:  # positive
-									sumFlow += flow
-								else:  # negative
-									sumFlow -= flow
-
-						prevChainage = chainage
-						prevVelMag = velMag
-						prevVelX = velX
-						prevVelY = velY
-						prevDepthMag = depthMag
-						prevFlowDirection = flowDirection
-						complete += 1
-						pComplete = complete / maxProgress * 100
-						self.tuView.progressBar.setValue(pComplete)
-						QgsApplication.processEvents()
-
-				# summed all flow, can append to timestep
-				y.append(sumFlow)
+			
+			# integrate flow across line for all timesteps at once
+			velocityResults = [item[-1] for item in velRes.values()]
+			if depth is not None:
+				depthResults = [results[layer.name()][depth][key][-1] for key in velRes]
+				requests.append((layer, [(points, chainages, directions)], velocityResults,
+				                 {'depth': depthResults}))
+			else:
+				wlResults = [results[layer.name()][waterLevel][key][-1] for key in velRes]
+				bedResults = [results[layer.name()][bedElevation][key][-1] for key in velRes]
+				requests.append((layer, [(points, chainages, directions)], velocityResults,
+				                 {'water_level': wlResults, 'bed_elevation': bedResults}))
 
 			# add to overall data list
 			xAll.append(x)
-			yAll.append(y)
 
 			if featName is None:  # rubberband layer
 				if bypass or self.tuView.cboSelectType.currentText() == 'From Map Multi':
@@ -720,185 +553,150 @@ class TuPlot2D():
 			labels.append(label)
 			types.append('2D Flow')
 		
-		self.tuView.progressBar.setVisible(False)
-		
-		data = list(zip(xAll, yAll))
-		self.tuPlot.drawPlot(0, data, labels, types, draw=draw, time=time, show_current_time=showCurrentTime)
+		# calculate flow - in the background if plotting in tuview
+		background = draw
+		if not background:
+			self.tuView.progressBar.setVisible(True)
+			self.tuView.progressBar.setRange(0, len(requests))
+			self.tuView.progressBar.setValue(0)
+		self.extractPlotData((0, 'flow'), requests,
+		                     lambda values: self.drawFlowFromMap(values, xAll, labels, types, **kwargs),
+		                     extract=self.extractFlow, background=background,
+		                     description='TUFLOW Viewer: Calculating Flow')
+		if not background:
+			self.tuView.progressBar.setVisible(False)
 
 		return True
 	
-	def getFaceIndexes2(self, si: QgsMeshSpatialIndex, dp: QgsMeshDataProvider, points: list, mesh: QgsMesh) -> bool:
+	def drawFlowFromMap(self, values, xAll, labels, types, **kwargs):
 		"""
+		Plot calculated flow (see plotFlowFromMap).
+		
+		:param values: list -> list float flow for each result
+		:param xAll: list -> list float time
+		:param labels: list -> str
+		:param types: list -> str
+		:param kwargs: see plotFlowFromMap
+		:return: bool -> True for successful, False for unsuccessful
+		"""
+		
+		draw = kwargs['draw'] if 'draw' in kwargs.keys() else True
+		time = kwargs['time'] if 'time' in kwargs.keys() else None
+		showCurrentTime = kwargs['show_current_time'] if 'show_current_time' in kwargs.keys() else False
 		
+		data = list(zip(xAll, values))
+		self.tuPlot.drawPlot(0, data, labels, types, draw=draw, time=time, show_current_time=showCurrentTime)
+		
+		return True
+	
+	def extractPlotData(self, channel, requests, callback, **kwargs):
+		"""
+		Extract plot data and pass it to callback. When plotting in tuview the data is extracted in a background
+		task so the GUI isn't blocked (see TuExtractionScheduler) and callback is called once the data is ready,
+		otherwise (e.g. export or animation) data is extracted and callback is called straight away.
 		
-		:param si:
-		:param dp:
-		:param points:
-		:return:
+		:param channel: tuple -> (int plotNo, str) e.g. (0, '2d')
+		:param requests: list -> tuple first item is QgsMeshLayer
+		:param callback: callable(list) -> called with list of extracted data for each request
+		:param kwargs: bool background -> extract data in background task
+		               callable extract -> function(task, requests) default is extractValues
+		               str description -> background task description
+		:return: bool -> True if extraction has started or finished, False if there is nothing to extract
 		"""
 		
-		if not points:
+		background = kwargs['background'] if 'background' in kwargs else False
+		extract = kwargs['extract'] if 'extract' in kwargs else self.extractValues
+		description = kwargs['description'] if 'description' in kwargs else 'TUFLOW Viewer: Extracting Plot Data'
+		
+		if not requests:
 			return False
-		points = [QgsPointXY(x) for x in points]
-		
-		self.faceIndexes.clear()
-		for p in points:
-			indexes = si.nearestNeighbor(p, 1)
-			if indexes:
-				if len(indexes) == 1:
-					self.faceIndexes.append(indexes[0])
-				else:
-					for ind in indexes:
-						f = self.meshToPolygon(mesh, mesh.face(ind))
-						if f.geometry().contains(p):
-							self.faceIndexes.append(ind)
-							break
-			
-		if len(self.faceIndexes) == len(points):
-			return True
+		
+		layers = []
+		for request in requests:
+			if request[0] not in layers:
+				layers.append(request[0])
+		
+		# mesh, locator and layer copies are prepared on the main thread - extracted here if they can't be
+		if background and self.tuResults.tuResults2D.prepareExtraction(layers):
+			self.tuPlot.extraction.submit(channel, lambda task: extract(task, requests), callback,
+			                              layers=layers, description=description)
 		else:
-			return False
+			callback(self.tuPlot.extraction.run(None, lambda task: extract(task, requests)))
+		
+		return True
 	
+	def extractValues(self, task, requests):
+		"""
+		Extract values at points for a number of results (see timeSeriesValues).
+		
+		:param task: QgsTask or None if not run in background
+		:param requests: list -> tuple (QgsMeshLayer, list QgsMeshDatasetIndex, list points)
+		:return: list -> numpy.ndarray (timesteps x points) for each request
+		"""
+		
+		values = []
+		for i, (layer, results, points) in enumerate(requests):
+			values.append(self.timeSeriesValues(layer, results, points, task=task))
+			if task is not None:
+				task.setProgress((i + 1) / len(requests) * 100.)
+		
+		return values
 	
-	def getFaceIndexes(self, mesh, layer, points):
+	def extractFlow(self, task, requests):
 		"""
-		Works out which mesh face each point falls in.
+		Calculate flow across a line for a number of results (see flowTimeSeries).
 		
-		:param mesh: QgsMesh
-		:param layer: QgsMeshLayer
-		:param points: list -> QgsPoint or QgsPointXY
-		:return: bool
+		:param task: QgsTask or None if not run in background
+		:param requests: list -> tuple (QgsMeshLayer, list lines, list QgsMeshDatasetIndex velocity, dict depth kwargs)
+		:return: list -> list float flow for each request
 		"""
-
-		# convert points to QgsPointsXY if not already
-		if not points:
-			return False
-		points = [QgsPointXY(x) for x in points]
-		# use first point as locator
-		reference = points[0]
-		
-		# manually populate pre-rendered mesh
-		dp = layer.dataProvider()
-		#mesh = QgsMesh()
-		#dp.populateMesh(mesh)
-		
-		# instead of looping through each mesh
-		# face try first and last mesh face
-		# then try middle and keep halfing until
-		# within tolerance
-		tolerance = 100
-		
-		# try first and last mesh face
-		lowerIndex = 0
-		upperIndex = mesh.faceCount() - 1
-		face1 = mesh.face(lowerIndex)
-		face2 = mesh.face(upperIndex)
-		m1 = self.faceMax(mesh, face1)  # max x and y
-		d1 = self.distance(m1, reference)  # distance
-		m2 = self.faceMax(mesh, face2)
-		d2 = self.distance(m2, reference)
-		if d1 < tolerance:
-			start = lowerIndex
-		elif d2 < tolerance:
-			start = upperIndex
-		else:
-			# else keep splitting index in half until
-			# within tolerance
-			count = 0
-			faceIndex = int((lowerIndex + upperIndex) / 2)
-			while 1:
-				face = mesh.face(faceIndex)
-				m = self.faceMax(mesh, face)
-				d = self.distance(m, reference)  # distance
-				if d < tolerance:
-					start = faceIndex
-					break
-				else:
-					# see which half is closest
-					try1 = int((upperIndex + faceIndex) / 2)
-					face1 = mesh.face(try1)
-					m1 = self.faceMax(mesh, face1)
-					d1 = self.distance(m1, reference)
-					try2 = int((lowerIndex + faceIndex) / 2)
-					face2 = mesh.face(try2)
-					m2 = self.faceMax(mesh, face2)
-					d2 = self.distance(m2, reference)
-					if d1 < d2:
-						lowerIndex = faceIndex
-						faceIndex = try1
-					else:
-						upperIndex = faceIndex
-						faceIndex = try2
-				if try1 == try2:  # converged to a solution that isn't within buffer which can happen
-					start = lowerIndex
-					break
-				count += 1
-				if count > 1000:  # clearly something has gone wrong and the solution has diverged
-					start = 0
-					break
-						
-		# now that we have a starting point
-		# progress outward in positive and negative
-		# direction until we have found all points
-		# first generate list of indexes to loop through
-		indexes = [x for x in range(start, mesh.faceCount())]  # indexes above start
-		revIndexes = [x for x in range(start - 1, -1, -1)]  # indexes below start
-		staggered = [x for x in range(1, len(indexes) * 2, 2)]  # insertion points for indexes below
-		# insert reverse indexes so that final list alternates between
-		# increasing and decreasing from start point
-		steps = min(len(indexes), len(revIndexes))
-		extraStep = False
-		if len(indexes) < len(revIndexes):
-			extraStep = True
-		for i in range(steps):
-			indexes.insert(staggered[i], revIndexes[i])
-		if extraStep:
-			indexes += revIndexes[i + 1:]
-		# loop through index list and check against point list
-		self.faceIndexes = []
-		faceIndexes = []
-		faceIndexOrder = []
-		pss = []
-		count = 0
-		for i in indexes:
-			count += 1
-			face = mesh.face(i)
-			ps, inds = self.faceToPoint(mesh, face, points, pss)
-			pss += ps
-			faceIndexOrder += inds
-			faceIndexes += [i] * len(inds)
-			if len(faceIndexes) == len(points):
-				break
-			if len(faceIndexes) > len(points):
-				return False  # something has gone wrong
-		self.faceIndexes = [-1 for x in faceIndexes]
-		# reorder to the same as the points
-		for i in range(len(faceIndexes)):
-			fi = faceIndexes[i]
-			pos = faceIndexOrder[i]
-			self.faceIndexes.pop(pos)
-			self.faceIndexes.insert(pos, fi)
-				
-		return count
 		
-	def faceMax(self, mesh, face):
+		flow = []
+		for i, (layer, lines, velocity, depth) in enumerate(requests):
+			flow.append(self.flowTimeSeries(layer, lines, velocity, task=task, **depth)[0].tolist())
+			self.extractionProgress(task, i + 1, len(requests))
+		
+		return flow
+	
+	def extractionProgress(self, task, value, maximum):
 		"""
-		Get x, y coords of face centroid
+		Update progress of task or if not run in background the tuview progress bar.
 		
-		:param face: QgsMeshFace
-		:return: QgsPointXY
+		:param task: QgsTask or None
+		:param value: int
+		:param maximum: int
+		:return: void
 		"""
 		
-		xmax, ymax = 0, 0
-		for i, v in enumerate(face):
-			if i == 0:
-				xmax = mesh.vertex(v).x()
-				ymax = mesh.vertex(v).y()
-			else:
-				xmax = max(xmax, mesh.vertex(v).x())
-				ymax = max(ymax, mesh.vertex(v).y())
-				
-		return QgsPointXY(xmax, ymax)
+		if task is not None:
+			task.setProgress(value / maximum * 100.)
+		elif self.tuView.progressBar.isVisible():
+			self.tuView.progressBar.setValue(value)
+			QgsApplication.processEvents()
+	
+	def getLinePoints(self, feat, resolution):
+		"""
+		Converts line to points (see lineToPoints). Recently used lines are cached so the line
+		doesn't need to be resampled each time the plot is updated.
+		
+		:param feat: QgsFeature
+		:param resolution: float
+		:return: list -> QgsPoint, list -> float chainages, list -> float directions
+		"""
+		
+		mapUnits = self.iface.mapCanvas().mapUnits()
+		key = (feat.geometry().asWkt(), resolution, mapUnits)
+		if key in self.linePoints:
+			self.linePoints.move_to_end(key)
+			return self.linePoints[key]
+		
+		points, chainages, directions = lineToPoints(feat, resolution, mapUnits)
+		if points is not None and chainages is not None and directions is not None:
+			self.linePoints[key] = (points, chainages, directions)
+			while len(self.linePoints) > self.maxLinePoints:
+				self.linePoints.popitem(last=False)
+			
+		return points, chainages, directions
 	
 	def distance(self, point1, point2):
 		"""
@@ -914,188 +712,126 @@ class TuPlot2D():
 		
 		return ( x ** 2 + y ** 2 ) ** 0.5
 	
-	def faceToPoint(self, mesh, face, points, pss):
+	def timeSeriesValues(self, layer, results, points, value='scalar', **kwargs):
 		"""
-		checks the mesh face against points and return a point if any fall within mesh face
+		Extract values at points for a number of timesteps. Mesh faces and vertex weightings are found once
+		for all points (and cached, see TuResults2D.getMeshSampler), values are then read for the required
+		vertexes (or faces) only and weighted for all timesteps at once.
 		
-		:param mesh: QgsMesh
-		:param face: QgsMeshFace
-		:param points: list -> QgsPointXY
-		:param pss: list -> QgsPointXY points already found a mesh face for - needed where 1D mesh overlaps 2D mesh
-		:return: QgsPointXY, int index in point list
-		"""
-		
-		# convert mesh face into polygon
-		f = self.meshToPolygon(mesh, face)
-		
-		# loop through points and check if point falls within mesh face
-		indexes = []
-		ps = []
-		for i, point in enumerate(points):
-			if point not in pss:
-				if f.geometry().contains(point):
-					indexes.append(i)
-					ps.append(point)
-				
-		return ps, indexes
+		:param layer: QgsMeshLayer
+		:param results: list -> QgsMeshDatasetIndex for each timestep
+		:param points: list -> QgsPointXY or QgsPoint
+		:param value: str -> 'scalar' or 'vector'
+		:param kwargs: QgsTask task -> raises TuExtractionCancelled if task is cancelled
+		               bool cache -> keep values read for each timestep with the sampler (see TuMeshSampler.addBlock).
+		                             Values already kept are always re-used.
+		:return: numpy.ndarray -> float (timesteps x points) nan where point is not within an active face.
+		         For 'vector' tuple of numpy.ndarray -> magnitude, x, y
+		"""
+		
+		task = kwargs['task'] if 'task' in kwargs else None
+		cache = kwargs['cache'] if 'cache' in kwargs else False
+		
+		getters = [lambda v: v.scalar()]
+		if value == 'vector':
+			getters += [lambda v: v.x(), lambda v: v.y()]
+		values = [np.full((len(results), len(points)), np.nan) for x in getters]
+		if not len(results) or not len(points):
+			return tuple(values) if value == 'vector' else values[0]
+		
+		dp = self.tuResults.tuResults2D.getExtractionProvider(layer)
+		onFaces = dp.datasetGroupMetadata(results[0]).dataType() == QgsMeshDatasetGroupMetadata.DataOnFaces
+		sampler = self.tuResults.tuResults2D.getMeshSampler(layer, points, onFaces)
+		if not sampler.cols.size:
+			return tuple(values) if value == 'vector' else values[0]
+		
+		# read values and active flags in a few large blocks and gather the required indexes from them
+		raw = np.zeros((len(getters), len(results), sampler.ids.size))
+		active = np.ones((len(results), sampler.faces.size), dtype=bool)
+		runs = self.readBlocks(sampler.ids)
+		faceRuns = self.readBlocks(sampler.faces)
+		for i, result in enumerate(results):
+			TuExtractionScheduler.checkCancelled(task)
+			key = (value, result.group(), result.dataset())
+			kept = sampler.getBlock(key)
+			if kept is not None:
+				raw[:,i], active[i] = kept
+				continue
+			for start, offsets in runs:
+				block = dp.datasetValues(result, int(sampler.ids[start]), offsets[-1] + 1)
+				dv = [block.value(k) for k in offsets]
+				for j, get in enumerate(getters):
+					raw[j,i,start:start+len(offsets)] = [get(v) for v in dv]
+			for start, offsets in faceRuns:
+				block = dp.areFacesActive(result, int(sampler.faces[start]), offsets[-1] + 1)
+				active[i,start:start+len(offsets)] = [block.active(k) for k in offsets]
+			if cache:
+				sampler.addBlock(key, raw[:,i].copy(), active[i].copy())
+		
+		values = [sampler.apply(raw[j], active) for j in range(len(getters))]
+		
+		return tuple(values) if value == 'vector' else values[0]
 	
-	def meshToPolygon(self, mesh, face):
+	def flowTimeSeries(self, layer, lines, velocity, **kwargs):
 		"""
-		converts a mesh to QgsFeature polygon
+		Calculate flow across lines for all timesteps. Values for all lines are extracted in one pass
+		(see timeSeriesValues) and flow is then integrated across each line (see TuFlowLine).
 		
-		:param mesh: QgsMesh
-		:param face: QgsMeshFace
-		:return: QgsFeature
+		:param layer: QgsMeshLayer
+		:param lines: list -> tuple (list points, list chainages, list directions) see lineToPoints
+		:param velocity: list -> QgsMeshDatasetIndex velocity vector for each timestep
+		:param kwargs: list depth -> QgsMeshDatasetIndex for each timestep. If not given water_level and
+		               bed_elevation are used.
+		               QgsTask task -> see timeSeriesValues
+		:return: list -> numpy.ndarray float flow for each line
 		"""
 		
-		# convert mesh face into polygon
-		w = 'POLYGON (('
-		for i, v in enumerate(face):
-			if i == 0:
-				w = '{0}{1} {2}'.format(w, mesh.vertex(v).x(), mesh.vertex(v).y())
-			else:
-				w = '{0}, {1} {2}'.format(w, mesh.vertex(v).x(), mesh.vertex(v).y())
-		w += '))'
-		f = QgsFeature()
-		f.setGeometry(QgsGeometry.fromWkt(w))
+		depth = kwargs['depth'] if 'depth' in kwargs else None
+		waterLevel = kwargs['water_level'] if 'water_level' in kwargs else None
+		bedElevation = kwargs['bed_elevation'] if 'bed_elevation' in kwargs else None
+		task = kwargs['task'] if 'task' in kwargs else None
 		
-		return f
-	
-	def preRenderDatasetValue(self, mesh, layer, result, faceIndex, point, value='scalar'):
-		"""
-		Interpolate result value from face index
+		flowLines = [TuFlowLine(chainages, directions) for points, chainages, directions in lines]
+		points = sum([list(x[0]) for x in lines], [])
 		
-		:param mesh: QgsMesh
-		:param layer: QgsMeshLayer
-		:param result: QgsMeshDatasetIndex
-		:param faceIndex: int face index
-		:param point: QgsPointXY or QgsPoint
-		:return: float value
-		"""
-
-		# convert point to QgsPointXY
-		point = QgsPointXY(point)
-
-		# manually populate pre-rendered mesh
-		dp = layer.dataProvider()
-
-		# get face
-		face = mesh.face(faceIndex)
-		if not dp.isFaceActive(result, faceIndex):
-			return np.nan
-
-		# double check point falls in mesh (it should!)
-		f = self.meshToPolygon(mesh, face)
-		if not f.geometry().contains(point):
-			return np.nan
-
-		# use Barycentric Coordinates and triangles to get interpolated value
-		# https://codeplea.com/triangular-interpolation
-		# so first get triangle
-		if len(face) == 4:
-			# split into triangles and determine which
-			# triangle point falls in
-			triangle1 = face[:3]
-			ftri1 = self.meshToPolygon(mesh, triangle1)
-			if ftri1.geometry().contains(point):
-				#tri = triangle1
-				tri = face[1::-1] + face[2:3]  # reorder so first 2 vertexes are one after the other e.g. [10, 11, x]
-			else:
-				triangle2 = face[2:] + face[0:1]
-				ftri2 = self.meshToPolygon(mesh, triangle2)
-				if ftri2.geometry().contains(point):
-					tri = triangle2
-				else:
-					return np.nan
-		elif len(face) == 3:
-			if face[1] + 1 == face[0]:
-				tri = face[1::-1] + face[2:3]  # reorder so first 2 vertexes are one after the other e.g. [10, 11, x]
-			else:
-				tri = face
+		velMag, velX, velY = self.timeSeriesValues(layer, velocity, points, value='vector', task=task)
+		if depth is not None:
+			depthValues = self.timeSeriesValues(layer, depth, points, task=task)
 		else:
-			return np.nan
-
-		# get traingle vertex weightings
-		try:
-			w = self.triangleVertexWeighting(mesh, tri, point)
-		except AssertionError:
-			return np.nan
-
-		# apply weightings
-		z = 0
-		x = 0
-		y = 0
-		#for i, v in enumerate(tri):
-		# re-did below func to call sequential vertexes in datasetValue(s) call so the number of times datasetValue is
-		# called is reduced as this seems to be the time conuming part
+			depthValues = self.timeSeriesValues(layer, waterLevel, points, task=task) - \
+			              self.timeSeriesValues(layer, bedElevation, points, task=task)
+		
+		flow = []
 		i = 0
-		for j in range(2):
-			v = tri[i]
-			if j == 0:
-				db = dp.datasetValues(result, v, 2)
-				for k in range(2):
-					if value == 'scalar':
-						z += db.value(k).scalar() * w[i]
-					elif value == 'vector':
-						res = db.value(k)
-						z += res.scalar() * w[i]
-						x += res.x() * w[i]
-						y += res.y() * w[i]
-					i += 1
-			else:
-				if value == 'scalar':
-					z += dp.datasetValue(result, v).scalar() * w[i]
-				elif value == 'x':
-					z += dp.datasetValue(result, v).x() * w[i]
-				elif value == 'y':
-					z += dp.datasetValue(result, v).y() * w[i]
-				elif value == 'vector':
-					res = dp.datasetValue(result, v)
-					z += res.scalar() * w[i]
-					x += res.x() * w[i]
-					y += res.y() * w[i]
-
-		if value == 'scalar':
-			return z
-		elif value == 'vector':
-			return (z, x, y)
+		for flowLine in flowLines:
+			j = i + len(flowLine)
+			flow.append(flowLine.flow(depthValues[:,i:j], velMag[:,i:j], velX[:,i:j], velY[:,i:j]))
+			i = j
 		
-	def triangleVertexWeighting(self, mesh, triangle, point):
+		return flow
+	
+	def readBlocks(self, ids):
 		"""
-		Use Barycentric Coordinates to get vertex weightings from triangles.
+		Groups sorted indexes into blocks that are each read with a single provider call. Each provider call has
+		an overhead so indexes less than readGap apart are read in the same block (the values in between are read
+		and ignored). If the indexes are spread over a range that isn't much more than readGap values for each
+		index (e.g. points scattered over most of the mesh) the whole range is read at once.
 		
-		:param mesh: QgsMesh
-		:param triangle: QgsMeshFace
-		:param point: QgsPointXY
-		:return: list -> float weightings
+		:param ids: numpy.ndarray -> int sorted unique indexes
+		:return: list -> tuple (int position of block start in ids, list -> int offset of each index from the
+		                 first index in the block)
 		"""
 		
-		v1x = mesh.vertex(triangle[0]).x()  # vertex 1 x coord
-		v1y = mesh.vertex(triangle[0]).y()  # vertex 1 y coord
-		v2x = mesh.vertex(triangle[1]).x()  # vertex 2 x
-		v2y = mesh.vertex(triangle[1]).y()  # vertex 2 y
-		v3x = mesh.vertex(triangle[2]).x()  # vertex 3 x
-		v3y = mesh.vertex(triangle[2]).y()  # vertex 3 y
-		px = point.x()  # point x
-		py = point.y()  # point y
-		
-		# weighting vertex 1
-		w1numer = (v2y - v3y) * (px - v3x) + (v3x - v2x) * (py - v3y)
-		w1denom = (v2y - v3y) * (v1x - v3x) + (v3x - v2x) * (v1y - v3y)
-		w1 = w1numer / w1denom
-		assert(w1 >= 0)
-		
-		# weighting vertex 2
-		w2numer = (v3y - v1y) * (px - v3x) + (v1x - v3x) * (py - v3y)
-		w2denom = (v2y - v3y) * (v1x - v3x) + (v3x - v2x) * (v1y - v3y)
-		w2 = w2numer / w2denom
-		assert(w2 >= 0)
-		
-		# weighting vertex 3
-		w3 = 1.0 - w1 - w2
-		assert(w3 >= 0)
-		
-		return [w1, w2, w3]
+		if not ids.size:
+			return []
+		
+		if ids[-1] - ids[0] + 1 <= ids.size * self.readGap:
+			starts = np.array([0])
+		else:
+			starts = np.concatenate(([0], np.flatnonzero(np.diff(ids) > self.readGap) + 1))
+		ends = np.concatenate((starts[1:], [ids.size]))
+		
+		return [(int(s), (ids[s:e] - ids[s]).tolist()) for s, e in zip(starts, ends)]
 	
 	def resetMultiPointCount(self):
 		"""
@@ -4,6 +4,7 @@ from PyQt5.QtCore import *
 from qgis.core import QgsPoint, QgsPointXY, QgsGeometry, Qgis
 from qgis.gui import QgsVertexMarker, QgsRubberBand
 from tuflow.tuflowqgis_library import tuflowqgis_find_layer
+from tuflow.tuflowqgis_tuviewer.tuflowqgis_turesultsindex import TuResultTimesteps
 
 
 class TuProject():
@@ -367,7 +368,7 @@ class TuProject():
 				# rtype -> 'Depth' or 'point_ts'
 				for rtype, timeDict in rtypeDict.items():
 					if '_ts' not in rtype and '_lp' not in rtype:
-						if type(timeDict) is dict:  # make sure we're looking at 2d results
+						if isinstance(timeDict, (dict, TuResultTimesteps)):  # make sure we're looking at 2d results
 							for time, items in timeDict.items():  # just do first timestep
 								# time -> '0.0000'
 								# items -> ( timestep, type, QgsMeshDatasetIndex )
@@ -405,7 +406,7 @@ class TuProject():
 				layer = tuflowqgis_find_layer(result)
 				for rtype, timeDict in rtypeDict.items():
 					if '_ts' not in rtype and '_lp' not in rtype:
-						if type(timeDict) is dict:  # make sure we're looking at 2d results
+						if isinstance(timeDict, (dict, TuResultTimesteps)):  # make sure we're looking at 2d results
 							for time, items in timeDict.items():  # just do first timestep
 								# time -> '0.0000'
 								# items -> ( timestep, type, QgsMeshDatasetIndex )
@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta
+import numpy as np
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
 from PyQt5 import QtGui
@@ -7,6 +8,7 @@ from PyQt5.QtWidgets import *
 import tuflowqgis_turesults1d
 import tuflowqgis_turesults2d
 from tuflow.dataset_view import DataSetModel
+from tuflow.tuflowqgis_tuviewer.tuflowqgis_turesultsindex import TuResultTimesteps
 from tuflow.tuflowqgis_library import tuflowqgis_find_layer, convertFormattedTimeToTime, convertTimeToFormattedTime, \
 	findAllMeshLyrs, roundSeconds
 
@@ -22,6 +24,7 @@ class TuResults():
 			self.tuView = TuView
 			self.iface = TuView.iface
 			self.results = {}  # dict - e.g. { M01_5m_001: { depth: { '0.000000': ( timestep, type, QgsMeshDatasetIndex )}, point_ts: ( types, timesteps ) } }
+			self.timeIndex = {}  # dict - e.g. { ( M01_5m_001, depth ): { 'timesteps': dict, 'times': numpy.ndarray sorted times, 'keys': [ '0.000000' ] } }
 			self.cboTime2timekey = {}
 			self.timekey2time = {}  # e.g. {'1.833333': 1.8333333}
 			self.timekey2date = {}  # e.g. {'1.833333': '01/01/2000 09:00:00'}
@@ -81,18 +84,27 @@ class TuResults():
 		
 		self.activeTime = None
 		if i != -1:
-			self.activeTime = self.tuView.cboTime.currentText()
-			if not self.tuView.tuOptions.xAxisDates:
-				#unit = self.tuView.tuOptions.timeUnits
-				#self.activeTime = '{0:.6f}'.format(convertFormattedTimeToTime(self.activeTime, unit=unit))
-				if self.activeTime in self.cboTime2timekey:
-					self.activeTime = self.cboTime2timekey[self.activeTime]
-				else:
-					unit = self.tuView.tuOptions.timeUnits
-					self.activeTime = '{0:.6f}'.format(convertFormattedTimeToTime(self.activeTime, unit=unit))
+			self.activeTime = self.getTimeKey(self.tuView.cboTime.currentText())
+	
+	def getTimeKey(self, text):
+		"""
+		Converts time as displayed in the time combobox to time key.
+		
+		:param text: str -> formatted time or date e.g. '01:00:00'
+		:return: str time key e.g. '1.000000'
+		"""
+		
+		if not self.tuView.tuOptions.xAxisDates:
+			#unit = self.tuView.tuOptions.timeUnits
+			#self.activeTime = '{0:.6f}'.format(convertFormattedTimeToTime(self.activeTime, unit=unit))
+			if text in self.cboTime2timekey:
+				return self.cboTime2timekey[text]
 			else:
-				self.activeTime = datetime.strptime(self.activeTime, self.dateFormat)
-				self.activeTime = self.date2timekey[self.activeTime]
+				unit = self.tuView.tuOptions.timeUnits
+				return '{0:.6f}'.format(convertFormattedTimeToTime(text, unit=unit))
+		else:
+			date = datetime.strptime(text, self.dateFormat)
+			return self.date2timekey[date]
 	
 	def resetResultTypes(self):
 		"""
@@ -454,6 +466,51 @@ class TuResults():
 		
 		return True
 	
+	def extendTimeSteps(self, timesteps):
+		"""
+		Appends timesteps later than the last time in the time combobox without resetting the interface e.g.
+		when following a simulation that is still running.
+		
+		:param timesteps: list -> float time (hr)
+		:return: bool -> True for successful, False for unsuccessful
+		"""
+		
+		cboTime = self.tuView.cboTime  # QComboBox
+		if not cboTime.count():
+			return self.updateResultTypes()
+		
+		# last time currently in combobox
+		lastText = cboTime.itemText(cboTime.count() - 1)
+		if not self.tuView.tuOptions.xAxisDates:
+			if lastText in self.cboTime2timekey:
+				last = float(self.cboTime2timekey[lastText])
+			else:
+				last = convertFormattedTimeToTime(lastText, unit=self.tuView.tuOptions.timeUnits)
+		else:
+			last = self.date2time[datetime.strptime(lastText, self.dateFormat)]
+		timesteps = self.joinResultTypes([x for x in timesteps if float('{0:.6f}'.format(x)) > last], type='time')
+		if not timesteps:
+			return True
+		
+		if not self.tuView.tuOptions.xAxisDates:
+			unit = self.tuView.tuOptions.timeUnits
+			short = (unit == 'h' and timesteps[-1] < 100) or (unit == 's' and timesteps[-1] / 3600 < 100)
+			lastShort = (unit == 'h' and last < 100) or (unit == 's' and last / 3600 < 100)
+			if short != lastShort:  # time format changes - rebuild
+				return self.updateResultTypes()
+			for x in timesteps:
+				if short:
+					timeformatted = convertTimeToFormattedTime(x, unit=unit)
+				else:
+					timeformatted = convertTimeToFormattedTime(x, unit=unit, hour_padding=3)
+				cboTime.addItem(timeformatted)
+				self.cboTime2timekey[timeformatted] = '{0:.6f}'.format(x)
+		else:
+			cboTime.addItems([self._dateFormat.format(self.time2date[x]) for x in timesteps])
+		self.tuView.sliderTime.setMaximum(cboTime.count() - 1)
+		
+		return True
+	
 	def updateActiveResultTypes(self, resultIndex, geomType=None, skip_already_selected=False):
 		"""
 		Updates the active results based on the selected result types in DataSetView
@@ -710,28 +767,56 @@ class TuResults():
 		:return: str -> next lower time
 		"""
 		
-		timePrev = None
-		higher = False
-		for i, (timekey, time) in enumerate(self.results[key1][key2].items()):
-			# timekey -> str e.g. '1.0000'
-			# time -> dict e.g. ( timestep, type, QgsMeshDatasetIndex )}
-			
-			if i == 0:
-				# if first time step is not lower than requested then return None because there is no next lower
-				if time[0] < float(key3):
-					timePrev = timekey
-				else:
-					return None
-			else:
-				if time[0] > float(key3):
-					higher = True  # found point where overlap occurs
-				else:
-					timePrev = timekey
-			if higher:
-				return timePrev
+		times, timekeys = self.getTimeIndex(key1, key2)
+		if not times.size or times[0] >= float(key3):
+			# if first time step is not lower than requested then return None because there is no next lower
+			return None
+		
+		i = int(np.searchsorted(times, float(key3), side='right')) - 1
+		
+		return timekeys[i]
+	
+	def getTimeIndex(self, key1, key2):
+		"""
+		Returns the sorted times and matching time keys of a result type so times can be looked up with a
+		binary search rather than iterating through the result dictionary.
+		
+		TuResultTimesteps keeps its own index which is reset whenever it is modified. For result types stored
+		as a plain dictionary the index is kept here and rebuilt if the dictionary is replaced. A dictionary
+		modified in place must be followed by clearTimeIndex (see TuResults2D.alignFirstTimestepValues).
+
+		:param key1: str -> result name e.g. M01_5m_001
+		:param key2: str -> result type e.g. 'depth'
+		:return: numpy.ndarray -> float sorted times, list -> str time keys e.g. '1.000000'
+		"""
 		
-		# return time prev if higher is never found
-		return timePrev
+		timesteps = self.results[key1][key2]  # dict e.g. { '1.000000': ( timestep, type, QgsMeshDatasetIndex ) }
+		if isinstance(timesteps, TuResultTimesteps):
+			return timesteps.timeIndex()
+		
+		index = self.timeIndex.get((key1, key2))
+		if index is None or index['timesteps'] is not timesteps:
+			timekeys = list(timesteps.keys())
+			times = np.array([timesteps[x][0] for x in timekeys], dtype=float)
+			order = np.argsort(times, kind='stable')
+			index = {'timesteps': timesteps, 'times': times[order], 'keys': [timekeys[x] for x in order]}
+			self.timeIndex[(key1, key2)] = index
+		
+		return index['times'], index['keys']
+	
+	def clearTimeIndex(self, result=None):
+		"""
+		Removes time indexes e.g. when results are removed or timesteps are modified.
+
+		:param result: str -> result name e.g. M01_5m_001. If None all time indexes are removed.
+		:return: void
+		"""
+		
+		if result is None:
+			self.timeIndex.clear()
+		else:
+			for key in [x for x in self.timeIndex if x[0] == result]:
+				del self.timeIndex[key]
 	
 	def isMax(self, typ):
 		"""
@@ -783,6 +868,7 @@ class TuResults():
 			if res in results.keys():
 				# remove from indexed results
 				del results[res]
+				self.clearTimeIndex(res)
 				if res in results2d:
 					del results2d[res]
 				if res in results1d:
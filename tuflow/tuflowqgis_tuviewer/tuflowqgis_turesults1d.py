@@ -1,4 +1,5 @@
 import os
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
@@ -30,6 +31,14 @@ class TuResults1D():
 		self.regionTS = []
 		self.activeType = -1
 		self.typesLP = []  # list -> str selected 1D long plot result types
+		self.followed = []  # list -> str result names followed while the simulation is running
+		self.followTimer = None  # QTimer
+		self.followInterval = 5  # seconds
+		self.maxThreads = min(8, os.cpu_count() or 1)  # threads used to load results
+		self.executor = None  # ThreadPoolExecutor
+		self.preloading = []  # list -> Future result types being read in the background
+		self.preloadingResults = []  # list -> TUFLOW_results.ResData results being read in the background
+		self.preloadTimer = None  # QTimer
 	
 	def importResults(self, inFilePaths):
 		"""
@@ -42,6 +51,10 @@ class TuResults1D():
 		openResults = self.tuView.OpenResults  # QListWidget
 		results = self.tuView.tuResults.results  # dict of indexed results
 		
+		# load tpc files in parallel
+		loaded = self.loadTpcs([x for x in inFilePaths if os.path.splitext(x)[1].upper() == '.TPC'])
+		resList = []
+		
 		for filePath in inFilePaths:
 			
 			# parse file names, ext, directory
@@ -55,11 +68,11 @@ class TuResults1D():
 			
 			# post 2013 results
 			elif ext.upper() == '.TPC':
-				res = TuflowResults.ResData()
-				error, message = res.Load(filePath)
+				res, error, message = loaded[filePath]
 				if error:
 					QMessageBox.critical(self.tuView, "TUFLOW Viewer", message)
 					return False
+				resList.append(res)
 				
 			else:
 				return False
@@ -76,8 +89,137 @@ class TuResults1D():
 				openResults.addItem(res.displayname)  # add to widget
 			k = openResults.findItems(res.displayname, Qt.MatchRecursive)[0]
 			k.setSelected(True)
+		
+		# read result values in the background
+		self.preloadResults(resList)
 			
 		return True
+	
+	def getExecutor(self):
+		"""
+		Returns the thread pool used to load results.
+		
+		:return: ThreadPoolExecutor
+		"""
+		
+		if self.executor is None:
+			self.executor = ThreadPoolExecutor(max_workers=self.maxThreads)
+		
+		return self.executor
+	
+	def loadTpcs(self, inFilePaths):
+		"""
+		Loads tpc files in parallel. NetCDF results are loaded in the main thread as the netcdf library is not
+		thread safe. Progress is shown in the TuView progress bar and the interface is kept responsive.
+		
+		:param inFilePaths: list -> str tpc file paths
+		:return: dict -> str file path: ( TUFLOW_results.ResData, bool error, str message )
+		"""
+		
+		loaded = {}
+		futures = {}
+		for filePath in inFilePaths:
+			res = TuflowResults.ResData()
+			res.filename = filePath
+			res.compact = self.tuView.tuOptions.compact1D
+			if res.getResFileFormat() == "NC":
+				error, message = res.Load(filePath)
+				loaded[filePath] = (res, error, message)
+			else:
+				futures[self.getExecutor().submit(res.Load, filePath)] = (filePath, res)
+		
+		self.waitForTasks(list(futures.keys()))
+		for future, (filePath, res) in futures.items():
+			try:
+				error, message = future.result()
+			except Exception as e:
+				error, message = True, 'ERROR - Unexpected error loading: {0}\n{1}'.format(filePath, e)
+			loaded[filePath] = (res, error, message)
+		
+		return loaded
+	
+	def waitForTasks(self, futures):
+		"""
+		Waits for tasks to finish while updating the progress bar and processing ui events.
+		
+		:param futures: list -> Future
+		:return: void
+		"""
+		
+		if not futures:
+			return
+		
+		self.tuView.progressBar.setVisible(True)
+		self.tuView.progressBar.setRange(0, 100)
+		self.tuView.progressBar.setValue(0)
+		done, notDone = wait(futures, timeout=0)
+		while notDone:
+			done, notDone = wait(futures, timeout=0.05)
+			self.tuView.progressBar.setValue(int(len(done) / len(futures) * 100))
+			QgsApplication.processEvents()
+		self.tuView.progressBar.setVisible(False)
+	
+	def preloadResults(self, resList):
+		"""
+		Reads the values of the selected time series and long plot result types in the background. Progress
+		is shown in the TuView progress bar. Accessing a result type before it has been read waits for it to
+		finish. Result types that are not selected are read when they are first used.
+		
+		:param resList: list -> TUFLOW_results.ResData
+		:return: void
+		"""
+		
+		for res in resList:
+			if hasattr(res, 'preload'):
+				futures = res.preload(self.getExecutor(), self.typesTS, self.typesLP)
+				if futures:
+					self.preloading.extend(futures)
+					self.preloadingResults.append(res)
+		if not self.preloading:
+			return
+		
+		self.tuView.progressBar.setVisible(True)
+		self.tuView.progressBar.setRange(0, 100)
+		if self.preloadTimer is None:
+			self.preloadTimer = QTimer()
+			self.preloadTimer.setInterval(100)
+			self.preloadTimer.setSingleShot(False)
+			self.preloadTimer.timeout.connect(self.updatePreloadProgress)
+			self.preloadTimer.start()
+	
+	def updatePreloadProgress(self):
+		"""
+		Updates the progress bar while result values are read in the background.
+		
+		:return: void
+		"""
+		
+		done = [x for x in self.preloading if x.done()]
+		self.tuView.progressBar.setValue(int(len(done) / len(self.preloading) * 100))
+		if len(done) == len(self.preloading):
+			self.preloading.clear()
+			self.preloadTimer.stop()
+			self.preloadTimer = None
+			self.tuView.progressBar.setVisible(False)
+			for res in self.preloadingResults:
+				self.logMemoryFootprint(res)
+			self.preloadingResults.clear()
+	
+	def logMemoryFootprint(self, res):
+		"""
+		Writes the memory used by the loaded time series values of a result to the QGIS message log.
+		
+		:param res: TUFLOW_results.ResData
+		:return: void
+		"""
+		
+		footprint = res.memoryFootprint()
+		types = ', '.join(['{0} {1:.1f} MB'.format(k, v / 1024. ** 2) for k, v in footprint.items()
+		                   if k != 'Total' and v])
+		message = '{0}: time series values use {1:.1f} MB{2}{3}'.format(
+			res.displayname, footprint['Total'] / 1024. ** 2, ' (compact)' if res.compact else '',
+			' - {0}'.format(types) if types else '')
+		QgsMessageLog.logMessage(message, 'TUFLOW Viewer', Qgis.Info)
 		
 	def openGis(self, tpc):
 		"""
@@ -311,7 +453,11 @@ class TuResults1D():
 				if len(results[res]) == 0:
 					del results[res]
 							
+			if res in self.followed:
+				self.setFollow([res], False)
 			if res in self.results1d:
+				if hasattr(self.results1d[res], 'close'):
+					self.results1d[res].close()  # release netcdf file handle
 				del self.results1d[res]
 			
 			for i in range(self.tuView.OpenResults.count()):
@@ -320,4 +466,68 @@ class TuResults1D():
 					if res not in results:
 						self.tuView.OpenResults.takeItem(i)
 		
-		return True
\ No newline at end of file
+		return True
+	
+	def setFollow(self, resList, follow):
+		"""
+		Turns follow mode on or off for results from simulations that are still running. Followed results are
+		checked on a timer and any new timesteps written to the time series files are appended.
+		
+		:param resList: list -> str result name e.g. M01_5m_001
+		:param follow: bool
+		:return: bool -> True for successful, False for unsuccessful
+		"""
+		
+		for res in resList:
+			if res not in self.results1d or not hasattr(self.results1d[res], 'followUpdate'):
+				continue
+			if follow and res not in self.followed:
+				self.followed.append(res)
+			elif not follow and res in self.followed:
+				self.followed.remove(res)
+		
+		if self.followed and self.followTimer is None:
+			self.followTimer = QTimer()
+			self.followTimer.setInterval(self.followInterval * 1000)  # sec to ms
+			self.followTimer.setSingleShot(False)
+			self.followTimer.timeout.connect(self.followUpdate)
+			self.followTimer.start()
+		elif not self.followed and self.followTimer is not None:
+			self.followTimer.stop()
+			self.followTimer = None
+		
+		return True
+	
+	def followUpdate(self):
+		"""
+		Appends new timesteps from followed results and updates the time combobox and plot.
+		
+		:return: bool -> True if there were new timesteps
+		"""
+		
+		results = self.tuView.tuResults.results
+		timesteps = []
+		for res in self.followed[:]:
+			if res not in self.results1d:
+				self.followed.remove(res)
+				continue
+			result = self.results1d[res]
+			if not result.followUpdate():
+				continue
+			
+			# update indexed timesteps
+			for resultType, metadata in results[res].items():
+				if '_ts' in resultType or '_lp' in resultType:
+					results[res][resultType] = (metadata[0], result.times)
+			self.getResultMetaData(result)
+			timesteps.extend(result.times)
+		
+		if not self.followed:
+			self.setFollow([], False)
+		if not timesteps:
+			return False
+		
+		self.tuView.tuResults.extendTimeSteps(timesteps)
+		self.tuView.tuPlot.updateCurrentPlot(self.tuView.tabWidget.currentIndex(), update='1d only')
+		
+		return True
@@ -1,5 +1,6 @@
 import os
 import sys
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
@@ -7,7 +8,9 @@ from PyQt5 import QtGui
 from qgis.core import *
 from PyQt5.QtWidgets import *
 from qgis.PyQt.QtXml import QDomDocument
-from tuflow.tuflowqgis_tuviewer.tuflowqgis_turesultsindex import TuResultsIndex
+from tuflow.tuflowqgis_tuviewer.tuflowqgis_turesultsindex import TuResultsIndex, TuResultTimesteps
+from tuflow.tuflowqgis_tuviewer.tuflowqgis_tumeshlocator import TuMeshLocator, TuMeshSampler
+from tuflow.tuflowqgis_tuviewer.tuflowqgis_tuextraction import TuExtractionScheduler
 from tuflow.tuflowqgis_library import tuflowqgis_find_layer, findAllMeshLyrs, loadSetting, roundSeconds, \
 	getPropertiesFrom2dm
 
@@ -31,6 +34,8 @@ class TuResults2D():
 		self.activeScalar, self.activeVector = None, None
 		self.meshProperties = {}
 		self.results2d = {}  # holds 2d properties e.g. 'path'
+		self.meshCache = {}  # layer id: dict - populated QgsMesh and derived objects e.g. 'mesh', 'locator'
+		self.maxMeshSamplers = 32  # number of interpolation matrices cached per layer
 	
 	def importResults(self, inFileNames):
 		"""
@@ -328,11 +333,8 @@ class TuResults2D():
 				#	mdGroupName = mdGroup.name()
 				#maxResultTypes.append(rt)
 				
-				# initiate in results dict
-				results[name][mdGroupName] = {}  # add result type to results dictionary
-				
-				# add max result as time -99999
-				results[name][mdGroupName]['-99999'] = (-99999, type, QgsMeshDatasetIndex(i, 0))
+				# initiate in results dict - add max result as time -99999
+				results[name][mdGroupName] = TuResultTimesteps([-99999], type, i, keys=['-99999'])
 				timekey2time['-99999'] = -99999
 				timekey2date['-99999'] = -99999
 				time2date['-99999'] = -99999
@@ -381,11 +383,8 @@ class TuResults2D():
 				# add to min result type list
 				minResultTypes.append(mdGroupName)
 
-				# initiate in results dict
-				results[name][mdGroupName] = {}  # add result type to results dictionary
-
-				# add min result as time 99999
-				results[name][mdGroupName]['99999'] = (9999, type, QgsMeshDatasetIndex(i, 0))
+				# initiate in results dict - add min result as time 99999
+				results[name][mdGroupName] = TuResultTimesteps([9999], type, i, keys=['99999'])
 				timekey2time['99999'] = 99999
 				timekey2date['99999'] = 99999
 				time2date['99999'] = 99999
@@ -453,6 +452,7 @@ class TuResults2D():
 					if vectorProperties:
 						self.applyVectorRenderSettings(layer, i, vectorProperties)
 
+				times, indexes = [], []  # temporal timesteps - added to results dict after all timesteps are read
 				for j in range(dp.datasetCount(i)):
 					md = dp.datasetMetadata(QgsMeshDatasetIndex(i, j))  # metadata for individual timestep
 					if md.time() == 900001.0 and self.tuView.tuOptions.timeUnits == 'h':  # time of peak h
@@ -477,35 +477,31 @@ class TuResults2D():
 						value = md.time() - 200000.0
 						results[name]['Time Exc Cutoff {0}'.format(value)] = {'0.000000': (0, type, QgsMeshDatasetIndex(i, j))}
 					else:  # not a special time
-						results[name][mdGroupName]['{0:.6f}'.format(md.time())] = \
-							(md.time(), type, QgsMeshDatasetIndex(i, j))  # add result index to results dict
-						timekey2time['{0:.6f}'.format(md.time())] = md.time()
-						if self.tuView.tuOptions.timeUnits == 's':
-							date = zeroTime + timedelta(seconds=md.time())
-						else:
-							try:
-								date = zeroTime + timedelta(hours=md.time())
-							except OverflowError:
-								date = zeroTime + timedelta(seconds=md.time())
-						date = roundSeconds(date)
-						timekey2date['{0:.6f}'.format(md.time())] = date
-						time2date[md.time()] = date
-						date2timekey[date] = '{0:.6f}'.format(md.time())
-						date2time[date] = md.time()
-						if ext.upper() == '.DAT' and mdGroup.isVector():  # need to add result type again as vector type
-							md = dp.datasetMetadata(QgsMeshDatasetIndex(i, j))  # metadata for individual timestep
-							results[name]['{0} Vector'.format(mdGroupName)]['{0:.6f}'.format(md.time())] = \
-								(md.time(), 2, QgsMeshDatasetIndex(i, j))  # add result index to results dict
-							timekey2time['{0:.6f}'.format(md.time())] = md.time()
+						times.append(md.time())
+						indexes.append(j)
+						
+						# dates only need to be worked out once for each unique time
+						if md.time() not in time2date:
+							timekey = '{0:.6f}'.format(md.time())
+							timekey2time[timekey] = md.time()
 							if self.tuView.tuOptions.timeUnits == 's':
 								date = zeroTime + timedelta(seconds=md.time())
 							else:
-								date = zeroTime + timedelta(hours=md.time())
+								try:
+									date = zeroTime + timedelta(hours=md.time())
+								except OverflowError:
+									date = zeroTime + timedelta(seconds=md.time())
 							date = roundSeconds(date)
-							timekey2date['{0:.6f}'.format(md.time())] = date
+							timekey2date[timekey] = date
 							time2date[md.time()] = date
-							date2timekey[date] = '{0:.6f}'.format(md.time())
+							date2timekey[date] = timekey
 							date2time[date] = md.time()
+				
+				# add result indexes to results dict
+				if mdGroupName in results[name]:
+					results[name][mdGroupName] = TuResultTimesteps(times, type, i, indexes)
+					if ext.upper() == '.DAT' and mdGroup.isVector():  # need to add result type again as vector type
+						results[name]['{0} Vector'.format(mdGroupName)] = TuResultTimesteps(times, 2, i, indexes)
 							
 		# align first timestep values
 		# e.g. if first temporal timestep is 1 hr
@@ -636,9 +632,185 @@ class TuResults2D():
 							
 				if res in self.results2d:
 					del self.results2d[res]
+				self.tuView.tuResults.clearTimeIndex(res)
+					
+			layer = tuflowqgis_find_layer(res)
+			if layer is not None:
+				self.clearMeshCache(layer.id())
 						
 		return True
 	
+	def meshSourceStamp(self, layer):
+		"""
+		Returns the modified time of the mesh file so cached mesh topology can be checked against the file.
+		
+		:param layer: QgsMeshLayer
+		:return: float mtime or None if the mesh file can't be found
+		"""
+		
+		source = layer.source()
+		if not os.path.exists(source):
+			# source can be in the form driver:"path":mesh
+			parts = source.split('"')
+			source = parts[1] if len(parts) > 2 else source
+		try:
+			return os.path.getmtime(source)
+		except OSError:
+			return None
+	
+	def getMeshCache(self, layer):
+		"""
+		Returns the cached topology for the layer. The mesh is populated the first time it is required
+		and re-used until the layer is removed or the mesh file is modified.
+		
+		The mesh is only populated on the main thread. Background tasks use the cache prepared before they were
+		submitted (see prepareExtraction).
+		
+		:param layer: QgsMeshLayer
+		:return: dict -> 'mesh': QgsMesh, 'mtime': float, 'locator': TuMeshLocator, 'samplers': OrderedDict,
+		                 'worker': QgsMeshLayer or None (see getWorkerLayer)
+		"""
+		
+		if not TuExtractionScheduler.isMainThread():
+			cache = self.meshCache.get(layer.id())
+			if cache is None:
+				raise RuntimeError('Mesh not prepared for background extraction: {0}'.format(layer.name()))
+			return cache
+		
+		mtime = self.meshSourceStamp(layer)
+		cache = self.meshCache.get(layer.id())
+		if cache is None or cache['mtime'] != mtime:
+			mesh = QgsMesh()
+			layer.dataProvider().populateMesh(mesh)
+			cache = {'mesh': mesh, 'mtime': mtime}
+			self.meshCache[layer.id()] = cache
+			
+		return cache
+	
+	def getMesh(self, layer):
+		"""
+		Returns the populated mesh for the layer.
+		
+		:param layer: QgsMeshLayer
+		:return: QgsMesh
+		"""
+		
+		return self.getMeshCache(layer)['mesh']
+	
+	def getMeshLocator(self, layer):
+		"""
+		Returns the mesh locator (face index and vertex arrays) for the layer.
+		
+		:param layer: QgsMeshLayer
+		:return: TuMeshLocator
+		"""
+		
+		cache = self.getMeshCache(layer)
+		if 'locator' not in cache:
+			cache['locator'] = TuMeshLocator.fromMesh(cache['mesh'])
+			
+		return cache['locator']
+	
+	def getMeshSampler(self, layer, points, onFaces=False):
+		"""
+		Returns the interpolation matrix for the points (e.g. cross section line at a given resolution).
+		Recently used samplers are cached so updating a plot for a new timestep doesn't need to
+		locate the points again.
+		
+		:param layer: QgsMeshLayer
+		:param points: list -> QgsPointXY or QgsPoint
+		:param onFaces: bool -> dataset values are stored on faces
+		:return: TuMeshSampler
+		"""
+		
+		cache = self.getMeshCache(layer)
+		if 'samplers' not in cache:
+			cache['samplers'] = OrderedDict()
+		samplers = cache['samplers']
+		
+		xy = TuMeshLocator.pointArray(points)
+		key = (onFaces, xy.shape[0], xy.tobytes())
+		if key in samplers:
+			samplers.move_to_end(key)
+		else:
+			samplers[key] = TuMeshSampler(self.getMeshLocator(layer), xy, onFaces)
+			while len(samplers) > self.maxMeshSamplers:
+				samplers.popitem(last=False)
+		
+		return samplers[key]
+	
+	def getWorkerLayer(self, layer):
+		"""
+		Returns a copy of the layer (same mesh and datasets, not added to the project) for background tasks to
+		read values from so they never use the data provider the map is being rendered from. The copy is owned by
+		the mesh cache so it can't be deleted while a task is using it (see TuView.layersRemoved). Created on the
+		main thread the first time it is required.
+		
+		:param layer: QgsMeshLayer
+		:return: QgsMeshLayer or None if the layer can't be copied
+		"""
+		
+		cache = self.getMeshCache(layer)
+		if 'worker' not in cache:
+			dp = layer.dataProvider()
+			worker = QgsMeshLayer(layer.source(), layer.name(), layer.providerType())
+			if worker.isValid():
+				for uri in dp.extraDatasets():
+					worker.dataProvider().addDataset(uri)
+			if not worker.isValid() or worker.dataProvider().datasetGroupCount() != dp.datasetGroupCount():
+				worker = None  # dataset group indexes wouldn't match
+			cache['worker'] = worker
+		
+		return cache['worker']
+	
+	def prepareExtraction(self, layers):
+		"""
+		Prepares layers for values to be read in a background task - populates the mesh, builds the locator and
+		creates the layer copy the task reads from. Must be called on the main thread before the task is submitted.
+		
+		:param layers: list -> QgsMeshLayer
+		:return: bool -> True if all layers can be read in the background
+		"""
+		
+		for layer in layers:
+			self.getMeshLocator(layer)
+			if self.getWorkerLayer(layer) is None:
+				return False
+		
+		return True
+	
+	def getExtractionProvider(self, layer):
+		"""
+		Returns the data provider to read values from. On the main thread this is the layer's own provider,
+		background tasks read from the layer copy (see getWorkerLayer).
+		
+		:param layer: QgsMeshLayer
+		:return: QgsMeshDataProvider
+		"""
+		
+		if TuExtractionScheduler.isMainThread():
+			return layer.dataProvider()
+		
+		worker = self.getMeshCache(layer).get('worker')
+		if worker is None:
+			raise RuntimeError('Mesh not prepared for background extraction: {0}'.format(layer.name()))
+		
+		return worker.dataProvider()
+	
+	def clearMeshCache(self, layerId=None):
+		"""
+		Removes cached mesh topology and the layer copy used by background tasks. Cancel the tasks and hold the
+		extraction lock first (see TuView.layersRemoved).
+		
+		:param layerId: str -> layer id. If None all layers are cleared.
+		:return: void
+		"""
+		
+		if layerId is None:
+			self.meshCache.clear()
+		elif layerId in self.meshCache:
+			del self.meshCache[layerId]
+	
 	def loadOpenMeshLayers(self, **kwargs):
 		"""
 		Checks the workspace for already open mesh layers and adds datasets to mesh and loads into interface.
@@ -847,4 +1019,5 @@ class TuResults2D():
 										dataType = results[result][resultType][i][1]
 										meshIndex = results[result][resultType][i][2]
 										results[result][resultType][timeKey] = (firstTime, dataType, meshIndex)
-										del results[result][resultType][i]
\ No newline at end of file
+										del results[result][resultType][i]
+			self.tuView.tuResults.clearTimeIndex(result)
\ No newline at end of file
@@ -1,3 +1,6 @@
+from collections.abc import MutableMapping
+import numpy as np
+from qgis.core import QgsMeshDatasetIndex
 
 
 class TuResultsIndex():
@@ -19,3 +22,133 @@ class TuResultsIndex():
 				self.resultType = '{0}/Maximums'.format(resultType) if max else resultType
 			self.timestep = '-99999' if max else timestep
 			self.timestep = '99999' if min else timestep
+
+
+class TuResultTimesteps(MutableMapping):
+	"""
+	Timesteps of a 2D result type (e.g. depth) stored in arrays. Behaves like the dictionary of
+	time key to ( time, type, QgsMeshDatasetIndex ) it replaces e.g. { '1.000000': ( 1.0, 1, QgsMeshDatasetIndex ) }
+	however the time keys, tuples and dataset indexes are only created when requested.
+	"""
+	
+	def __init__(self, times=(), dataType=1, group=-1, indexes=None, keys=None):
+		"""
+		:param times: list -> float time of each timestep
+		:param dataType: int -> 1 scalar, 2 vector
+		:param group: int -> dataset group index
+		:param indexes: list -> int dataset index of each timestep. Defaults to 0, 1, 2 ...
+		:param keys: list -> str time keys. Only required if keys aren't the time formatted to 6 d.p. e.g. '-99999'
+		"""
+		
+		self.times = np.array(times, dtype=float).reshape(-1)
+		self.dataTypes = np.full(self.times.size, dataType, dtype=np.int8)
+		self.groups = np.full(self.times.size, group, dtype=np.int32)
+		if indexes is None:
+			self.indexes = np.arange(self.times.size, dtype=np.int32)
+		else:
+			self.indexes = np.array(indexes, dtype=np.int32).reshape(-1)
+		self.customKeys = {}  # position: key - only for keys that aren't the formatted time
+		if keys is not None:
+			for i, key in enumerate(keys):
+				if key != '{0:.6f}'.format(self.times[i]):
+					self.customKeys[i] = key
+		self.reset()
+	
+	def reset(self):
+		"""
+		Clears keys, lookup and time index derived from the arrays.
+		
+		:return: void
+		"""
+		
+		self._keys = None
+		self._positions = None
+		self._timeIndex = None
+	
+	def timekeys(self):
+		"""
+		:return: list -> str time keys in insertion order e.g. [ '0.000000', '1.000000' ]
+		"""
+		
+		if self._keys is None:
+			self._keys = ['{0:.6f}'.format(x) for x in self.times.tolist()]
+			for i, key in self.customKeys.items():
+				self._keys[i] = key
+		
+		return self._keys
+	
+	def position(self, key):
+		"""
+		:param key: str -> time key e.g. '1.000000'
+		:return: int position of the timestep or None if key does not exist
+		"""
+		
+		if self._positions is None:
+			self._positions = {x: i for i, x in enumerate(self.timekeys())}
+		
+		return self._positions.get(key)
+	
+	def timeIndex(self):
+		"""
+		Sorted times and matching time keys for binary search lookups (see TuResults.findTimeNextLower).
+		
+		:return: numpy.ndarray -> float sorted times, list -> str time keys
+		"""
+		
+		if self._timeIndex is None:
+			order = np.argsort(self.times, kind='stable')
+			keys = self.timekeys()
+			self._timeIndex = (self.times[order], [keys[x] for x in order])
+		
+		return self._timeIndex
+	
+	def __getitem__(self, key):
+		i = self.position(key)
+		if i is None:
+			raise KeyError(key)
+		
+		return float(self.times[i]), int(self.dataTypes[i]), QgsMeshDatasetIndex(int(self.groups[i]), int(self.indexes[i]))
+	
+	def __setitem__(self, key, value):
+		time, dataType, datasetIndex = value
+		i = self.position(key)
+		if i is None:
+			i = self.times.size
+			self.times = np.append(self.times, time)
+			self.dataTypes = np.append(self.dataTypes, np.int8(dataType))
+			self.groups = np.append(self.groups, np.int32(datasetIndex.group()))
+			self.indexes = np.append(self.indexes, np.int32(datasetIndex.dataset()))
+		else:
+			self.times[i] = time
+			self.dataTypes[i] = dataType
+			self.groups[i] = datasetIndex.group()
+			self.indexes[i] = datasetIndex.dataset()
+		if key != '{0:.6f}'.format(self.times[i]):
+			self.customKeys[i] = key
+		elif i in self.customKeys:
+			del self.customKeys[i]
+		self.reset()
+	
+	def __delitem__(self, key):
+		i = self.position(key)
+		if i is None:
+			raise KeyError(key)
+		
+		self.times = np.delete(self.times, i)
+		self.dataTypes = np.delete(self.dataTypes, i)
+		self.groups = np.delete(self.groups, i)
+		self.indexes = np.delete(self.indexes, i)
+		self.customKeys = {(x if x < i else x - 1): y for x, y in self.customKeys.items() if x != i}
+		self.reset()
+	
+	def __contains__(self, key):
+		return self.position(key) is not None
+	
+	def __iter__(self):
+		return iter(self.timekeys())
+	
+	def __len__(self):
+		return self.times.size
+	
+	def __repr__(self):
+		return '{0}({1})'.format(self.__class__.__name__, dict(self.items()))
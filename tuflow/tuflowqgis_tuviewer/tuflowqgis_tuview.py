@@ -14,6 +14,7 @@ import tuflowqgis_turesults
 import tuflowqgis_tuplot
 import tuflowqgis_tumenubar
 import tuflowqgis_tuoptions
+from tuflow.tuflowqgis_tuviewer.tuflowqgis_tuplayback import TuPlayback
 from tuflow.tuflowqgis_tuviewer.tuflowqgis_tumenucontext import TuContextMenu
 from tuflow.tuflowqgis_tuviewer.tuflowqgis_tuproject import TuProject
 from tuflow.tuflowqgis_library import tuflowqgis_find_layer, findAllMeshLyrs
@@ -69,6 +70,9 @@ class TuView(QDockWidget, Ui_Tuplot):
 		# options
 		self.tuOptions = tuflowqgis_tuoptions.TuOptions()
 		
+		# time slider playback
+		self.tuPlayback = TuPlayback(self)
+		
 		# Expand result type tree
 		self.initialiseDataSetView()
 		
@@ -216,6 +220,11 @@ class TuView(QDockWidget, Ui_Tuplot):
 		for rlayer in removedLayers:
 			layer = tuflowqgis_find_layer(rlayer, search_type='layerId')
 			if layer is not None and isinstance(layer, QgsMeshLayer):
+				# cancelled tasks stop before their extraction starts - wait for a running one to finish
+				# before its mesh cache and layer copy are deleted
+				self.tuPlot.extraction.cancel()
+				with self.tuPlot.extraction.lock:
+					self.tuResults.tuResults2D.clearMeshCache(layer.id())
 				for i in reversed(range(self.OpenResults.count())):
 					item = self.OpenResults.item(i)
 					itemName = item.text()
@@ -307,18 +316,11 @@ class TuView(QDockWidget, Ui_Tuplot):
 		
 		if self.btnTimePlay.isChecked():
 			if self.tuResults.activeResults:
-				self.timer = QTimer()
-				self.timer.setInterval(self.tuOptions.playDelay * 1000)  # sec to ms
-				self.timer.setSingleShot(False)
-				self.timer.timeout.connect(self.nextTimestep)
-				self.timer.start()
+				self.tuPlayback.start()
 			else:
 				self.btnTimePlay.setChecked(False)
 		else:
-			try:
-				self.timer.stop()
-			except:
-				pass
+			self.tuPlayback.stop()
 	
 	def plottingViewChanged(self):
 		"""